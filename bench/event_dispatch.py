@@ -0,0 +1,77 @@
+"""
+Micro-benchmark del despacho de eventos de Qt con N sesiones abiertas.
+Compara el comportamiento anterior, en el que cada página instalaba un
+filtro de eventos global en QApplication (sin reimplementar eventFilter),
+con el actual, sin filtros globales. Mide cuántos eventos de movimiento de
+ratón por segundo se entregan a un widget con 1, 10 y 50 sesiones.
+
+Uso:
+    QT_QPA_PLATFORM=offscreen python bench/event_dispatch.py [--events N] [--sessions 1,10,50]
+"""
+import argparse
+import time
+
+from PyQt6.QtCore import QObject, QCoreApplication, QEvent, QPointF, Qt
+from PyQt6.QtGui import QMouseEvent
+from PyQt6.QtWidgets import QApplication, QWidget
+
+DEFAULT_EVENTS = 200000
+"""Eventos enviados en cada medición"""
+
+DEFAULT_SESSIONS = "1,10,50"
+"""Números de sesiones que se miden"""
+
+REPEATS = 5
+"""Repeticiones de cada medición, alternando con y sin filtros; se informa la mejor"""
+
+class PageStub(QObject):
+    """Objeto Python que, como la página anterior, se instala como filtro global sin reimplementar eventFilter."""
+
+def measure(widget, events):
+    """Envía eventos de movimiento de ratón a un widget y devuelve eventos por segundo.
+
+    Args:
+        widget (QWidget): Widget destino.
+        events (int): Número de eventos a enviar.
+
+    Returns:
+        float: Eventos entregados por segundo.
+    """
+    event = QMouseEvent(QEvent.Type.MouseMove, QPointF(10, 10), QPointF(10, 10),
+                        Qt.MouseButton.NoButton, Qt.MouseButton.NoButton, Qt.KeyboardModifier.NoModifier)
+    started = time.perf_counter()
+    for _ in range(events):
+        QCoreApplication.sendEvent(widget, event)
+    return events / (time.perf_counter() - started)
+
+def main():
+    """Ejecuta las mediciones e imprime una tabla de resultados."""
+    parser = argparse.ArgumentParser(description="Qt event dispatch throughput with N sessions")
+    parser.add_argument("--events", type=int, default=DEFAULT_EVENTS, help="events per measurement")
+    parser.add_argument("--sessions", default=DEFAULT_SESSIONS, help="comma-separated session counts")
+    args = parser.parse_args()
+
+    app = QApplication([])
+    widget = QWidget()
+    widget.setMouseTracking(True)
+
+    print(f"{'sessions':>8}  {'global filters (ev/s)':>22}  {'no filters (ev/s)':>18}  "
+          f"{'cost/filter (ns)':>16}  {'speedup':>8}")
+    for count in [int(n) for n in args.sessions.split(",")]:
+        pages = [PageStub() for _ in range(count)]
+        with_filters = without_filters = 0.0
+        # Se alternan ambos modos en cada repetición para repartir el ruido del sistema
+        for _ in range(REPEATS):
+            for page in pages:
+                app.installEventFilter(page)
+            with_filters = max(with_filters, measure(widget, args.events))
+            for page in pages:
+                app.removeEventFilter(page)
+            without_filters = max(without_filters, measure(widget, args.events))
+
+        per_filter = (1e9 / with_filters - 1e9 / without_filters) / count
+        print(f"{count:>8}  {with_filters:>22,.0f}  {without_filters:>18,.0f}  "
+              f"{per_filter:>16.1f}  {without_filters / with_filters:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
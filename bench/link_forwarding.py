@@ -0,0 +1,121 @@
+"""
+Benchmark del reenvío de enlaces a una instancia de WAms ya en ejecución.
+Registra en el bus de sesión una instancia de prueba con el nombre
+org.wams.SingleInstance (solo los métodos handle_url y handle_url_since)
+y lanza main.py con una URL, como al hacer clic en un enlace wa.me. Mide
+el tiempo desde el lanzamiento hasta que la instancia recibe la URL y
+hasta que el proceso termina. Con varias rutas de main.py (por ejemplo,
+una copia de una versión anterior) las alterna en cada repetición.
+
+Uso:
+    dbus-run-session -- python bench/link_forwarding.py [--main main/main.py ...] [--repeats 5]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+from PyQt6.QtCore import QCoreApplication, QObject, QProcess, QProcessEnvironment, pyqtSlot
+from PyQt6.QtDBus import QDBusConnection
+
+SERVICE_NAME = "org.wams.SingleInstance"
+"""Nombre D-Bus que registra la instancia principal de WAms"""
+
+DEFAULT_MAIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "main", "main.py")
+"""main.py del árbol actual"""
+
+DEFAULT_REPEATS = 5
+"""Lanzamientos de cada main.py; se informa la mediana"""
+
+TEST_URL = "https://wa.me/15550001234"
+"""Enlace que se entrega en cada lanzamiento"""
+
+PROCESS_TIMEOUT = 60000
+"""Espera máxima (ms) a que termine cada lanzamiento"""
+
+class StubInstance(QObject):
+    """Instancia de prueba que solo anota cuándo recibe cada URL."""
+
+    def __init__(self, parent=None):
+        """Inicializa la instancia sin URLs recibidas.
+
+        Args:
+            parent: Objeto padre de Qt.
+        """
+        super().__init__(parent)
+        self.received_at = None
+
+    @pyqtSlot(str)
+    def handle_url(self, url):
+        """Recibe una URL como lo hacen las versiones anteriores."""
+        self.received_at = time.time()
+
+    @pyqtSlot(str, float)
+    def handle_url_since(self, url, clicked_at):
+        """Recibe una URL junto con el instante del clic."""
+        self.received_at = time.time()
+
+def launch(stub, main_path):
+    """Lanza main.py con una URL y espera a que termine.
+
+    Args:
+        stub (StubInstance): Instancia registrada en el bus.
+        main_path (str): Ruta del main.py a lanzar.
+
+    Returns:
+        tuple: (ms hasta la entrega o None si no llegó, ms hasta que termina, código de salida).
+    """
+    process = QProcess()
+    process.setProcessEnvironment(QProcessEnvironment.systemEnvironment())
+    process.setProcessChannelMode(QProcess.ProcessChannelMode.MergedChannels)
+    stub.received_at = None
+
+    started = time.time()
+    process.start(sys.executable, [main_path, TEST_URL])
+    while process.state() != QProcess.ProcessState.NotRunning:
+        # La instancia de prueba tiene que atender D-Bus mientras el proceso corre
+        QCoreApplication.processEvents()
+        process.waitForFinished(1)
+        if (time.time() - started) * 1000 > PROCESS_TIMEOUT:
+            process.kill()
+            process.waitForFinished()
+    QCoreApplication.processEvents()
+    finished = time.time()
+
+    delivered = (stub.received_at - started) * 1000 if stub.received_at else None
+    if process.exitCode() != 0:
+        output = bytes(process.readAll()).decode(errors="replace").strip().splitlines()
+        print(f"  {main_path} exited with {process.exitCode()}: {output[-1] if output else ''}")
+    return delivered, (finished - started) * 1000, process.exitCode()
+
+def main():
+    """Ejecuta las mediciones e imprime una tabla de resultados."""
+    parser = argparse.ArgumentParser(description="Click-to-delivery latency of link forwarding")
+    parser.add_argument("--main", action="append", help="main.py to launch (repeatable)")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="launches per main.py")
+    args = parser.parse_args()
+    mains = args.main or [DEFAULT_MAIN]
+
+    app = QCoreApplication([])
+    bus = QDBusConnection.sessionBus()
+    stub = StubInstance()
+    if not bus.isConnected() or not bus.registerService(SERVICE_NAME):
+        sys.exit(f"Could not own {SERVICE_NAME} on the session bus (run under dbus-run-session)")
+    bus.registerObject("/", stub, QDBusConnection.RegisterOption.ExportAllSlots)
+
+    results = {path: [] for path in mains}
+    # Se alternan las rutas en cada repetición para repartir el ruido del sistema
+    for _ in range(args.repeats):
+        for path in mains:
+            results[path].append(launch(stub, path))
+
+    print(f"{'main.py':>40}  {'delivered':>9}  {'delivery (ms)':>13}  {'exit (ms)':>9}")
+    for path, runs in results.items():
+        delivered = [run[0] for run in runs if run[0] is not None]
+        delivery = f"{statistics.median(delivered):.0f}" if delivered else "—"
+        exit_ms = statistics.median(run[1] for run in runs)
+        print(f"{path[-40:]:>40}  {len(delivered):>4}/{len(runs):<4}  {delivery:>13}  {exit_ms:>9.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Benchmark del consumo de CPU en reposo de los renderers con N páginas.
+Compara los ganchos del DOM anteriores, dos setInterval de 100 ms que
+buscaban el elemento de diseño y el de notificaciones hasta encontrarlos,
+con los actuales (DOM_HOOKS_SCRIPT), que esperan con un MutationObserver.
+Las páginas nunca contienen esos elementos, así que los intervalos no se
+detienen: es el caso de una sesión cuya interfaz cambió de clases. Se lee
+el tiempo de CPU (utime + stime) de /proc/<renderProcessPid>/stat de cada
+renderer durante el periodo de medida.
+
+Uso:
+    python bench/renderer_idle_cpu.py [--pages N] [--seconds 60] [--nodes 2000]
+"""
+import argparse
+import os
+import sys
+
+from PyQt6.QtCore import QTimer, QUrl
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtWebEngineCore import QWebEnginePage, QWebEngineProfile, QWebEngineScript
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "main"))
+from modules.web import DOM_HOOKS_SCRIPT, DOM_HOOK_TIMEOUT  # noqa: E402
+
+DEFAULT_PAGES = 10
+"""Páginas abiertas en cada medición"""
+
+DEFAULT_SECONDS = 60
+"""Duración de cada medición en segundos"""
+
+DEFAULT_NODES = 2000
+"""Elementos del DOM de prueba (la XPath anterior lo recorre en cada intento)"""
+
+WARMUP = 5000
+"""Espera (ms) tras cargar las páginas antes de empezar a medir"""
+
+LEGACY_HOOKS_SCRIPT = """
+(function() {
+    const checkExist = setInterval(() => {
+        const classElement = document.getElementsByClassName("_1XkO3")[0];
+        if (classElement != null) {
+            classElement.style = 'max-width: initial; width: 100%; height: 100%; position: unset;margin: 0'
+            clearInterval(checkExist);
+        }
+    }, 100);
+
+    const checkNotify = setInterval(() => {
+        const classElement = document.evaluate('//*[@id="side"]/span/div/div/div[2]/div[2]/span/span[1]', document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        if (classElement != null) {
+            classElement.click()
+            clearInterval(checkNotify);
+        }
+    }, 100);
+})();
+"""
+"""Ganchos anteriores, tal como los inyectaba load_finished"""
+
+def build_html(nodes):
+    """Genera una página con un DOM anidado sin los elementos que buscan los ganchos.
+
+    Args:
+        nodes (int): Número de elementos a generar.
+
+    Returns:
+        str: Documento HTML.
+    """
+    rows = "".join(f'<div class="row"><span><span>chat {i}</span></span></div>' for i in range(nodes // 3))
+    return f'<!DOCTYPE html><html><body><div id="app"><div id="pane">{rows}</div></div></body></html>'
+
+def cpu_ticks(pid):
+    """Devuelve el tiempo de CPU consumido por un proceso, en ticks del reloj.
+
+    Args:
+        pid (int): PID del proceso.
+
+    Returns:
+        int: utime + stime, o 0 si el proceso ya no existe.
+    """
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            # El nombre del proceso va entre paréntesis y puede contener espacios
+            fields = f.read().rsplit(")", 1)[1].split()
+    except OSError:
+        return 0
+    return int(fields[11]) + int(fields[12])
+
+def measure(app, hooks, pages, seconds, html):
+    """Abre páginas con unos ganchos y mide la CPU de sus renderers en reposo.
+
+    Args:
+        app (QApplication): Aplicación en marcha.
+        hooks (str): Código de los ganchos, inyectado al cargar el documento.
+        pages (int): Número de páginas.
+        seconds (int): Duración de la medición.
+        html (str): Documento que carga cada página.
+
+    Returns:
+        tuple: (renderers distintos, segundos de CPU consumidos en el periodo).
+    """
+    opened = []
+    for _ in range(pages):
+        # Un perfil por página, como las sesiones: cada una tiene su propio renderer
+        profile = QWebEngineProfile()
+        script = QWebEngineScript()
+        script.setSourceCode(hooks)
+        script.setInjectionPoint(QWebEngineScript.InjectionPoint.DocumentReady)
+        script.setWorldId(QWebEngineScript.ScriptWorldId.ApplicationWorld)
+        profile.scripts().insert(script)
+        page = QWebEnginePage(profile)
+        page.setHtml(html, QUrl("https://web.whatsapp.com/"))
+        opened.append((profile, page))
+
+    result = {}
+
+    def start():
+        result["pids"] = {page.renderProcessPid() for _, page in opened} - {0}
+        result["before"] = sum(cpu_ticks(pid) for pid in result["pids"])
+        QTimer.singleShot(seconds * 1000, finish)
+
+    def finish():
+        result["after"] = sum(cpu_ticks(pid) for pid in result["pids"])
+        app.quit()
+
+    QTimer.singleShot(WARMUP, start)
+    app.exec()
+
+    for profile, page in opened:
+        page.deleteLater()
+        profile.deleteLater()
+    app.processEvents()
+
+    return len(result["pids"]), (result["after"] - result["before"]) / os.sysconf("SC_CLK_TCK")
+
+def main():
+    """Ejecuta las mediciones e imprime una tabla de resultados."""
+    parser = argparse.ArgumentParser(description="Idle renderer CPU with polling vs observer DOM hooks")
+    parser.add_argument("--pages", type=int, default=DEFAULT_PAGES, help="pages per measurement")
+    parser.add_argument("--seconds", type=int, default=DEFAULT_SECONDS, help="seconds per measurement")
+    parser.add_argument("--nodes", type=int, default=DEFAULT_NODES, help="DOM elements per page")
+    args = parser.parse_args()
+
+    app = QApplication([])
+    html = build_html(args.nodes)
+    # El observador se desconecta solo tras DOM_HOOK_TIMEOUT; se mide dentro de ese plazo
+    observer_hooks = DOM_HOOKS_SCRIPT.format(timeout=max(DOM_HOOK_TIMEOUT, (args.seconds + 10) * 1000))
+
+    print(f"{'hooks':>16}  {'pages':>5}  {'renderers':>9}  {'cpu (s)':>8}  {'cpu %':>6}  {'ms/s per page':>13}")
+    results = {}
+    for name, hooks in (("setInterval", LEGACY_HOOKS_SCRIPT), ("MutationObserver", observer_hooks)):
+        renderers, cpu = measure(app, hooks, args.pages, args.seconds, html)
+        results[name] = cpu
+        print(f"{name:>16}  {args.pages:>5}  {renderers:>9}  {cpu:>8.2f}  "
+              f"{100 * cpu / args.seconds:>5.1f}%  {1000 * cpu / args.seconds / args.pages:>13.2f}")
+
+    if results["MutationObserver"] > 0:
+        print(f"reduction: {results['setInterval'] / results['MutationObserver']:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -9,18 +9,12 @@ import sys
 import time
 import webbrowser
 
-# Reducir el ruido de logs de Chromium en la terminal
-os.environ["QTWEBENGINE_CHROMIUM_FLAGS"] = "--log-level=3"
-
 # Constantes de la aplicación
 APP_DATA_DIR = os.path.join(os.path.expanduser("~"), ".WAms")
 """Directorio de datos de la aplicación (~/.WAms)"""
 
-KEEP_ALIVE_INTERVAL = 30000
-"""Intervalo del timer para mantener activos los procesos de renderizado (30 segundos)"""
-
 TAB_CLOSE_CLEANUP_DELAY = 3000
-"""Retraso antes de eliminar físicamente los datos de sesión cerrada (3 milisegundos)"""
+"""Retraso antes de eliminar físicamente los datos de sesión cerrada (3 segundos)"""
 
 DEFAULT_WINDOW_WIDTH = 1000
 """Ancho predeterminado de la ventana"""
@@ -28,6 +22,15 @@ DEFAULT_WINDOW_WIDTH = 1000
 DEFAULT_WINDOW_HEIGHT = 600
 """Alto predeterminado de la ventana"""
 
+DEFAULT_PRELOAD_RECENT = 0
+"""Sesiones usadas más recientemente que se cargan al inicio además de la activa"""
+
+STARTUP_MEMORY_SAMPLE_DELAY = 5000
+"""Retraso tras la primera carga antes de medir la memoria del renderizador (5 segundos)"""
+
+TRACE_STARTUP_TIMEOUT = 60000
+"""Tiempo máximo de trazado con --trace-startup antes de guardar la traza (60 segundos)"""
+
 # Configuración de rutas para encontrar los módulos
 app_path = os.path.dirname(os.path.abspath(__file__))
 if os.path.exists(os.path.join(app_path, 'modules')):
@@ -35,8 +38,26 @@ if os.path.exists(os.path.join(app_path, 'modules')):
 else:
     sys.path.insert(0, os.path.join(app_path, '..'))
 
+# El tracer solo usa la biblioteca estándar: se importa primero para medir todo el arranque
+import modules.tracer as tracer
+tracer.configure_from_argv(sys.argv)
+
+# Reenvío rápido: si otra instancia ya posee el nombre D-Bus, se le entrega la URL
+# y se termina antes de cargar WebEngine, las notificaciones y las traducciones
+from modules.forwarder import forward_to_running_instance, send_url, SERVICE_NAME
+if forward_to_running_instance(sys.argv):
+    sys.exit(0)
+
+# Preajuste de rendimiento: las opciones de Chromium deben fijarse antes de inicializar WebEngine
+from modules.presets import read_preset_name, chromium_flags, view_attributes, normalize_preset
+PERFORMANCE_PRESET = read_preset_name(os.path.join(APP_DATA_DIR, "config.ini"))
+os.environ["QTWEBENGINE_CHROMIUM_FLAGS"] = chromium_flags(
+    PERFORMANCE_PRESET, os.environ.get("QTWEBENGINE_CHROMIUM_FLAGS", ""))
+print(f"Performance preset: {PERFORMANCE_PRESET} (Chromium flags: {os.environ['QTWEBENGINE_CHROMIUM_FLAGS']})")
+
 # Asegurar que el locale del sistema se detecte y configure UTF-8 antes de cualquier inicialización de GUI/WebEngine
 # Esto mantiene la detección automática mientras previene advertencias de codificación ANSI
+tracer.begin("locale setup")
 try:
     # Establecer el locale predeterminado del sistema
     locale.setlocale(locale.LC_ALL, '')
@@ -57,19 +78,41 @@ except Exception as e:
     print(f"Initial locale detection failed, using defaults: {e}")
     os.environ['LANG'] = 'en_US.UTF-8'
     os.environ['LC_ALL'] = 'en_US.UTF-8'
+tracer.end("locale setup")
 
-from PyQt6.QtCore import Qt, QUrl, QSettings, QLocale, pyqtSignal, QTimer, QObject, pyqtSlot
-from PyQt6.QtDBus import QDBusConnection, QDBusMessage
-from PyQt6.QtGui import QIcon, QImage, QPainter, QBrush, QPen, QAction
+tracer.begin("import Qt")
+from PyQt6.QtCore import Qt, QUrl, QLocale, pyqtSignal, QTimer, QObject, pyqtSlot
+from PyQt6.QtDBus import QDBusConnection
+from PyQt6.QtGui import QIcon, QAction
 from PyQt6.QtWidgets import (QMainWindow, QApplication, QFileDialog, QSystemTrayIcon, QMenu,
                              QTabWidget, QPushButton, QMessageBox, QLineEdit, QTabBar, QWidget,
                              QHBoxLayout, QDialog, QVBoxLayout, QLabel)
-from PyQt6.QtWebEngineCore import QWebEngineDownloadRequest, QWebEngineProfile, QWebEngineSettings
+from PyQt6.QtWebEngineCore import QWebEngineDownloadRequest, QWebEngineProfile, QWebEngineSettings, QWebEnginePage
 from PyQt6.QtWebEngineWidgets import QWebEngineView
+tracer.end("import Qt")
 
+tracer.begin("import modules")
 import modules.notification as Notification
 from modules.i18n import tr
+from modules.config import Config
+from modules.get_theme import ThemeWatcher
+from modules.procstats import read_rss_bytes, format_bytes, process_start_time
+from modules.downloads_dir import DownloadsDirResolver, resolve_downloads_directory, user_dirs_stamp
+from modules.hibernation import HibernationManager
+from modules.keep_alive import KeepAliveScheduler
+from modules.memory_governor import MemoryGovernor
+from modules.crash_recovery import CrashRecovery
+from modules.cache_budget import CacheBudget
+from modules.avatar_cache import AvatarCache, DEFAULT_AVATAR_CACHE_MB, DEFAULT_ICON_SIZE
+from modules.coalescer import NotificationCoalescer
+from modules.storage import (StorageDialog, detach_rebuildable, DEFAULT_COMPACT_INTERVAL_DAYS,
+                             COMPACT_STARTUP_DELAY, COMPACT_CHECK_INTERVAL)
+from modules.deletion import DeletionWorker
+from modules.task_manager import TaskManagerDialog
+from modules.load_scheduler import LoadScheduler, DEFAULT_MAX_CONCURRENT_LOADS, DEFAULT_LOAD_TIMEOUT
+from modules.page_pool import SparePagePool, Spare, SPARE_MARKER, DEFAULT_SPARE_POOL_SIZE, is_spare_folder
 import modules.web as web
+tracer.end("import modules")
 
 def get_app_icon():
     """Obtiene el icono de la aplicación desde diferentes ubicaciones.
@@ -149,14 +192,112 @@ class RenameTabBar(QTabBar):
             self.editor.hide()
             self.edit_index = -1
 
+class SessionTab(QWidget):
+    """Contenedor de una sesión de WhatsApp dentro de un tab.
+
+    Guarda los datos permanentes de la sesión (ID de carpeta, ruta del perfil
+    y alias) y aloja la vista web solo cuando la sesión se materializa.
+    Mientras tanto muestra un aviso ligero, sin perfil ni proceso de renderizado.
+    """
+    load_requested = pyqtSignal()
+
+    def __init__(self, folder_id, profile_path, session_name, parent=None):
+        """Inicializa el contenedor sin crear todavía la vista web.
+
+        Args:
+            folder_id (str): ID permanente de la carpeta de sesión.
+            profile_path (str): Ruta del perfil persistente de la sesión.
+            session_name (str): Alias que se muestra en el tab.
+            parent: Widget padre del contenedor.
+        """
+        super().__init__(parent)
+        self.folder_id = folder_id
+        self.profile_path = profile_path
+        self.session_name = session_name
+        self.webview = None
+        self.profile = None
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        # Aviso ligero con un botón para cargar la sesión si ya es el tab actual
+        self.placeholder = QWidget()
+        placeholder_layout = QVBoxLayout(self.placeholder)
+        placeholder_layout.addStretch()
+        self.placeholder_label = QLabel(tr("This session will load when you open its tab."))
+        self.placeholder_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.placeholder_label.setWordWrap(True)
+        placeholder_layout.addWidget(self.placeholder_label)
+        load_button = QPushButton(tr("Load session"))
+        load_button.clicked.connect(self.load_requested.emit)
+        placeholder_layout.addWidget(load_button, alignment=Qt.AlignmentFlag.AlignCenter)
+        placeholder_layout.addStretch()
+        layout.addWidget(self.placeholder)
+
+    def is_materialized(self):
+        """Indica si la sesión ya tiene vista, página y perfil creados."""
+        return self.webview is not None
+
+    def page(self):
+        """Devuelve la página web de la sesión o None si aún no se materializó."""
+        return self.webview.page() if self.webview else None
+
+    def attach_webview(self, webview):
+        """Inserta la vista web en el contenedor y oculta el aviso.
+
+        Args:
+            webview (QWebEngineView): Vista web ya configurada para esta sesión.
+        """
+        self.webview = webview
+        self.profile = webview.page().profile()
+        self.placeholder.hide()
+        self.placeholder_label.setText(tr("This session will load when you open its tab."))
+        self.layout().addWidget(webview)
+        webview.show()
+
+    def set_notice(self, text):
+        """Cambia el texto del aviso que se muestra sin vista web.
+
+        Args:
+            text (str): Mensaje a mostrar.
+        """
+        self.placeholder_label.setText(text)
+
+    def detach_webview(self):
+        """Quita la vista web del contenedor y vuelve a mostrar el aviso.
+
+        Returns:
+            QWebEngineView: La vista retirada (el llamador la destruye), o None.
+        """
+        webview = self.webview
+        if webview is None:
+            return None
+        self.layout().removeWidget(webview)
+        webview.hide()
+        self.webview = None
+        self.profile = None
+        self.placeholder.show()
+        return webview
+
 class DBusHandler(QObject):
     """Manejador de mensajes D-Bus para la instancia única."""
-    url_received = pyqtSignal(str)
+    url_received = pyqtSignal(str, float)
 
     @pyqtSlot(str)
     def handle_url(self, url):
         print(f"[*] D-Bus handle_url invocado con URL externa: {url}")
-        self.url_received.emit(url)
+        self.url_received.emit(url, 0.0)
+
+    @pyqtSlot(str, float)
+    def handle_url_since(self, url, clicked_at):
+        """Igual que handle_url, pero recibe el instante del clic para medir la latencia.
+
+        Args:
+            url (str): URL externa a abrir.
+            clicked_at (float): Inicio del proceso lanzado por el clic, como fecha Unix.
+        """
+        print(f"[*] D-Bus handle_url_since invocado con URL externa: {url}")
+        self.url_received.emit(url, clicked_at)
 
 class MainWindow(QMainWindow):
     """Ventana principal de la aplicación WhatsApp MultiSession.
@@ -174,6 +315,7 @@ class MainWindow(QMainWindow):
         - Ajustes de ventana
         - Sistema de bandeja (system tray)
         - Timer keep-alive para prevenir suspensión
+        - Hibernación de sesiones inactivas
         - Carga de sesiones existentes
         """
         super(MainWindow, self).__init__(*args, **kwargs)
@@ -182,18 +324,22 @@ class MainWindow(QMainWindow):
         self.setWindowIcon(self.app_icon)
 
         self.setup_system_locale()
-        self.setup_app_directory()
-        self.settings = QSettings(os.path.join(self.app_dir, "config.ini"), QSettings.Format.IniFormat)
+        with tracer.span("setup app directory"):
+            self.setup_app_directory()
+        self.settings = Config(os.path.join(self.app_dir, "config.ini"), self)
+
+        # System color scheme: read once without blocking, then followed through the portal
+        self.theme_watcher = ThemeWatcher(self)
+        self.theme_watcher.changed.connect(self.apply_theme)
+        self.theme_watcher.start()
+        with tracer.span("get downloads directory"):
+            self.setup_downloads_directory()
         self.setup_window_configuration()
 
-        # Prevenir suspensión del renderizado
-        self.keep_alive_timer = QTimer(self)
-        self.keep_alive_timer.timeout.connect(self.prevent_suspension)
-        self.keep_alive_timer.start(KEEP_ALIVE_INTERVAL)  # Cada 30 segundos
-
         self.force_quit = False
 
-        Notification.init("WAms")
+        with tracer.span("Notification.init"):
+            Notification.init("WAms")
 
         # Central QTabWidget for multi-session
         self.tabs = QTabWidget()
@@ -206,6 +352,8 @@ class MainWindow(QMainWindow):
         # Custom TabBar for renaming
         custom_tab_bar = RenameTabBar()
         custom_tab_bar.tabNameChanged.connect(self.rename_tab)
+        custom_tab_bar.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        custom_tab_bar.customContextMenuRequested.connect(self.show_tab_context_menu)
         self.tabs.setTabBar(custom_tab_bar)
 
         # Create container widget for buttons
@@ -213,26 +361,64 @@ class MainWindow(QMainWindow):
 
         # Connect signals
         self.tabs.tabCloseRequested.connect(self.close_tab)
+        self.tabs.currentChanged.connect(self.on_current_tab_changed)
+        self._restoring_sessions = False
+        self._previous_tab = None
+        self.task_manager = None
+        self.storage_dialog = None
+        self.avatar_cache = None
+
+        # Merge notification bursts per session or chat and rate-limit each session
+        self.notification_coalescer = NotificationCoalescer(self.settings, self.present_notification, self)
+
+        # Delete closed sessions' data in a worker thread, resuming pending deletions
+        self.deletion_worker = DeletionWorker(self.app_dir, self)
+
+        # Compact stopped sessions' rebuildable caches on a schedule
+        self.compaction_timer = QTimer(self)
+        self.compaction_timer.timeout.connect(self.compact_stopped_sessions)
+        self.compaction_timer.start(COMPACT_CHECK_INTERVAL)
+        QTimer.singleShot(COMPACT_STARTUP_DELAY, self.compact_stopped_sessions)
+
+        # Freeze and discard sessions that have not been viewed for a while
+        self.hibernation = HibernationManager(self.tabs, self.settings, self)
+
+        # Split one HTTP cache budget across sessions by recent use
+        self.cache_budget = CacheBudget(self.tabs, self.settings, self)
+
+        # Free background sessions under sustained memory pressure, before the OOM killer acts
+        self.memory_governor = MemoryGovernor(self.hibernation, self.settings, self)
+
+        # One jittered keep-alive schedule for all sessions, skipping pings that are not needed
+        self.keep_alive = KeepAliveScheduler(self.tabs, self.settings, self)
+
+        # Stagger session loads so renderers do not all start at once
+        self.load_scheduler = LoadScheduler(
+            self.settings.value("startup/max_concurrent_loads", DEFAULT_MAX_CONCURRENT_LOADS, int),
+            self.settings.value("startup/load_timeout", DEFAULT_LOAD_TIMEOUT, int),
+            self
+        )
+
+        # Reload sessions whose renderer crashed or was OOM-killed, with backoff
+        self.crash_recovery = CrashRecovery(self.settings, self.find_session, self.recover_session,
+                                            self.park_session, self)
+
+        # Keep a pre-warmed session ready for the "+" button
+        self.spare_pool = SparePagePool(
+            self.create_spare_session,
+            self.settings.value("sessions/spare_pool_size", DEFAULT_SPARE_POOL_SIZE, int),
+            lambda: not self.load_scheduler.is_idle(),
+            self
+        )
 
         self.setCentralWidget(self.tabs)
-        self.setup_system_tray()
+        with tracer.span("setup system tray"):
+            self.setup_system_tray()
 
-        self.load_sessions_on_startup()
+        with tracer.span("load sessions"):
+            self.load_sessions_on_startup()
         self.tabs.repaint()
 
-    def prevent_suspension(self):
-        """Mantiene activos los procesos de renderizado de todas las tabs.
-        
-        Se ejecuta periódicamente para evitar que el sistema suspenda
-        los procesos de WebEngine por inactividad, enviando un pequeño
-        script JavaScript nulo a cada tab activa.
-        """
-        for i in range(self.tabs.count()):
-            webview = self.tabs.widget(i)
-            if webview and hasattr(webview, 'page'):
-                # Fuerza una pequeña actualización para mantener activo el proceso
-                webview.page().runJavaScript("void(0);")
-
     def setup_corner_buttons(self):
         """Configura los botones de esquina: agregar tab (+) y menú hamburguesa.
         
@@ -291,6 +477,18 @@ class MainWindow(QMainWindow):
 
         menu.addSeparator()
 
+        # Sessions task manager
+        sessions_action = QAction(tr("📊 Sessions"), self)
+        sessions_action.setToolTip(tr("Show the memory and CPU usage of each session"))
+        sessions_action.triggered.connect(self.show_task_manager)
+        menu.addAction(sessions_action)
+
+        # Storage analyzer
+        storage_action = QAction(tr("💾 Storage"), self)
+        storage_action.setToolTip(tr("Show the disk space used by each session and compact stopped sessions"))
+        storage_action.triggered.connect(self.show_storage)
+        menu.addAction(storage_action)
+
         # External Links Behavior
         ask_link_action = QAction(tr("🔗 Ask before opening link"), self)
         ask_link_action.setToolTip(tr("If enabled, asks which session to use when clicking external WhatsApp links. If disabled, opens in the active tab."))
@@ -328,6 +526,146 @@ class MainWindow(QMainWindow):
         button = self.sender()
         menu.exec(button.mapToGlobal(button.rect().bottomLeft()))
 
+    def show_task_manager(self):
+        """Muestra el administrador de tareas de las sesiones.
+
+        El diálogo no es modal y se reutiliza entre aperturas; solo muestrea
+        los procesos mientras está visible.
+        """
+        if self.task_manager is None:
+            self.task_manager = TaskManagerDialog(self.tabs, self.reload_session, self.unload_session,
+                                                  self.crash_recovery, self.cache_budget, self)
+        self.task_manager.show()
+        self.task_manager.raise_()
+        self.task_manager.activateWindow()
+
+    def show_storage(self):
+        """Muestra el análisis de almacenamiento de las sesiones."""
+        if self.storage_dialog is None:
+            self.storage_dialog = StorageDialog(self.tabs, self.compact_session, self)
+        self.storage_dialog.show()
+        self.storage_dialog.raise_()
+        self.storage_dialog.activateWindow()
+
+    def compact_session(self, session_tab):
+        """Elimina las cachés reconstruibles de una sesión detenida.
+
+        Las carpetas se apartan al instante y se borran en el hilo de borrado;
+        el inicio de sesión (IndexedDB, Local Storage, cookies) no se toca.
+
+        Args:
+            session_tab (SessionTab): Sesión a compactar.
+
+        Returns:
+            bool: True si la sesión estaba detenida y se compactó.
+        """
+        if session_tab.is_materialized():
+            return False
+        detached = detach_rebuildable(session_tab.profile_path)
+        for path in detached:
+            self.deletion_worker.enqueue(path)
+        print(f"Compacting session {session_tab.folder_id}: {len(detached)} cache folder(s) queued for deletion")
+        return True
+
+    def compact_stopped_sessions(self):
+        """Compacta las sesiones detenidas si venció "storage/compact_interval_days"."""
+        interval = self.settings.value("storage/compact_interval_days", DEFAULT_COMPACT_INTERVAL_DAYS, int)
+        if interval <= 0:
+            return
+        last = self.settings.value("storage/last_compaction", 0.0, float)
+        if time.time() - last < interval * 86400:
+            return
+
+        compacted = 0
+        for i in range(self.tabs.count()):
+            if self.compact_session(self.tabs.widget(i)):
+                compacted += 1
+        self.settings.setValue("storage/last_compaction", time.time())
+        print(f"Scheduled storage compaction: {compacted} stopped session(s) compacted")
+
+    def reload_session(self, session_tab):
+        """Recarga la página de una sesión, o la carga si no estaba materializada.
+
+        Args:
+            session_tab (SessionTab): Sesión a recargar.
+        """
+        if not session_tab.is_materialized():
+            self.materialize_session(session_tab)
+            return
+        self.load_scheduler.cancel(session_tab.folder_id)
+        # A discarded page reloads by itself when it becomes Active again
+        discarded = session_tab.page().lifecycleState() == QWebEnginePage.LifecycleState.Discarded
+        self.hibernation.wake(session_tab)
+        if not discarded:
+            session_tab.webview.reload()
+        print(f"Reloaded session {session_tab.folder_id}")
+
+    def unload_session(self, session_tab):
+        """Descarga una sesión liberando su vista, página y perfil.
+
+        Los datos de la sesión se conservan en disco; la sesión vuelve a
+        cargarse al abrir su tab o al pulsar el botón del aviso.
+
+        Args:
+            session_tab (SessionTab): Sesión a descargar.
+        """
+        if not session_tab.is_materialized():
+            return
+        self.load_scheduler.cancel(session_tab.folder_id)
+        self.crash_recovery.cancel(session_tab.folder_id)
+        page = session_tab.page()
+        page.runJavaScript("window.stop();")
+        webview = session_tab.detach_webview()
+        # The page owns the profile, and the view owns the page
+        webview.deleteLater()
+        print(f"Unloaded session {session_tab.folder_id}")
+
+    def find_session(self, folder_id):
+        """Busca el contenedor de una sesión por su ID de carpeta.
+
+        Args:
+            folder_id (str): ID permanente de la sesión.
+
+        Returns:
+            SessionTab: La sesión, o None si no hay un tab con ese ID.
+        """
+        for i in range(self.tabs.count()):
+            session_tab = self.tabs.widget(i)
+            if session_tab.folder_id == folder_id:
+                return session_tab
+        return None
+
+    def recover_session(self, session_tab):
+        """Recarga una sesión cuyo proceso de renderizado terminó de forma anómala.
+
+        La recarga pasa por el planificador de cargas para que varias sesiones
+        caídas no arranquen sus renderizadores a la vez; la sesión visible va
+        al frente de la cola.
+
+        Args:
+            session_tab (SessionTab): Sesión a recuperar.
+        """
+        self.hibernation.wake(session_tab)
+        webview = session_tab.webview
+        self.load_scheduler.cancel(session_tab.folder_id)
+        self.load_scheduler.enqueue(session_tab.folder_id, webview.page(), webview.reload,
+                                    priority=session_tab is self.tabs.currentWidget())
+        print(f"Recovering session '{session_tab.session_name}'")
+
+    def park_session(self, session_tab, reason):
+        """Aparca una sesión que entró en un bucle de fallos.
+
+        La sesión se descarga y su tab muestra el motivo; vuelve a cargarse
+        cuando el usuario pulsa el botón del aviso.
+
+        Args:
+            session_tab (SessionTab): Sesión a aparcar.
+            reason (str): Motivo del último fallo.
+        """
+        self.unload_session(session_tab)
+        session_tab.set_notice(tr("This session stopped after crashing repeatedly (last: {}). "
+                                  "Load it again when you are ready.").format(reason))
+
     def show_quick_guide(self):
         """Muestra el diálogo con la guía rápida de uso de la aplicación."""
         guide_text = tr("quick_guide_content")
@@ -375,152 +713,254 @@ class MainWindow(QMainWindow):
         """Configura el directorio de datos de la aplicación (~/.WAms).
         
         Crea el directorio principal de la aplicación y el subdirectorio
-        de sesiones si no existen. También obtiene y crea el directorio
-        de descargas usando el estándar XDG.
+        de sesiones si no existen.
         """
         home_dir = os.path.expanduser("~")
         self.app_dir = os.path.join(home_dir, ".WAms")
         self.sessions_dir = os.path.join(self.app_dir, "sessions")
 
-        # Obtener la carpeta de descargas usando el estándar XDG
-        self.downloads_dir = self.get_downloads_directory()
-
         # Solo crear los directorios de la aplicación, no el de descargas
         for directory in [self.app_dir, self.sessions_dir]:
             if not os.path.exists(directory):
                 os.makedirs(directory)
                 print(f"Directory created: {directory}")
 
-        # Verificar que la carpeta de descargas existe
-        if not os.path.exists(self.downloads_dir):
-            os.makedirs(self.downloads_dir)
-            print(f"Downloads directory created: {self.downloads_dir}")
-        else:
+    def setup_downloads_directory(self):
+        """Obtiene la carpeta de descargas sin bloquear el arranque.
+
+        La ruta resuelta se guarda en config.ini junto con la marca de
+        modificación de ~/.config/user-dirs.dirs. Si la marca no cambió, se
+        usa directamente. Si cambió (o no hay caché), se usa una ruta
+        provisional obtenida sin subprocesos y la búsqueda completa con
+        xdg-user-dir se repite en segundo plano.
+        """
+        cached_path = self.settings.value("downloads/path", "", str)
+        cached_stamp = self.settings.value("downloads/user_dirs_stamp", "", str)
+
+        if cached_path and os.path.isdir(cached_path) and cached_stamp == user_dirs_stamp():
+            self.downloads_dir = cached_path
             print(f"Using Downloads directory: {self.downloads_dir}")
+            return
 
-    def get_downloads_directory(self):
-        """Obtiene la carpeta de descargas del usuario usando el estándar XDG.
-        
-        Implementa múltiples métodos de fallback para máxima compatibilidad:
-        1. Comando xdg-user-dir (más confiable)
-        2. Archivo de configuración XDG (~/.config/user-dirs.dirs)
-        3. Variable de entorno XDG_DOWNLOAD_DIR
-        4. Fallbacks comunes por idioma (Downloads, Descargas, etc.)
-        5. Último recurso: crear directorio WAms en inglés
-        
-        Returns:
-            str: Ruta absoluta al directorio de descargas del usuario.
+        if cached_path and os.path.isdir(cached_path):
+            self.downloads_dir = cached_path
+        else:
+            self.downloads_dir = resolve_downloads_directory(run_command=False)
+        self.ensure_downloads_directory()
+
+        self.downloads_resolver = DownloadsDirResolver(self)
+        self.downloads_resolver.resolved.connect(self.on_downloads_directory_resolved)
+        self.downloads_resolver.start()
+
+    def on_downloads_directory_resolved(self, path, stamp):
+        """Aplica y guarda la carpeta de descargas resuelta en segundo plano.
+
+        Args:
+            path (str): Carpeta de descargas encontrada.
+            stamp (str): Marca de user-dirs.dirs vigente durante la búsqueda.
         """
-        import subprocess
+        if path != self.downloads_dir:
+            self.downloads_dir = path
+            self.ensure_downloads_directory()
 
-        # Método 1: Usar xdg-user-dir (más confiable)
-        try:
-            result = subprocess.run(['xdg-user-dir', 'DOWNLOAD'],
-                                capture_output=True, text=True, check=True)
-            downloads_path = result.stdout.strip()
-            if downloads_path and os.path.exists(downloads_path):
-                print(f"Downloads directory found via xdg-user-dir: {downloads_path}")
-                return downloads_path
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            print("xdg-user-dir not available, trying alternative methods...")
-
-        # Método 2: Leer el archivo de configuración XDG directamente
-        home_dir = os.path.expanduser("~")
-        xdg_config_file = os.path.join(home_dir, ".config", "user-dirs.dirs")
+        self.settings.setValue("downloads/path", path)
+        self.settings.setValue("downloads/user_dirs_stamp", stamp)
 
-        if os.path.exists(xdg_config_file):
-            try:
-                with open(xdg_config_file, 'r') as f:
-                    for line in f:
-                        if line.startswith('XDG_DOWNLOAD_DIR='):
-                            # Extraer la ruta, removiendo comillas y expandiendo variables
-                            path = line.split('=', 1)[1].strip().strip('"\'')
-                            path = path.replace('$HOME', home_dir)
-                            if os.path.exists(path):
-                                print(f"Downloads directory found via XDG config: {path}")
-                                return path
-            except Exception as e:
-                print(f"Error reading XDG config file: {e}")
-
-        # Método 3: Variable de entorno XDG_DOWNLOAD_DIR
-        xdg_download = os.environ.get('XDG_DOWNLOAD_DIR')
-        if xdg_download and os.path.exists(xdg_download):
-            print(f"Downloads directory found via XDG_DOWNLOAD_DIR: {xdg_download}")
-            return xdg_download
-
-        # Método 4: Fallbacks comunes por idioma
-        common_download_names = [
-            'Downloads',    # Inglés
-            'Descargas',    # Español
-            'Téléchargements',  # Francés
-            'Download',     # Alemán
-            'Scaricati',    # Italiano
-            'Baixades',     # Catalán
-            'Preuzimanja',  # Serbio
-            'Λήψεις',       # Griego
-            'Загрузки',     # Ruso
-        ]
-
-        for name in common_download_names:
-            path = os.path.join(home_dir, name)
-            if os.path.exists(path):
-                print(f"Downloads directory found via fallback: {path}")
-                return path
-
-        # Método 5: Último recurso - crear WAms Downloads en inglés
-        fallback_path = os.path.join(home_dir, 'WAms')
-        print(f"Using fallback downloads directory: {fallback_path}")
-        return fallback_path
+    def ensure_downloads_directory(self):
+        """Verifica que la carpeta de descargas exista, creándola si hace falta."""
+        if not os.path.exists(self.downloads_dir):
+            os.makedirs(self.downloads_dir)
+            print(f"Downloads directory created: {self.downloads_dir}")
+        else:
+            print(f"Using Downloads directory: {self.downloads_dir}")
 
     def load_sessions_on_startup(self):
-        """Escanea el directorio de sesiones y carga cada una como un tab.
-        
+        """Escanea el directorio de sesiones y crea un tab por cada una.
+
         Lee el directorio ~/.WAms/sessions/ y restaura todas las sesiones
         previamente guardadas, usando los alias configurados en settings.
+        Los tabs se crean como contenedores ligeros: solo se materializan
+        la sesión usada más recientemente y las N siguientes indicadas en
+        "sessions/preload_recent"; el resto se carga al abrir su tab.
+        La sesión activa en el cierre anterior se restaura y carga primero;
+        las demás esperan su turno en el planificador de cargas.
         Si no hay sesiones, crea una sesión predeterminada.
         """
+        start_time = time.monotonic()
+
         if not os.path.exists(self.sessions_dir):
             os.makedirs(self.sessions_dir)
 
-        session_folders = [d for d in os.listdir(self.sessions_dir)
-                          if os.path.isdir(os.path.join(self.sessions_dir, d))
-                          and not d.endswith(".deleted")]
-
-        # Clean up any leftover .deleted folders from previous crashes
-        for d in os.listdir(self.sessions_dir):
-            if d.endswith(".deleted"):
-                shutil.rmtree(os.path.join(self.sessions_dir, d), ignore_errors=True)
+        with tracer.span("scan session directory"):
+            session_folders = [d for d in os.listdir(self.sessions_dir)
+                              if os.path.isdir(os.path.join(self.sessions_dir, d))
+                              and not d.endswith(".deleted")
+                              and not is_spare_folder(os.path.join(self.sessions_dir, d))]
+
+        # Queue leftover .deleted folders and unused spare sessions from previous runs;
+        # the worker deletes them in the background without delaying the tabs
+        with tracer.span("queue leftover deletions"):
+            self.deletion_worker.resume()
+            for d in os.listdir(self.sessions_dir):
+                path = os.path.join(self.sessions_dir, d)
+                if d.endswith(".deleted") or is_spare_folder(path):
+                    self.deletion_worker.enqueue(path)
 
         if not session_folders:
             self.add_new_tab(tr("Default Session"))
+            print("Loaded 1 session(s).")
+            return
+
+        # We use the folder name as a fixed ID, and read the Alias from settings
+        self._restoring_sessions = True
+        for folder_id in sorted(session_folders):
+            alias = self.settings.value(f"aliases/{folder_id}", folder_id, str)
+            with tracer.span("add_new_tab", folder_id=folder_id, lazy=True):
+                self.add_new_tab(alias, folder_id, lazy=True)
+
+        # Most recently used first; sessions never opened keep alphabetical order at the end
+        by_recent = sorted(
+            range(self.tabs.count()),
+            key=lambda i: self.settings.value(f"last_used/{self.tabs.widget(i).folder_id}", 0.0, float),
+            reverse=True
+        )
+        preload = max(0, self.settings.value("sessions/preload_recent", DEFAULT_PRELOAD_RECENT, int))
+        current_index = by_recent[0]
+
+        # Sessions kept live for notifications are always started
+        startup = by_recent[:preload + 1] + [i for i in by_recent[preload + 1:]
+                                             if self.hibernation.is_exempt(self.tabs.widget(i))]
+
+        # currentChanged only fires if the index moves: still restoring, so the bookkeeping is done here
+        self.tabs.setCurrentIndex(current_index)
+        self._restoring_sessions = False
+        self.note_session_activated(self.tabs.widget(current_index))
+        for index in startup:
+            session_tab = self.tabs.widget(index)
+            with tracer.span("materialize session", folder_id=session_tab.folder_id):
+                # The restored tab loads right away; the rest wait in recency order
+                self.materialize_session(session_tab, deferred=index != current_index)
+
+        loaded = sum(1 for i in range(self.tabs.count()) if self.tabs.widget(i).is_materialized())
+        deferred = self.tabs.count() - loaded
+        elapsed_ms = (time.monotonic() - start_time) * 1000
+        print(f"Loaded {self.tabs.count()} session(s) in {elapsed_ms:.0f} ms: "
+              f"{loaded} started, {deferred} deferred until opened.")
+
+        if deferred:
+            self.report_deferred_savings(self.tabs.widget(current_index), deferred)
+
+    def report_deferred_savings(self, session_tab, deferred):
+        """Estima la memoria ahorrada al no cargar las sesiones diferidas.
+
+        Espera a que la sesión activa termine de cargar, mide la memoria
+        residente de su proceso de renderizado y la usa como referencia
+        del costo de cada sesión que no se inició.
+
+        Args:
+            session_tab (SessionTab): Sesión cargada que sirve de referencia.
+            deferred (int): Número de sesiones que quedaron sin cargar.
+        """
+        page = session_tab.page()
+        if not page:
+            return
+
+        def sample():
+            rss = read_rss_bytes(page.renderProcessPid())
+            if rss:
+                print(f"Deferred session(s) saved about {format_bytes(rss * deferred)} "
+                      f"of renderer memory ({format_bytes(rss)} per loaded session).")
+
+        def on_first_load(ok):
+            page.loadFinished.disconnect(on_first_load)
+            QTimer.singleShot(STARTUP_MEMORY_SAMPLE_DELAY, sample)
+
+        page.loadFinished.connect(on_first_load)
+
+    def on_current_tab_changed(self, index):
+        """Materializa la sesión al abrir su tab y registra su último uso.
+
+        Args:
+            index (int): Índice del tab que pasó a ser el actual.
+        """
+        if self._restoring_sessions or index < 0:
+            return
+
+        session_tab = self.tabs.widget(index)
+        if not session_tab:
+            return
+
+        if not session_tab.is_materialized():
+            # A parked session waits for the user to press its load button
+            if not self.crash_recovery.is_parked(session_tab.folder_id):
+                self.materialize_session(session_tab)
         else:
-            # We use the folder name as a fixed ID, and read the Alias from settings
-            for folder_id in sorted(session_folders):
-                alias = self.settings.value(f"aliases/{folder_id}", folder_id, str)
-                self.add_new_tab(alias, folder_id)
-        print(f"Loaded {len(session_folders) or 1} session(s).")
+            # A session still waiting for its startup turn loads now
+            self.load_scheduler.promote(session_tab.folder_id)
+        self.note_session_activated(session_tab)
+
+    def note_session_activated(self, session_tab):
+        """Registra que una sesión pasó a ser la actual.
+
+        Despierta la sesión, anota el cambio para la hibernación y guarda su
+        último uso, tanto al cambiar de tab como al restaurar la sesión inicial.
+
+        Args:
+            session_tab (SessionTab): Sesión que pasó a ser la actual.
+        """
+        self.hibernation.on_session_activated(session_tab, self._previous_tab)
+        self._previous_tab = session_tab
+        self.settings.setValue(f"last_used/{session_tab.folder_id}", time.time())
+
+    def show_tab_context_menu(self, pos):
+        """Muestra el menú contextual de un tab con las opciones de la sesión.
+
+        Args:
+            pos (QPoint): Posición del clic dentro de la barra de tabs.
+        """
+        tab_bar = self.tabs.tabBar()
+        index = tab_bar.tabAt(pos)
+        if index < 0:
+            return
+        session_tab = self.tabs.widget(index)
+
+        menu = QMenu(self)
+        menu.setToolTipsVisible(True)
 
-    def add_new_tab(self, name=None, folder_id=None):
+        keep_live_action = QAction(tr("🔔 Keep live for notifications"), self)
+        keep_live_action.setToolTip(tr("Never freeze or discard this session, so it always receives notifications"))
+        keep_live_action.setCheckable(True)
+        keep_live_action.setChecked(self.hibernation.is_exempt(session_tab))
+        keep_live_action.triggered.connect(lambda state: self.hibernation.set_exempt(session_tab, state))
+        menu.addAction(keep_live_action)
+
+        menu.exec(tab_bar.mapToGlobal(pos))
+
+    def add_new_tab(self, name=None, folder_id=None, lazy=False):
         """Agrega un nuevo tab con una sesión de WhatsApp Web independiente.
-        
-        Crea un nuevo perfil de navegador con almacenamiento persistente
-        aislado, configurando idioma, tema y permisos para la sesión.
-        
+
+        Crea el contenedor de la sesión y, salvo que se pida una carga
+        diferida, materializa de inmediato su perfil y su página web.
+        Las sesiones nuevas usan una sesión de reserva precargada si hay una.
+
         Args:
             name (str, opcional): Nombre alias para mostrar en el tab.
             folder_id (str, opcional): ID permanente de la carpeta de sesión.
-        
+            lazy (bool, opcional): Si es True, el tab se crea sin vista web
+                y sin cambiar el tab actual; se materializa al abrirlo.
+
         Returns:
-            QWebEngineView: El widget de la vista web del nuevo tab, o None si falla.
+            SessionTab: El contenedor del nuevo tab, o None si falla.
         """
-        # if folder_id is None, it's a brand new session
+        # if folder_id is None, it's a brand new session: use a pre-warmed spare if there is one
+        spare = None
         if folder_id is None:
-            i = 1
-            while True:
-                folder_id = f"session_{i}"
-                if not os.path.exists(os.path.join(self.sessions_dir, folder_id)):
-                    break
-                i += 1
+            spare = self.spare_pool.take()
+            if spare:
+                folder_id = spare.folder_id
+                i = folder_id.rsplit("_", 1)[1]
+            else:
+                folder_id, i = self.next_session_id()
             if name is None:
                 name = tr("Session {}").format(i)
 
@@ -528,11 +968,83 @@ class MainWindow(QMainWindow):
         if name is None:
             name = folder_id
 
+        try:
+            profile_path = os.path.join(self.sessions_dir, folder_id)
+
+            # Store alias in settings
+            self.settings.setValue(f"aliases/{folder_id}", name)
+
+            session_tab = SessionTab(folder_id, profile_path, name)
+            session_tab.load_requested.connect(lambda: self.materialize_session(session_tab))
+
+            if spare:
+                session_tab.attach_webview(spare.webview)
+            elif not lazy:
+                if not self.materialize_session(session_tab):
+                    session_tab.deleteLater()
+                    return None
+
+            # Add tab with display name
+            index = self.tabs.addTab(session_tab, name)
+            if spare or not lazy:
+                self.tabs.setCurrentIndex(index)
+            self.tabs.setTabsClosable(True)
+            self.tabs.tabBar().update()
+
+            return session_tab
+
+        except Exception as e:
+            print(f"Error creating tab: {e}")
+            return None
+
+    def materialize_session(self, session_tab, url=None, deferred=False):
+        """Crea el perfil, la página y la vista web de una sesión y la carga.
+
+        Args:
+            session_tab (SessionTab): Contenedor de la sesión a materializar.
+            url (QUrl, opcional): URL inicial; por defecto WhatsApp Web.
+            deferred (bool, opcional): Si es True, la carga se encola en el
+                planificador en lugar de iniciarse de inmediato.
+
+        Returns:
+            QWebEngineView: La vista web de la sesión, o None si falla.
+        """
+        if session_tab.is_materialized():
+            return session_tab.webview
+
+        # Loading a session by hand gives a parked session a fresh start
+        self.crash_recovery.reset(session_tab.folder_id)
+        webview = self.create_session_view(session_tab.folder_id, session_tab.profile_path)
+        if webview is None:
+            return None
+        session_tab.attach_webview(webview)
+
+        if deferred:
+            self.load_scheduler.enqueue(session_tab.folder_id, webview.page(),
+                                        lambda: self.start_session_load(session_tab, url))
+        else:
+            self.start_session_load(session_tab, url)
+
+        return webview
+
+    def create_session_view(self, folder_id, profile_path):
+        """Crea la vista web de una sesión con su propio perfil y página.
+
+        Cada sesión tiene su propio perfil de navegador con almacenamiento
+        persistente aislado, configurando idioma, tema y permisos. La vista
+        se crea oculta y sin cargar ninguna URL.
+
+        Args:
+            folder_id (str): ID permanente de la carpeta de sesión.
+            profile_path (str): Ruta del perfil persistente de la sesión.
+
+        Returns:
+            QWebEngineView: La vista web configurada, o None si falla.
+        """
         try:
             # Create web view and profile with a parent to avoid it being a top-level window in Wayland
             webview = QWebEngineView(self)
             webview.hide() # Force hide until it's properly embedded in the tab widget
-            profile_path = os.path.join(self.sessions_dir, folder_id)
 
             # Create profile directory if it doesn't exist
             if not os.path.exists(profile_path):
@@ -540,59 +1052,104 @@ class MainWindow(QMainWindow):
                 print(f"Created new profile directory: {profile_path}")
 
             # Each tab gets its own profile based on the permanent ID
-            profile = QWebEngineProfile(folder_id) # No parent yet
-            profile.setPersistentStoragePath(profile_path)
-            profile.setCachePath(os.path.join(profile_path, "cache"))
-            profile.setHttpCacheType(QWebEngineProfile.HttpCacheType.DiskHttpCache)
-            profile.setHttpCacheMaximumSize(50 * 1024 * 1024)  # 50 MB limit
-
-            # Store alias in settings
-            self.settings.setValue(f"aliases/{folder_id}", name)
-            self.settings.sync()
-
-            # Configure User-Agent and headers
-            system_locale = QLocale.system()
-            language_code = system_locale.name().replace('_', '-')
-            agent = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
-            profile.setHttpUserAgent(agent)
-            profile.setHttpAcceptLanguage(f"{language_code},en;q=0.9")
-            profile.setPersistentCookiesPolicy(QWebEngineProfile.PersistentCookiesPolicy.AllowPersistentCookies)
+            with tracer.span("create profile", "session", folder_id=folder_id):
+                profile = QWebEngineProfile(folder_id) # No parent yet
+                profile.setPersistentStoragePath(profile_path)
+                profile.setCachePath(os.path.join(profile_path, "cache"))
+                self.cache_budget.configure_profile(profile, folder_id)
+
+                # Configure User-Agent and headers
+                system_locale = QLocale.system()
+                language_code = system_locale.name().replace('_', '-')
+                agent = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
+                profile.setHttpUserAgent(agent)
+                profile.setHttpAcceptLanguage(f"{language_code},en;q=0.9")
+                profile.setPersistentCookiesPolicy(QWebEngineProfile.PersistentCookiesPolicy.AllowPersistentCookies)
 
             # Set up the page with webview as parent
             # This ensures page is destroyed with webview
-            page = web.WhatsApp(profile, webview)
-            webview.setPage(page)
+            with tracer.span("create page", "session", folder_id=folder_id):
+                page = web.WhatsApp(profile, webview, settings=self.settings, theme_watcher=self.theme_watcher)
+                webview.setPage(page)
 
             # Make the profile a child of the page so it lives as long as the page
             # and is destroyed AFTER the page is gone/stopped.
             profile.setParent(page)
 
-            # Connect signals
+            # Connect signals (folder_id, not the view's parent: a spare view hangs from MainWindow)
             profile.downloadRequested.connect(self.download)
-            profile.setNotificationPresenter(lambda notif: self.show_notification(notif, webview))
+            profile.setNotificationPresenter(lambda notif: self.show_notification(notif, folder_id))
+            page.renderProcessTerminated.connect(
+                lambda status, exit_code: self.crash_recovery.on_terminated(folder_id, status, exit_code))
 
             # Configure settings
-            self.configure_webview_settings(webview)
-            webview.load(QUrl("https://web.whatsapp.com"))
-
-            # Store permanent references
-            webview.folder_id = folder_id
-            webview.profile_path = profile_path
-            webview.profile = profile
-            webview.session_name = name # This is the alias/display name
-
-            # Add tab with display name
-            index = self.tabs.addTab(webview, name)
-            self.tabs.setCurrentIndex(index)
-            self.tabs.setTabsClosable(True)
-            self.tabs.tabBar().update()
+            self.configure_webview_settings(webview, folder_id)
 
             return webview
 
         except Exception as e:
-            print(f"Error creating tab: {e}")
+            print(f"Error creating session '{folder_id}': {e}")
             return None
 
+    def next_session_id(self):
+        """Busca el siguiente ID de carpeta libre para una sesión nueva.
+
+        Returns:
+            tuple: (folder_id, número) del primer "session_N" que no existe
+            en disco ni está reservado por la reserva de sesiones.
+        """
+        reserved = self.spare_pool.reserved_ids() if hasattr(self, 'spare_pool') else set()
+        i = 1
+        while True:
+            folder_id = f"session_{i}"
+            if (folder_id not in reserved
+                    and not os.path.exists(os.path.join(self.sessions_dir, folder_id))):
+                return folder_id, i
+            i += 1
+
+    def create_spare_session(self):
+        """Crea una sesión de reserva con WhatsApp Web ya cargado.
+
+        La carpeta se marca como reserva para que, si la aplicación se
+        cierra antes de entregarla, se elimine en el siguiente inicio.
+
+        Returns:
+            Spare: La sesión de reserva, o None si falla.
+        """
+        folder_id, _ = self.next_session_id()
+        profile_path = os.path.join(self.sessions_dir, folder_id)
+        try:
+            os.makedirs(profile_path, exist_ok=True)
+            open(os.path.join(profile_path, SPARE_MARKER), 'w').close()
+        except OSError as e:
+            print(f"Could not prepare spare session: {e}")
+            return None
+
+        webview = self.create_session_view(folder_id, profile_path)
+        if webview is None:
+            shutil.rmtree(profile_path, ignore_errors=True)
+            return None
+        webview.load(QUrl("https://web.whatsapp.com"))
+        return Spare(folder_id, profile_path, webview)
+
+    def start_session_load(self, session_tab, url=None):
+        """Inicia la carga de la página de una sesión ya materializada.
+
+        Args:
+            session_tab (SessionTab): Sesión a cargar.
+            url (QUrl, opcional): URL a cargar; por defecto WhatsApp Web.
+        """
+        webview = session_tab.webview
+        if webview is None:
+            return
+
+        folder_id = session_tab.folder_id
+        if tracer.ENABLED:
+            tracer.begin_async("page load", folder_id, folder_id=folder_id)
+            webview.page().loadFinished.connect(
+                lambda ok: tracer.end_async("page load", folder_id, ok=ok))
+        webview.load(url or QUrl("https://web.whatsapp.com"))
+
     def rename_tab(self, index, new_name):
         """Renombra un tab (alias) sin mover carpetas ni causar errores.
         
@@ -607,8 +1164,8 @@ class MainWindow(QMainWindow):
         if not new_name:
             return
 
-        current_webview = self.tabs.widget(index)
-        if not current_webview:
+        session_tab = self.tabs.widget(index)
+        if not session_tab:
             return
 
         old_name = self.tabs.tabText(index)
@@ -624,12 +1181,11 @@ class MainWindow(QMainWindow):
         try:
             # We ONLY update the alias in settings and the UI
             # No folder moves = No Segfault
-            folder_id = current_webview.folder_id
+            folder_id = session_tab.folder_id
 
             self.settings.setValue(f"aliases/{folder_id}", new_name)
-            self.settings.sync()
 
-            current_webview.session_name = new_name
+            session_tab.session_name = new_name
             self.tabs.setTabText(index, new_name)
 
             print(f"Renamed alias: '{old_name}' -> '{new_name}' (ID: {folder_id})")
@@ -646,7 +1202,8 @@ class MainWindow(QMainWindow):
         2. Limpia los settings del perfil
         3. Detiene la página web y elimina el tab
         4. Renombra la carpeta de sesión a .deleted
-        5. Programa la eliminación física después de 3 segundos
+        5. Encola la eliminación física en el hilo de borrado, que empieza
+           después de 3 segundos y se retoma en el siguiente inicio si hace falta
         
         Args:
             index (int): Índice del tab a cerrar.
@@ -671,9 +1228,9 @@ class MainWindow(QMainWindow):
 
         if reply == QMessageBox.StandardButton.Yes:
             self._closing_tab_lock = True
-            current_webview = self.tabs.widget(index)
-            folder_id = getattr(current_webview, 'folder_id', None)
-            session_path = getattr(current_webview, 'profile_path', None)
+            session_tab = self.tabs.widget(index)
+            folder_id = getattr(session_tab, 'folder_id', None)
+            session_path = getattr(session_tab, 'profile_path', None)
 
             if not folder_id or not session_path:
                 print(f"Error: Missing folder information for tab {index}")
@@ -686,17 +1243,28 @@ class MainWindow(QMainWindow):
             try:
                 # 1. Clear profile settings for this ID
                 self.settings.remove(f"aliases/{folder_id}")
-                self.settings.sync()
+                self.settings.remove(f"last_used/{folder_id}")
+                self.settings.remove(f"keep_live/{folder_id}")
+                self.settings.remove(f"presets/{folder_id}")
+                self.hibernation.forget(folder_id)
+                self.memory_governor.forget(folder_id)
+                self.crash_recovery.forget(folder_id)
+                self.cache_budget.forget(folder_id)
+                self.keep_alive.forget(folder_id)
+                self.notification_coalescer.forget_session(folder_id)
+                self.load_scheduler.cancel(folder_id)
+                if self._previous_tab is session_tab:
+                    self._previous_tab = None
 
                 # 2. Shutdown the page first to stop all JS and timers
-                if current_webview.page():
+                if session_tab.page():
                     # Stop its internal timers if any
-                    current_webview.page().runJavaScript("window.stop();")
-                    current_webview.page().deleteLater()
+                    session_tab.page().runJavaScript("window.stop();")
+                    session_tab.page().deleteLater()
 
-                # 3. Remove tab (destroys the webview container)
+                # 3. Remove tab (destroys the session container and its webview)
                 self.tabs.removeTab(index)
-                current_webview.deleteLater()
+                session_tab.deleteLater()
 
                 # If it was the last tab, recreate a new one
                 if is_last_tab:
@@ -710,15 +1278,6 @@ class MainWindow(QMainWindow):
                 # Renaming prevents the session from being loaded if the app restarts before deletion
                 temp_deleted_path = session_path + ".deleted"
 
-                def final_cleanup():
-                    # Check if program is still running
-                    if not QApplication.instance() or not QApplication.instance().activeWindow():
-                        return
-
-                    if os.path.exists(temp_deleted_path):
-                        shutil.rmtree(temp_deleted_path, ignore_errors=True)
-                        print(f"Permanently deleted session data: {temp_deleted_path}")
-
                 try:
                     if os.path.exists(session_path):
                         # On Linux, renaming usually works even if files are open
@@ -729,20 +1288,48 @@ class MainWindow(QMainWindow):
                     # If rename fails (rare on Linux), we'll try to delete the original path directly
                     temp_deleted_path = session_path
 
-                QTimer.singleShot(TAB_CLOSE_CLEANUP_DELAY, final_cleanup)
+                self.deletion_worker.enqueue(temp_deleted_path, TAB_CLOSE_CLEANUP_DELAY)
 
             except Exception as e:
                 print(f"Error closing tab: {e}")
                 QMessageBox.critical(self, tr("Error"), tr("Error closing tab: {}").format(e))
 
-    def configure_webview_settings(self, webview):
+    def apply_theme(self, is_dark):
+        """Aplica un cambio del tema del sistema a todas las páginas en una pasada.
+
+        Las páginas activas se actualizan al momento; las congeladas o
+        descartadas no se despiertan y aplican el tema al volver a Active
+        (o al recargar).
+
+        Args:
+            is_dark (bool): True si el sistema prefiere ahora el tema oscuro.
+        """
+        pages = [self.tabs.widget(i).page() for i in range(self.tabs.count())]
+        if hasattr(self, 'spare_pool'):
+            pages += [spare.webview.page() for spare in self.spare_pool.spares]
+
+        applied = 0
+        for page in pages:
+            if not isinstance(page, web.WhatsApp):
+                continue
+            if page.lifecycleState() == QWebEnginePage.LifecycleState.Active:
+                page.apply_theme()
+                applied += 1
+            else:
+                page.theme_stale = True
+        print(f"{'Dark' if is_dark else 'Light'} system theme applied to {applied} live page(s)")
+
+    def configure_webview_settings(self, webview, folder_id=None):
         """Configura todos los ajustes de la vista web.
         
-        Establece opciones para JavaScript, imágenes, WebGL, aceleración
-        de hardware y otras características del navegador embebido.
+        Establece opciones para JavaScript, imágenes y otras características
+        del navegador embebido. Los plugins, el visor de PDF, WebGL, la
+        aceleración 2D y la captura de pantalla dependen del preajuste de
+        rendimiento, que puede sobrescribirse por sesión en "presets/<folder_id>".
         
         Args:
             webview (QWebEngineView): Vista web a configurar.
+            folder_id (str, opcional): ID de la sesión, para su preajuste propio.
         """
         try:
             settings = webview.settings()
@@ -750,22 +1337,25 @@ class MainWindow(QMainWindow):
             # Configuraciones básicas
             settings.setAttribute(QWebEngineSettings.WebAttribute.JavascriptEnabled, True)
             settings.setAttribute(QWebEngineSettings.WebAttribute.JavascriptCanOpenWindows, True)
-            settings.setAttribute(QWebEngineSettings.WebAttribute.PluginsEnabled, True)
-            settings.setAttribute(QWebEngineSettings.WebAttribute.PdfViewerEnabled, True)
             settings.setAttribute(QWebEngineSettings.WebAttribute.AutoLoadImages, True)
             settings.setAttribute(QWebEngineSettings.WebAttribute.LocalStorageEnabled, True)
             settings.setAttribute(QWebEngineSettings.WebAttribute.AllowRunningInsecureContent, True)
             settings.setAttribute(QWebEngineSettings.WebAttribute.AllowWindowActivationFromJavaScript, True)
             settings.setAttribute(QWebEngineSettings.WebAttribute.ShowScrollBars, True)
             settings.setAttribute(QWebEngineSettings.WebAttribute.PlaybackRequiresUserGesture, False)
-            settings.setAttribute(QWebEngineSettings.WebAttribute.ScreenCaptureEnabled, True)
 
-            # Configuraciones avanzadas con manejo de excepciones
-            try:
-                settings.setAttribute(QWebEngineSettings.WebAttribute.WebGLEnabled, True)
-                settings.setAttribute(QWebEngineSettings.WebAttribute.Accelerated2dCanvasEnabled, True)
-            except Exception as e:
-                print(f"Warning: Could not enable hardware acceleration: {e}")
+            # Atributos del preajuste de rendimiento (global o propio de la sesión)
+            preset = PERFORMANCE_PRESET
+            if folder_id:
+                override = self.settings.value(f"presets/{folder_id}", "", str)
+                if override:
+                    preset = normalize_preset(override)
+                    print(f"Session {folder_id} uses the '{preset}' performance preset")
+            for name, enabled in view_attributes(preset).items():
+                try:
+                    settings.setAttribute(getattr(QWebEngineSettings.WebAttribute, name), enabled)
+                except Exception as e:
+                    print(f"Warning: Could not set {name}: {e}")
 
             settings.setDefaultTextEncoding("UTF-8")
 
@@ -874,11 +1464,33 @@ class MainWindow(QMainWindow):
         self.force_quit = True
 
         # 1. Stop app-level timers to avoid accessing dying objects
-        if hasattr(self, 'keep_alive_timer'):
-            self.keep_alive_timer.stop()
+        if hasattr(self, 'keep_alive'):
+            self.keep_alive.stop()
+        if hasattr(self, 'hibernation'):
+            self.hibernation.stop()
+        if hasattr(self, 'memory_governor'):
+            self.memory_governor.stop()
+        if hasattr(self, 'cache_budget'):
+            self.cache_budget.stop()
+        if hasattr(self, 'compaction_timer'):
+            self.compaction_timer.stop()
+        if hasattr(self, 'spare_pool'):
+            self.spare_pool.clear()
 
         print("Stopping application timers...")
 
+        stats = Notification.latency_stats()
+        if stats["samples"]:
+            print(f"Notification latency: p50 {stats['p50']:.1f} ms, p90 {stats['p90']:.1f} ms, "
+                  f"p99 {stats['p99']:.1f} ms ({stats['sent']} sent, {stats['dropped']} dropped, "
+                  f"{stats['failed']} failed, {stats['expired']} expired)")
+
+        if hasattr(self, 'keep_alive'):
+            stats = self.keep_alive.stats()
+            print(f"Keep-alive: {stats['pings']} ping(s) sent, {stats['saved']} wakeup(s) saved "
+                  f"({stats['visible']} visible, {stats['hibernated']} hibernated, "
+                  f"{stats['recent']} recently active, {stats['offline']} offline)")
+
         # 2. Hide UI components
         if hasattr(self, 'tray_icon'):
             self.tray_icon.hide()
@@ -946,48 +1558,89 @@ class MainWindow(QMainWindow):
                 download.stateChanged.connect(on_state_changed)
                 download.accept()
 
-    def show_notification(self, notification, source_webview):
-        """Crea una notificación del sistema a través de DBus.
+    def show_notification(self, notification, folder_id):
+        """Recibe una notificación de WebEngine y la pasa a la etapa de agrupación.
         
-        Muestra una notificación nativa con título, mensaje e icono
-        personalizados según las preferencias del usuario.
+        Los mensajes seguidos de una misma sesión o chat se unen en una sola
+        notificación del sistema, que se muestra en present_notification.
         
         Args:
             notification: Objeto de notificación de WebEngine.
-            source_webview: Vista web de origen de la notificación.
+            folder_id (str): ID permanente de la sesión de origen.
         """
-        if self.settings.value("notification/app", True, bool):
-            try:
-                title = (
-                    notification.title()
-                    if self.settings.value("notification/show_name", True, bool)
-                    else tr("WhatsApp MultiSession")
-                )
-                message = (
-                    notification.message()
-                    if self.settings.value("notification/show_msg", True, bool)
-                    else tr("New message...")
-                )
-                icon = (
-                    self.getPathImage(notification.icon())
-                    if self.settings.value("notification/show_photo", True, bool)
-                    else "com.dev.sriramp.whatsappLinux"
-                )
+        # Una sesión que notifica está despierta: su próximo ping sobra
+        self.keep_alive.note_activity(folder_id)
+        if not self.settings.value("notification/app", True, bool):
+            return
+        try:
+            self.notification_coalescer.submit(folder_id, notification.title(), notification.message(),
+                                               notification.icon())
+        except Exception as e:
+            print(e)
 
+    def present_notification(self, group):
+        """Crea o actualiza la notificación del sistema de un grupo a través de DBus.
+        
+        Muestra una notificación nativa con título, mensaje e icono
+        personalizados según las preferencias del usuario. Si el grupo ya
+        tiene una notificación en pantalla, se reemplaza (replaces_id) con el
+        número de mensajes acumulados.
+        
+        Args:
+            group (NotificationGroup): Grupo de mensajes a mostrar.
+        """
+        try:
+            show_name = self.settings.value("notification/show_name", True, bool)
+            show_msg = self.settings.value("notification/show_msg", True, bool)
+
+            title = group.title if show_name else tr("WhatsApp MultiSession")
+            if len(group.key) == 1 and group.count > 1 and show_name:
+                # Grouped by session: the last chat's name no longer describes the popup
+                session_tab = self.find_session(group.folder_id)
+                title = session_tab.session_name if session_tab else title
+            message = group.message if show_msg else tr("New message...")
+            if group.count > 1:
+                summary = tr("{} new messages").format(group.count)
+                message = f"{summary}\n{message}" if show_msg else summary
+
+            show_photo = self.settings.value("notification/show_photo", True, bool)
+            use_image_data = self.settings.value("notification/image_data", True, bool)
+
+            n = group.notification
+            if n is None:
                 n = Notification.Notification(title, message, timeout=3000)
                 n.setUrgency(Notification.Urgency.NORMAL)
                 n.setCategory("im.received")
-                n.setIconPath(icon)
                 n.setHint("desktop-entry", "com.dev.sriramp.whatsappLinux")
-                n.show()
-            except Exception as e:
-                print(e)
+                n.onClosed(lambda closed, key=group.key: self.notification_coalescer.reset(key, closed))
+                group.notification = n
+            else:
+                n.title, n.body = title, message
+
+            # Raw pixels in the image-data hint: no PNG encoding and no file per message
+            avatar = self.getAvatarImage(group.icon) if show_photo and use_image_data else None
+            if avatar is not None:
+                n.setImageData(avatar)
+            else:
+                n.hints.pop("image-data", None)
+                icon = (
+                    self.getPathImage(group.icon)
+                    if show_photo
+                    else "com.dev.sriramp.whatsappLinux"
+                )
+                n.setIconPath(icon)
+            n.show()
+        except Exception as e:
+            print(e)
 
     def getPathImage(self, qin):
-        """Guarda la imagen de contacto en carpeta temporal para notificaciones.
+        """Obtiene la imagen de contacto redondeada como archivo, para el modo por ruta.
         
-        Procesa la imagen de contacto de WhatsApp, la redondea y la guarda
-        en un archivo temporal para usarla como icono de notificación.
+        Se usa cuando "notification/image_data" está desactivado. Los avatares,
+        ya reducidos al tamaño del icono, se guardan en ~/.WAms/tmp/avatars con
+        un nombre derivado del contenido de la imagen, así que un mismo contacto
+        solo se pinta y se escribe una vez y dos notificaciones seguidas nunca
+        comparten archivo.
         
         Args:
             qin (QImage): Imagen de contacto a procesar.
@@ -996,36 +1649,45 @@ class MainWindow(QMainWindow):
             str: Ruta al archivo de imagen guardada o icono fallback.
         """
         try:
-            tmp_dir = os.path.join(self.app_dir, "tmp")
-            if not os.path.exists(tmp_dir):
-                os.makedirs(tmp_dir)
-
-            path = os.path.join(tmp_dir, "whatsapp.png")
-
-            qout = QImage(qin.width(), qin.height(), QImage.Format.Format_ARGB32)
-            qout.fill(Qt.GlobalColor.transparent)
-
-            brush = QBrush(qin)
-            pen = QPen()
-            pen.setColor(Qt.GlobalColor.darkGray)
-            pen.setJoinStyle(Qt.PenJoinStyle.RoundJoin)
-
-            painter = QPainter(qout)
-            painter.setBrush(brush)
-            painter.setPen(pen)
-            painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
-            painter.drawRoundedRect(
-                0, 0, qin.width(), qin.height(), qin.width() // 2, qin.height() // 2
-            )
-            painter.end()
-            c = qout.save(path)
-            if c == False:
-                return "com.dev.sriramp.whatsappLinux"
-            else:
-                return path
-        except:
+            path = self.get_avatar_cache().get(qin, self.notification_icon_size())
+            return path or "com.dev.sriramp.whatsappLinux"
+        except Exception as e:
+            print(f"Could not prepare notification avatar: {e}")
             return "com.dev.sriramp.whatsappLinux"
 
+    def getAvatarImage(self, qin):
+        """Obtiene la imagen de contacto redondeada y reducida, sin escribir archivos.
+
+        Args:
+            qin (QImage): Imagen de contacto a procesar.
+
+        Returns:
+            QImage: Avatar para el hint "image-data", o None si no hay imagen.
+        """
+        try:
+            return self.get_avatar_cache().image(qin, self.notification_icon_size())
+        except Exception as e:
+            print(f"Could not prepare notification avatar: {e}")
+            return None
+
+    def get_avatar_cache(self):
+        """Devuelve la caché de avatares, creándola la primera vez que se usa."""
+        if self.avatar_cache is None:
+            limit_mb = self.settings.value("notification/avatar_cache_mb", DEFAULT_AVATAR_CACHE_MB, int)
+            self.avatar_cache = AvatarCache(os.path.join(self.app_dir, "tmp", "avatars"),
+                                            limit_mb * 1024 * 1024)
+        return self.avatar_cache
+
+    def notification_icon_size(self):
+        """Devuelve el lado del icono de notificación en píxeles físicos.
+
+        La especificación de notificaciones no permite consultar el tamaño
+        que usa el servidor, así que se toma "notification/icon_size" (en
+        píxeles lógicos) y se multiplica por la escala de la pantalla.
+        """
+        size = self.settings.value("notification/icon_size", DEFAULT_ICON_SIZE, int)
+        return max(16, round(size * self.devicePixelRatioF()))
+
     def closeEvent(self, event):
         """Maneja el evento de cierre de ventana: minimizar a bandeja o salir.
         
@@ -1051,7 +1713,6 @@ class MainWindow(QMainWindow):
     def toggle_ask_before_link(self, state):
         """Habilita o deshabilita la confirmación antes de abrir un enlace externo."""
         self.settings.setValue("general/ask_before_link", state)
-        self.settings.sync()
 
     def toggle_autostart(self, state):
         """Habilita o deshabilita el inicio automático de la aplicación al iniciar sesión.
@@ -1118,10 +1779,14 @@ class MainWindow(QMainWindow):
                 print(f"Error disabling autostart: {e}")
                 QMessageBox.warning(self, tr("Error"), f"Could not disable autostart: {e}")
 
-        self.settings.sync()
+    def process_url(self, url, clicked_at=0.0):
+        """Procesa una URL entrante y la carga en la sesión activa.
 
-    def process_url(self, url):
-        """Procesa una URL entrante y la carga en la sesión activa."""
+        Args:
+            url (str): URL externa (wa.me, whatsapp:// o api.whatsapp.com).
+            clicked_at (float, opcional): Instante del clic como fecha Unix;
+                si se indica, se registra cuánto tardó en abrirse el chat.
+        """
         print(f"[*] Ventana principal procesando URL: {url}")
         self.show_window()
         
@@ -1151,10 +1816,37 @@ class MainWindow(QMainWindow):
                 return
                 
         if target_index >= 0:
+            session_tab = self.tabs.widget(target_index)
+            if not session_tab:
+                return
+            if session_tab.is_materialized():
+                # The chat replaces any startup load still waiting for its turn
+                self.load_scheduler.cancel(session_tab.folder_id)
+                session_tab.webview.load(QUrl(web_url))
+            else:
+                # Open the chat directly instead of loading WhatsApp Web twice
+                self.materialize_session(session_tab, QUrl(web_url))
             self.tabs.setCurrentIndex(target_index)
-            webview = self.tabs.widget(target_index)
-            if webview:
-                webview.load(QUrl(web_url))
+
+            if clicked_at:
+                self.report_link_latency(session_tab, clicked_at)
+
+    def report_link_latency(self, session_tab, clicked_at):
+        """Registra el tiempo entre el clic en un enlace y la carga del chat.
+
+        Args:
+            session_tab (SessionTab): Sesión donde se abrió el enlace.
+            clicked_at (float): Instante del clic como fecha Unix.
+        """
+        page = session_tab.page()
+        if not page:
+            return
+
+        def on_chat_loaded(ok):
+            page.loadFinished.disconnect(on_chat_loaded)
+            print(f"[*] Chat opened {(time.time() - clicked_at) * 1000:.0f} ms after the link was clicked")
+
+        page.loadFinished.connect(on_chat_loaded)
 
 
 
@@ -1201,6 +1893,7 @@ def main():
     Inicializa la aplicación Qt, configura nombres y parámetros,
     crea la ventana principal y ejecuta el bucle de eventos.
     """
+    tracer.begin("QApplication")
     app = QApplication(sys.argv)
 
     # Establecer nombres de aplicación para evitar que "main.py" o "python"
@@ -1213,27 +1906,30 @@ def main():
 
     system_locale = QLocale.system()
     QLocale.setDefault(system_locale)
+    tracer.end("QApplication")
 
     # Implementación de instancia única con D-Bus
+    # (el caso habitual ya lo resolvió el reenvío rápido al inicio del módulo;
+    # esto cubre dos instancias lanzadas casi a la vez)
+    tracer.begin("single instance check")
     dbus_conn = QDBusConnection.sessionBus()
-    SERVICE_NAME = "org.wams.SingleInstance"
 
     if not dbus_conn.registerService(SERVICE_NAME):
         # Ya hay una instancia en ejecución, le pasamos los argumentos y terminamos
         url_to_open = ""
         if len(sys.argv) > 1:
             url_to_open = sys.argv[1]
-            
-        msg = QDBusMessage.createMethodCall(SERVICE_NAME, "/", "", "handle_url")
-        msg << url_to_open
-        dbus_conn.call(msg)
+
+        send_url(dbus_conn, url_to_open, process_start_time())
         
         sys.exit(0)
         
     dbus_handler = DBusHandler()
     dbus_conn.registerObject("/", dbus_handler, QDBusConnection.RegisterOption.ExportAllSlots)
+    tracer.end("single instance check")
 
-    window = MainWindow()
+    with tracer.span("MainWindow"):
+        window = MainWindow()
     window.setWindowTitle("WhatsApp MultiSession")
     
     dbus_handler.url_received.connect(window.process_url)
@@ -1243,15 +1939,46 @@ def main():
 
     # Procesar la URL inicial si la hay, usando un timer para asegurar que la UI esté lista
     if len(sys.argv) > 1:
-        QTimer.singleShot(500, lambda: window.process_url(sys.argv[1]))
+        clicked_at = process_start_time() or 0.0
+        QTimer.singleShot(500, lambda: window.process_url(sys.argv[1], clicked_at))
+
+    with tracer.span("show window"):
+        if window.settings.value("window/maximized", False, bool):
+            window.showMaximized()
+        else:
+            window.show()
 
-    if window.settings.value("window/maximized", False, bool):
-        window.showMaximized()
-    else:
-        window.show()
+    if tracer.ENABLED:
+        finish_startup_trace(app, window)
 
     sys.exit(app.exec())
 
+def finish_startup_trace(app, window):
+    """Guarda la traza de arranque cuando terminan las cargas iniciales.
+
+    Revisa periódicamente si quedan cargas de página pendientes o en cola
+    y escribe el archivo en cuanto terminan, o al cumplirse TRACE_STARTUP_TIMEOUT.
+
+    Args:
+        app (QApplication): Aplicación a la que se asocia el timer de revisión.
+        window (MainWindow): Ventana principal con el planificador de cargas.
+    """
+    tracer.instant("event loop start")
+    started = time.monotonic()
+    poll_timer = QTimer(app)
+
+    def poll():
+        timed_out = (time.monotonic() - started) * 1000 >= TRACE_STARTUP_TIMEOUT
+        loads_done = tracer.pending_async() == 0 and window.load_scheduler.is_idle()
+        if loads_done or timed_out:
+            poll_timer.stop()
+            if timed_out:
+                tracer.instant("trace timeout", pending_loads=tracer.pending_async())
+            tracer.write()
+
+    poll_timer.timeout.connect(poll)
+    poll_timer.start(500)
+
 
 if __name__ == "__main__":
     main()
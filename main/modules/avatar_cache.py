@@ -0,0 +1,194 @@
+"""
+Módulo avatar_cache - Caché de avatares redondeados para notificaciones.
+Reduce cada avatar al tamaño del icono de notificación y lo redondea una
+sola vez por contenido: los mensajes repetidos del mismo chat reutilizan
+la imagen ya pintada. Los avatares se guardan en memoria para enviarlos
+con el hint "image-data" y, solo si se piden como archivo, en una carpeta
+con nombres derivados del hash de la imagen original.
+"""
+import hashlib
+import os
+from collections import OrderedDict
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QImage, QPainter, QBrush, QPen
+
+DEFAULT_AVATAR_CACHE_MB = 10
+"""Tamaño máximo de la carpeta de avatares en disco (MB)"""
+
+MEMORY_ENTRIES = 128
+"""Avatares recientes que se recuerdan en memoria (imágenes y rutas)"""
+
+DEFAULT_ICON_SIZE = 64
+"""Lado del icono de notificación en píxeles lógicos"""
+
+def image_key(image, size=0):
+    """Calcula la clave de contenido de una imagen.
+
+    Args:
+        image (QImage): Imagen original del contacto.
+        size (int, opcional): Tamaño al que se reduce el avatar (0 para el original).
+
+    Returns:
+        str: Hash hexadecimal de los píxeles, el tamaño, el formato y el tamaño final.
+    """
+    bits = image.constBits()
+    bits.setsize(image.sizeInBytes())
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{image.width()}x{image.height()}:{image.format().value}:{size}:".encode())
+    digest.update(bytes(bits))
+    return digest.hexdigest()
+
+def render_round_avatar(qin, size=0):
+    """Pinta una imagen de contacto recortada en forma redondeada.
+
+    Args:
+        qin (QImage): Imagen de contacto original.
+        size (int, opcional): Lado máximo del resultado; la imagen se reduce
+            antes de redondearla para no pintar píxeles que se descartarían.
+
+    Returns:
+        QImage: Imagen ARGB32 con el avatar redondeado.
+    """
+    if size > 0 and (qin.width() > size or qin.height() > size):
+        qin = qin.scaled(size, size, Qt.AspectRatioMode.KeepAspectRatio,
+                         Qt.TransformationMode.SmoothTransformation)
+
+    qout = QImage(qin.width(), qin.height(), QImage.Format.Format_ARGB32)
+    qout.fill(Qt.GlobalColor.transparent)
+
+    brush = QBrush(qin)
+    pen = QPen()
+    pen.setColor(Qt.GlobalColor.darkGray)
+    pen.setJoinStyle(Qt.PenJoinStyle.RoundJoin)
+
+    painter = QPainter(qout)
+    painter.setBrush(brush)
+    painter.setPen(pen)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+    painter.drawRoundedRect(
+        0, 0, qin.width(), qin.height(), qin.width() // 2, qin.height() // 2
+    )
+    painter.end()
+    return qout
+
+class AvatarCache:
+    """Caché de avatares direccionada por contenido.
+
+    Las imágenes y rutas de los avatares recientes se recuerdan en LRU en
+    memoria; los archivos (solo para el modo por ruta) viven en una carpeta
+    cuyo tamaño se limita borrando los usados hace más tiempo.
+    """
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_AVATAR_CACHE_MB * 1024 * 1024, memory_entries=MEMORY_ENTRIES):
+        """Inicializa la caché; la carpeta se crea al guardar el primer archivo.
+
+        Args:
+            cache_dir (str): Carpeta de los avatares (~/.WAms/tmp/avatars).
+            max_bytes (int, opcional): Tamaño máximo de la carpeta.
+            memory_entries (int, opcional): Entradas del LRU en memoria.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self.entries = OrderedDict()
+        self.images = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def image(self, image, size=DEFAULT_ICON_SIZE):
+        """Devuelve el avatar redondeado y reducido de una imagen, sin tocar el disco.
+
+        Args:
+            image (QImage): Imagen original del contacto.
+            size (int, opcional): Lado del icono en píxeles físicos.
+
+        Returns:
+            QImage: Avatar listo para el hint "image-data", o None si la imagen es nula.
+        """
+        if image is None or image.isNull():
+            return None
+
+        key = image_key(image, size)
+        avatar = self.images.get(key)
+        if avatar is not None:
+            self.images.move_to_end(key)
+            self.hits += 1
+            return avatar
+
+        avatar = render_round_avatar(image, size)
+        self.misses += 1
+        self.images[key] = avatar
+        while len(self.images) > self.memory_entries:
+            self.images.popitem(last=False)
+        return avatar
+
+    def get(self, image, size=DEFAULT_ICON_SIZE):
+        """Devuelve la ruta del avatar redondeado de una imagen, pintándolo solo si hace falta.
+
+        Args:
+            image (QImage): Imagen original del contacto.
+            size (int, opcional): Lado del icono en píxeles físicos.
+
+        Returns:
+            str: Ruta del PNG, o None si la imagen es nula o no se pudo guardar.
+        """
+        if image is None or image.isNull():
+            return None
+
+        key = image_key(image, size)
+        path = self.entries.get(key)
+        if path and os.path.exists(path):
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return path
+
+        path = os.path.join(self.cache_dir, f"{key}.png")
+        if os.path.exists(path):
+            # Ya estaba en disco de una ejecución anterior: se marca como usado
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+            self.hits += 1
+        else:
+            # Escritura atómica: otra notificación nunca ve un archivo a medio escribir
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            if not self.image(image, size).save(tmp_path, "PNG"):
+                return None
+            os.replace(tmp_path, path)
+            self.evict_disk()
+
+        self.entries[key] = path
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.memory_entries:
+            self.entries.popitem(last=False)
+        return path
+
+    def evict_disk(self):
+        """Borra los avatares usados hace más tiempo hasta respetar el tamaño máximo."""
+        files = []
+        total = 0
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.is_file():
+                        stat = entry.stat()
+                        files.append((stat.st_mtime, stat.st_size, entry.path))
+                        total += stat.st_size
+        except OSError:
+            return
+
+        if total <= self.max_bytes:
+            return
+        files.sort()
+        for mtime, size, path in files:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        print(f"Avatar cache trimmed to {total // 1024} KB")
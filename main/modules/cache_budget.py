@@ -0,0 +1,266 @@
+"""
+Módulo cache_budget - Presupuesto global de caché HTTP entre sesiones.
+Reparte un tamaño total de caché entre los perfiles de todas las sesiones
+según su uso reciente, en lugar de dar a cada perfil una caché fija, y
+mide el tamaño y la tasa de aciertos de la caché de cada sesión.
+"""
+import os
+import threading
+import time
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from PyQt6.QtWebEngineCore import QWebEngineProfile, QWebEnginePage
+
+from modules.procstats import format_bytes
+
+DEFAULT_TOTAL_CACHE_MB = 200
+"""Tamaño total de caché HTTP repartido entre todas las sesiones (MB)"""
+
+DEFAULT_MIN_CACHE_MB = 10
+"""Caché mínima de cada sesión, por poco que se use (MB)"""
+
+MIN_QUOTA = 1024 * 1024
+"""Cuota más pequeña que se aplica a un perfil (1 MB): Qt toma 0 como tamaño automático, sin límite"""
+
+DEFAULT_COLD_AFTER_DAYS = 14
+"""Días sin usar una sesión para considerarla fría"""
+
+REBALANCE_INTERVAL = 600000
+"""Intervalo de reparto del presupuesto y medición de las cachés (10 minutos)"""
+
+REBALANCE_THRESHOLD = 0.25
+"""Cambio relativo mínimo de cuota para aplicarlo a un perfil ya abierto"""
+
+CACHE_HITS_SCRIPT = """
+(function() {
+    var entries = performance.getEntriesByType('resource');
+    var hits = 0, requests = 0;
+    for (var i = 0; i < entries.length; i++) {
+        // Sin Timing-Allow-Origin los tamaños son 0 y no se puede saber
+        if (!entries[i].decodedBodySize) continue;
+        requests++;
+        if (entries[i].transferSize === 0) hits++;
+    }
+    return [hits, requests];
+})();
+"""
+"""Cuenta los recursos de la página servidos desde caché (transferSize 0)"""
+
+def directory_size(path):
+    """Calcula el tamaño total de los archivos de una carpeta.
+
+    Args:
+        path (str): Carpeta a medir.
+
+    Returns:
+        int: Bytes ocupados por los archivos (0 si la carpeta no existe).
+    """
+    total = 0
+    for root, dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+def split_budget(last_used, total, minimum):
+    """Reparte un presupuesto de caché según el uso reciente de cada sesión.
+
+    Cada sesión recibe el mínimo y el resto se reparte con pesos 1, 1/2,
+    1/3... según el orden de uso, de la más reciente a la más antigua.
+    Ninguna cuota baja de MIN_QUOTA, aunque el total no alcance (por
+    ejemplo, "cache/total_mb" a 0).
+
+    Args:
+        last_used (dict): ID de sesión -> fecha Unix del último uso (0 si nunca).
+        total (int): Presupuesto total en bytes.
+        minimum (int): Cuota mínima por sesión en bytes.
+
+    Returns:
+        dict: ID de sesión -> cuota en bytes.
+    """
+    if not last_used:
+        return {}
+    count = len(last_used)
+    if total <= minimum * count:
+        return {folder_id: max(MIN_QUOTA, total // count) for folder_id in last_used}
+
+    ranked = sorted(last_used, key=last_used.get, reverse=True)
+    weights = [1 / (rank + 1) for rank in range(count)]
+    spare = total - minimum * count
+    weight_sum = sum(weights)
+    return {folder_id: max(MIN_QUOTA, minimum + int(spare * weight / weight_sum))
+            for folder_id, weight in zip(ranked, weights)}
+
+class CacheBudget(QObject):
+    """Reparto periódico de "cache/total_mb" entre las sesiones abiertas.
+
+    La cuota de cada perfil se fija al crearlo y se revisa cada 10 minutos
+    con setHttpCacheMaximumSize. Como cambiar la caché de un perfil abierto
+    reinicia su contexto de red, solo se aplica a sesiones en segundo plano
+    y cuando la cuota cambia de forma apreciable. Con "cache/memory_for_cold"
+    las sesiones sin usar en "cache/cold_after_days" días se crean con una
+    caché en memoria en lugar de en disco.
+    """
+    sizes_measured = pyqtSignal(dict)
+
+    def __init__(self, tabs, settings, parent=None):
+        """Inicializa el presupuesto y programa el reparto periódico.
+
+        Args:
+            tabs (QTabWidget): Widget de tabs con los contenedores de sesión.
+            settings (Config): Ajustes de la aplicación (config.ini).
+            parent: Objeto padre de Qt.
+        """
+        super().__init__(parent)
+        self.tabs = tabs
+        self.settings = settings
+        self.quotas = {}
+        self.applied = {}
+        self.sizes = {}
+        self.hits = {}
+        self.measuring = False
+
+        self.sizes_measured.connect(self._on_sizes_measured)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.rebalance)
+        self.timer.start(REBALANCE_INTERVAL)
+
+    def stop(self):
+        """Detiene el reparto periódico."""
+        self.timer.stop()
+
+    def sessions(self):
+        """Devuelve los contenedores de sesión de todos los tabs."""
+        return [self.tabs.widget(i) for i in range(self.tabs.count())]
+
+    def compute_quotas(self, extra_id=None):
+        """Calcula la cuota de cada sesión con los ajustes actuales.
+
+        Args:
+            extra_id (str, opcional): Sesión que aún no tiene tab (por ejemplo,
+                una reserva en preparación) y que también debe contarse.
+
+        Returns:
+            dict: ID de sesión -> cuota en bytes.
+        """
+        ids = [t.folder_id for t in self.sessions()]
+        if extra_id and extra_id not in ids:
+            ids.append(extra_id)
+        last_used = {folder_id: self.settings.value(f"last_used/{folder_id}", 0.0, float)
+                     for folder_id in ids}
+        total = self.settings.value("cache/total_mb", DEFAULT_TOTAL_CACHE_MB, int) * 1024 * 1024
+        minimum = self.settings.value("cache/min_mb", DEFAULT_MIN_CACHE_MB, int) * 1024 * 1024
+        self.quotas = split_budget(last_used, total, minimum)
+        return self.quotas
+
+    def is_cold(self, folder_id):
+        """Indica si una sesión lleva tiempo sin usarse.
+
+        Args:
+            folder_id (str): ID permanente de la sesión.
+
+        Returns:
+            bool: True si su último uso es anterior a "cache/cold_after_days".
+        """
+        last_used = self.settings.value(f"last_used/{folder_id}", 0.0, float)
+        cold_after = self.settings.value("cache/cold_after_days", DEFAULT_COLD_AFTER_DAYS, int) * 86400
+        # Una sesión sin registro de uso es nueva, no fría
+        return bool(last_used) and time.time() - last_used > cold_after
+
+    def configure_profile(self, profile, folder_id):
+        """Aplica el tipo y la cuota de caché a un perfil recién creado.
+
+        Args:
+            profile (QWebEngineProfile): Perfil de la sesión.
+            folder_id (str): ID permanente de la sesión.
+        """
+        if self.settings.value("cache/memory_for_cold", False, bool) and self.is_cold(folder_id):
+            profile.setHttpCacheType(QWebEngineProfile.HttpCacheType.MemoryHttpCache)
+            print(f"Session {folder_id} is cold, using an in-memory HTTP cache")
+        else:
+            profile.setHttpCacheType(QWebEngineProfile.HttpCacheType.DiskHttpCache)
+
+        quota = self.compute_quotas(folder_id).get(folder_id, MIN_QUOTA)
+        profile.setHttpCacheMaximumSize(quota)
+        self.applied[folder_id] = quota
+
+    def forget(self, folder_id):
+        """Elimina el rastro de una sesión cerrada.
+
+        Args:
+            folder_id (str): ID permanente de la sesión.
+        """
+        for data in (self.quotas, self.applied, self.sizes, self.hits):
+            data.pop(folder_id, None)
+
+    def rebalance(self):
+        """Reparte de nuevo el presupuesto y mide las cachés de las sesiones."""
+        quotas = self.compute_quotas()
+        current = self.tabs.currentWidget()
+        changed = 0
+
+        for session_tab in self.sessions():
+            profile = session_tab.profile
+            if profile is None or session_tab is current:
+                continue
+            quota = quotas.get(session_tab.folder_id, MIN_QUOTA)
+            applied = self.applied.get(session_tab.folder_id)
+            if applied and abs(quota - applied) / applied < REBALANCE_THRESHOLD:
+                continue
+            profile.setHttpCacheMaximumSize(quota)
+            self.applied[session_tab.folder_id] = quota
+            changed += 1
+
+        if changed:
+            print(f"HTTP cache budget rebalanced: {changed} session(s) updated, "
+                  f"{format_bytes(sum(quotas.values()))} in total")
+        self.measure()
+
+    def measure(self):
+        """Mide en segundo plano el tamaño de las cachés y pide a cada página sus aciertos."""
+        for session_tab in self.sessions():
+            page = session_tab.page()
+            if page and page.lifecycleState() == QWebEnginePage.LifecycleState.Active:
+                folder_id = session_tab.folder_id
+                page.runJavaScript(CACHE_HITS_SCRIPT,
+                                   lambda result, folder_id=folder_id: self._on_hits(folder_id, result))
+
+        if self.measuring:
+            return
+        self.measuring = True
+        paths = {t.folder_id: t.profile.cachePath() for t in self.sessions() if t.profile}
+        threading.Thread(target=lambda: self.sizes_measured.emit(
+            {folder_id: directory_size(path) for folder_id, path in paths.items()}),
+            name="wams-cache-size", daemon=True).start()
+
+    def _on_sizes_measured(self, sizes):
+        """Guarda en el hilo de la GUI los tamaños medidos."""
+        self.measuring = False
+        self.sizes.update(sizes)
+
+    def _on_hits(self, folder_id, result):
+        """Guarda los aciertos de caché informados por una página."""
+        if isinstance(result, list) and len(result) == 2:
+            self.hits[folder_id] = (int(result[0]), int(result[1]))
+
+    def describe(self, folder_id):
+        """Devuelve un resumen legible de la caché de una sesión.
+
+        Args:
+            folder_id (str): ID permanente de la sesión.
+
+        Returns:
+            str: Por ejemplo "12.3 MB / 40.0 MB, 85% hits", o "—" sin datos.
+        """
+        quota = self.applied.get(folder_id)
+        if quota is None:
+            return "—"
+        text = f"{format_bytes(self.sizes[folder_id])} / " if folder_id in self.sizes else ""
+        text += format_bytes(quota)
+        hits, requests = self.hits.get(folder_id, (0, 0))
+        if requests:
+            text += f", {100 * hits // requests}% hits"
+        return text
@@ -0,0 +1,195 @@
+"""
+Módulo coalescer - Agrupación y control de ráfagas de notificaciones.
+Une los mensajes que llegan seguidos de una misma sesión o chat en una
+sola notificación ("5 mensajes nuevos") que se actualiza en lugar de abrir
+ventanas nuevas, y limita cuántas notificaciones puede mostrar cada sesión
+por minuto.
+"""
+import time
+from collections import deque
+
+from PyQt6.QtCore import QObject, QTimer
+
+DEFAULT_COALESCE_WINDOW = 2000
+"""Ventana de espera (ms) en la que los mensajes seguidos se unen en una actualización"""
+
+DEFAULT_MAX_PER_MINUTE = 6
+"""Notificaciones mostradas o actualizadas por sesión y minuto como máximo"""
+
+GROUP_IDLE_RESET = 30
+"""Segundos sin mensajes tras los que un grupo vuelve a empezar desde cero"""
+
+RATE_WINDOW = 60
+"""Periodo (segundos) del límite de notificaciones por sesión"""
+
+class NotificationGroup:
+    """Mensajes pendientes de una sesión o chat y su notificación en pantalla."""
+
+    def __init__(self, key, folder_id):
+        """Inicializa un grupo vacío.
+
+        Args:
+            key (tuple): Clave del grupo (sesión, o sesión y chat).
+            folder_id (str): ID de la sesión de origen.
+        """
+        self.key = key
+        self.folder_id = folder_id
+        self.count = 0
+        self.title = ""
+        self.message = ""
+        self.icon = None
+        self.pending = False
+        self.last_activity = 0.0
+        self.notification = None
+        self.timer = None
+
+class NotificationCoalescer(QObject):
+    """Etapa de agrupación entre WebEngine y el servidor de notificaciones.
+
+    El primer mensaje de un grupo se muestra al instante; los que llegan
+    durante "notification/coalesce_window" se acumulan y se muestran juntos
+    al cerrarse la ventana, reutilizando la misma notificación (replaces_id).
+    Cada sesión puede mostrar como mucho "notification/max_per_minute"
+    notificaciones por minuto; el exceso espera y se une al grupo. Los
+    grupos sin pendientes e inactivos más de GROUP_IDLE_RESET segundos se
+    eliminan en cada submit, aunque su notificación nunca se cierre.
+    """
+
+    def __init__(self, settings, present, parent=None):
+        """Inicializa la etapa de agrupación.
+
+        Args:
+            settings (Config): Ajustes de la aplicación (config.ini).
+            present (callable): Función que muestra o actualiza la notificación
+                de un NotificationGroup.
+            parent: Objeto padre de Qt.
+        """
+        super().__init__(parent)
+        self.settings = settings
+        self.present = present
+        self.groups = {}
+        self.sent = {}
+        self.merged = 0
+
+    def submit(self, folder_id, title, message, icon):
+        """Recibe una notificación de una sesión.
+
+        Args:
+            folder_id (str): ID de la sesión de origen.
+            title (str): Título (normalmente el chat o contacto).
+            message (str): Texto del mensaje.
+            icon (QImage): Imagen del contacto, o None.
+        """
+        now = time.monotonic()
+        by_chat = self.settings.value("notification/coalesce_by", "chat", str) != "session"
+        key = (folder_id, title) if by_chat else (folder_id,)
+
+        # Los grupos inactivos se olvidan aunque su notificación nunca se cierre
+        self.prune(now)
+        group = self.groups.get(key)
+        if group is None:
+            group = NotificationGroup(key, folder_id)
+            self.groups[key] = group
+
+        if group.pending:
+            self.merged += 1
+        group.count += 1
+        group.title = title
+        group.message = message
+        group.icon = icon
+        group.pending = True
+        group.last_activity = now
+
+        # Dentro de la ventana el mensaje espera a que cierre; fuera, se muestra ya
+        if group.timer is None or not group.timer.isActive():
+            self.flush(group)
+
+    def flush(self, group):
+        """Muestra el estado acumulado de un grupo si el límite de la sesión lo permite.
+
+        Args:
+            group (NotificationGroup): Grupo a mostrar.
+        """
+        if not group.pending:
+            return
+
+        wait = self._rate_wait(group.folder_id)
+        if wait > 0:
+            self._start_timer(group, int(wait * 1000) + 1)
+            return
+
+        self.sent.setdefault(group.folder_id, deque()).append(time.monotonic())
+        group.pending = False
+        self.present(group)
+        self._start_timer(group, self.settings.value("notification/coalesce_window",
+                                                     DEFAULT_COALESCE_WINDOW, int))
+
+    def reset(self, key, notification=None):
+        """Olvida un grupo cuando su notificación se cierra, para que el siguiente mensaje empiece de cero.
+
+        Args:
+            key (tuple): Clave del grupo.
+            notification (opcional): Notificación cerrada; si se indica, el grupo
+                solo se olvida si sigue siendo el suyo (no uno nuevo con la misma clave).
+        """
+        group = self.groups.get(key)
+        if group is None or group.pending:
+            return
+        if notification is not None and group.notification is not notification:
+            return
+        self._stop_timer(group)
+        del self.groups[key]
+
+    def prune(self, now=None):
+        """Olvida los grupos sin mensajes pendientes e inactivos más de GROUP_IDLE_RESET segundos.
+
+        Args:
+            now (float, opcional): Instante actual (time.monotonic).
+
+        Returns:
+            int: Grupos eliminados.
+        """
+        now = time.monotonic() if now is None else now
+        idle = [key for key, group in self.groups.items()
+                if not group.pending and now - group.last_activity > GROUP_IDLE_RESET]
+        for key in idle:
+            self._stop_timer(self.groups.pop(key))
+        return len(idle)
+
+    def forget_session(self, folder_id):
+        """Elimina los grupos y el historial de una sesión cerrada.
+
+        Args:
+            folder_id (str): ID permanente de la sesión.
+        """
+        for key in [k for k, g in self.groups.items() if g.folder_id == folder_id]:
+            self._stop_timer(self.groups.pop(key))
+        self.sent.pop(folder_id, None)
+
+    def _rate_wait(self, folder_id):
+        """Devuelve los segundos que faltan para que la sesión pueda notificar de nuevo."""
+        limit = self.settings.value("notification/max_per_minute", DEFAULT_MAX_PER_MINUTE, int)
+        if limit <= 0:
+            return 0
+        sent = self.sent.setdefault(folder_id, deque())
+        now = time.monotonic()
+        while sent and now - sent[0] >= RATE_WINDOW:
+            sent.popleft()
+        if len(sent) < limit:
+            return 0
+        return RATE_WINDOW - (now - sent[0])
+
+    def _start_timer(self, group, delay):
+        """(Re)programa el cierre de la ventana de un grupo."""
+        if group.timer is None:
+            group.timer = QTimer(self)
+            group.timer.setSingleShot(True)
+            group.timer.timeout.connect(lambda: self.flush(group))
+        group.timer.start(max(0, delay))
+
+    def _stop_timer(self, group):
+        """Detiene y libera el temporizador de un grupo."""
+        if group.timer is not None:
+            group.timer.stop()
+            group.timer.deleteLater()
+            group.timer = None
@@ -0,0 +1,153 @@
+"""
+Módulo config - Ajustes de la aplicación con lecturas en memoria.
+Envuelve el config.ini de QSettings con la misma interfaz (value, setValue,
+remove, sync) pero guarda en memoria cada clave leída, avisa de los cambios
+con una señal y agrupa las escrituras en un único volcado diferido, en lugar
+de reescribir el archivo en cada cambio.
+"""
+from PyQt6.QtCore import QObject, QSettings, QTimer, QCoreApplication, pyqtSignal
+
+FLUSH_DELAY = 1000
+"""Espera (ms) tras el último cambio antes de escribir config.ini"""
+
+_MISSING = object()
+"""Marca de clave ausente (o borrada y pendiente de escribir)"""
+
+def convert(value, value_type, default=None):
+    """Convierte un valor leído de config.ini al tipo pedido, como QSettings.value.
+
+    Args:
+        value: Valor guardado (en el formato INI suele ser un str).
+        value_type (type): Tipo pedido (bool, int, float, str) o None para no convertir.
+        default: Valor que se devuelve si la conversión falla.
+
+    Returns:
+        El valor convertido, o default si no se puede convertir.
+    """
+    if value_type is None or type(value) is value_type:
+        return value
+    try:
+        if value_type is bool:
+            if isinstance(value, str):
+                return value.strip().lower() not in ("", "0", "false")
+            return bool(value)
+        if value_type is int and isinstance(value, str):
+            return int(float(value))
+        if value_type is str and isinstance(value, bool):
+            return "true" if value else "false"
+        return value_type(value)
+    except (TypeError, ValueError):
+        return default
+
+class Config(QObject):
+    """Ajustes compartidos por MainWindow y las páginas de WhatsApp.
+
+    Cada clave se lee de disco una sola vez; setValue y remove actualizan la
+    memoria al instante, emiten changed y programan un volcado que escribe
+    todos los cambios pendientes juntos FLUSH_DELAY ms después del último.
+    sync() vuelca en el momento (al salir, por ejemplo).
+    """
+    changed = pyqtSignal(str, object)
+
+    def __init__(self, path, parent=None):
+        """Abre config.ini sin leer todavía ninguna clave.
+
+        Args:
+            path (str): Ruta de config.ini.
+            parent: Objeto padre de Qt.
+        """
+        super().__init__(parent)
+        self.store = QSettings(path, QSettings.Format.IniFormat)
+        self.cache = {}
+        self.pending = {}
+        self.flushes = 0
+
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.timeout.connect(self.sync)
+
+        app = QCoreApplication.instance()
+        if app is not None:
+            # Red de seguridad: no perder cambios si se sale sin pasar por sync()
+            app.aboutToQuit.connect(self.sync)
+
+    def fileName(self):
+        """Devuelve la ruta de config.ini."""
+        return self.store.fileName()
+
+    def _raw(self, key):
+        """Devuelve el valor guardado de una clave, leyéndolo de disco solo la primera vez."""
+        if key not in self.cache:
+            self.cache[key] = self.store.value(key) if self.store.contains(key) else _MISSING
+        return self.cache[key]
+
+    def value(self, key, defaultValue=None, type=None):
+        """Lee un ajuste, con la misma firma que QSettings.value.
+
+        Args:
+            key (str): Clave, por ejemplo "notification/show_msg".
+            defaultValue (opcional): Valor si la clave no existe.
+            type (type, opcional): Tipo al que se convierte el valor.
+
+        Returns:
+            El valor del ajuste, o defaultValue.
+        """
+        value = self._raw(key)
+        if value is _MISSING:
+            return defaultValue
+        return convert(value, type, defaultValue)
+
+    def contains(self, key):
+        """Indica si existe un ajuste.
+
+        Args:
+            key (str): Clave del ajuste.
+
+        Returns:
+            bool: True si la clave tiene valor.
+        """
+        return self._raw(key) is not _MISSING
+
+    def setValue(self, key, value):
+        """Cambia un ajuste en memoria y programa su escritura.
+
+        Args:
+            key (str): Clave del ajuste.
+            value: Nuevo valor.
+        """
+        current = self._raw(key)
+        if current is not _MISSING and convert(current, type(value), _MISSING) == value:
+            return
+        self.cache[key] = value
+        self.pending[key] = value
+        self.changed.emit(key, value)
+        self.flush_timer.start(FLUSH_DELAY)
+
+    def remove(self, key):
+        """Borra un ajuste y programa su borrado en disco.
+
+        Args:
+            key (str): Clave del ajuste.
+        """
+        if self._raw(key) is _MISSING:
+            return
+        self.cache[key] = _MISSING
+        self.pending[key] = _MISSING
+        self.changed.emit(key, None)
+        self.flush_timer.start(FLUSH_DELAY)
+
+    def sync(self):
+        """Escribe ahora en config.ini todos los cambios pendientes."""
+        self.flush_timer.stop()
+        if not self.pending:
+            return
+        pending, self.pending = self.pending, {}
+        for key, value in pending.items():
+            if value is _MISSING:
+                self.store.remove(key)
+            else:
+                self.store.setValue(key, value)
+        self.store.sync()
+        self.flushes += 1
+        if self.store.status() != QSettings.Status.NoError:
+            print(f"Could not write settings to {self.fileName()}: {self.store.status().name}")
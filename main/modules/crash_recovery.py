@@ -0,0 +1,191 @@
+"""
+Módulo crash_recovery - Recuperación de procesos de renderizado caídos.
+Detecta cuándo termina de forma anómala el proceso de renderizado de una
+sesión (fallo o cierre por falta de memoria) y la recarga automáticamente
+con espera exponencial y aleatoria. Si una sesión entra en un bucle de
+fallos, se aparca hasta que el usuario la vuelva a cargar.
+"""
+import random
+import time
+
+from PyQt6.QtCore import QObject, QTimer
+from PyQt6.QtWebEngineCore import QWebEnginePage
+
+DEFAULT_BASE_DELAY = 2
+"""Segundos de espera antes de la primera recarga tras un fallo"""
+
+DEFAULT_MAX_DELAY = 300
+"""Espera máxima entre recargas (5 minutos)"""
+
+DEFAULT_MAX_CRASHES = 4
+"""Fallos dentro de la ventana de bucle tras los que se aparca la sesión"""
+
+DEFAULT_LOOP_WINDOW = 10
+"""Minutos en los que se cuentan los fallos seguidos de una sesión"""
+
+OOM_EXIT_CODES = (9, 137)
+"""Códigos de salida de un proceso terminado con SIGKILL (típico del OOM killer)"""
+
+TerminationStatus = QWebEnginePage.RenderProcessTerminationStatus
+
+def describe_termination(status, exit_code):
+    """Devuelve una descripción legible del final de un proceso de renderizado.
+
+    Args:
+        status (QWebEnginePage.RenderProcessTerminationStatus): Estado de terminación.
+        exit_code (int): Código de salida del proceso.
+
+    Returns:
+        str: Motivo, por ejemplo "killed (exit code 9, likely OOM)".
+    """
+    reason = {
+        TerminationStatus.AbnormalTerminationStatus: "abnormal exit",
+        TerminationStatus.CrashedTerminationStatus: "crashed",
+        TerminationStatus.KilledTerminationStatus: "killed",
+    }.get(status, status.name)
+    if status == TerminationStatus.KilledTerminationStatus and exit_code in OOM_EXIT_CODES:
+        return f"{reason} (exit code {exit_code}, likely OOM)"
+    return f"{reason} (exit code {exit_code})"
+
+class CrashRecovery(QObject):
+    """Recuperación automática de las sesiones cuyo renderizador se cae.
+
+    Cada fallo se registra por sesión en "crash_count/<folder_id>" y
+    "last_crash/<folder_id>". La recarga se programa tras una espera que
+    se duplica con cada fallo seguido ("crash/base_delay" hasta
+    "crash/max_delay") y se reparte al azar entre la mitad y el total,
+    para que varios tabs caídos a la vez no se recarguen juntos. Con
+    "crash/max_crashes" fallos dentro de "crash/loop_window" minutos la
+    sesión se aparca.
+    """
+
+    def __init__(self, settings, find_session, recover_session, park_session, parent=None):
+        """Inicializa el gestor de recuperación.
+
+        Args:
+            settings (Config): Ajustes de la aplicación (config.ini).
+            find_session (callable): Devuelve el SessionTab de un folder_id, o None.
+            recover_session (callable): Recarga una sesión caída.
+            park_session (callable): Aparca una sesión; recibe la sesión y el motivo.
+            parent: Objeto padre de Qt.
+        """
+        super().__init__(parent)
+        self.settings = settings
+        self.find_session = find_session
+        self.recover_session = recover_session
+        self.park_session = park_session
+        self.recent_crashes = {}
+        self.pending = {}
+        self.parked = set()
+
+    def on_terminated(self, folder_id, status, exit_code):
+        """Atiende el final del proceso de renderizado de una sesión.
+
+        Args:
+            folder_id (str): ID permanente de la sesión.
+            status (QWebEnginePage.RenderProcessTerminationStatus): Estado de terminación.
+            exit_code (int): Código de salida del proceso.
+        """
+        # Descartar una página o cerrar la aplicación termina el proceso con normalidad
+        if status == TerminationStatus.NormalTerminationStatus:
+            return
+        session_tab = self.find_session(folder_id)
+        if session_tab is None:
+            return
+
+        reason = describe_termination(status, exit_code)
+        count = self.settings.value(f"crash_count/{folder_id}", 0, int) + 1
+        self.settings.setValue(f"crash_count/{folder_id}", count)
+        self.settings.setValue(f"last_crash/{folder_id}", f"{time.strftime('%Y-%m-%d %H:%M:%S')} {reason}")
+
+        now = time.monotonic()
+        window = self.settings.value("crash/loop_window", DEFAULT_LOOP_WINDOW, int) * 60
+        crashes = [t for t in self.recent_crashes.get(folder_id, []) if now - t < window]
+        crashes.append(now)
+        self.recent_crashes[folder_id] = crashes
+
+        print(f"Renderer of session '{session_tab.session_name}' {reason} "
+              f"({len(crashes)} in a row, {count} in total)")
+
+        max_crashes = self.settings.value("crash/max_crashes", DEFAULT_MAX_CRASHES, int)
+        if max_crashes > 0 and len(crashes) >= max_crashes:
+            self.cancel(folder_id)
+            self.parked.add(folder_id)
+            print(f"Parking session '{session_tab.session_name}' after {len(crashes)} crashes "
+                  f"in {window // 60} minutes")
+            self.park_session(session_tab, reason)
+            return
+
+        self.schedule_reload(folder_id, len(crashes))
+
+    def schedule_reload(self, folder_id, attempt):
+        """Programa la recarga de una sesión con espera exponencial y aleatoria.
+
+        Args:
+            folder_id (str): ID permanente de la sesión.
+            attempt (int): Número de fallos seguidos (1 para el primero).
+        """
+        base = self.settings.value("crash/base_delay", DEFAULT_BASE_DELAY, float)
+        ceiling = self.settings.value("crash/max_delay", DEFAULT_MAX_DELAY, float)
+        delay = min(ceiling, base * 2 ** (attempt - 1))
+        delay = random.uniform(delay / 2, delay)
+
+        self.cancel(folder_id)
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.timeout.connect(lambda: self._reload(folder_id))
+        timer.start(int(delay * 1000))
+        self.pending[folder_id] = timer
+        print(f"Reloading session {folder_id} in {delay:.1f} s")
+
+    def _reload(self, folder_id):
+        """Recarga una sesión cuando vence su espera."""
+        timer = self.pending.pop(folder_id, None)
+        if timer:
+            timer.deleteLater()
+        session_tab = self.find_session(folder_id)
+        if session_tab is not None and session_tab.is_materialized():
+            self.recover_session(session_tab)
+
+    def cancel(self, folder_id):
+        """Cancela la recarga pendiente de una sesión, si la hay.
+
+        Args:
+            folder_id (str): ID permanente de la sesión.
+        """
+        timer = self.pending.pop(folder_id, None)
+        if timer:
+            timer.stop()
+            timer.deleteLater()
+
+    def is_pending(self, folder_id):
+        """Indica si la sesión está caída y esperando su recarga."""
+        return folder_id in self.pending
+
+    def is_parked(self, folder_id):
+        """Indica si la sesión está aparcada por fallos repetidos."""
+        return folder_id in self.parked
+
+    def crash_count(self, folder_id):
+        """Devuelve el total de fallos registrados de una sesión."""
+        return self.settings.value(f"crash_count/{folder_id}", 0, int)
+
+    def reset(self, folder_id):
+        """Da una nueva oportunidad a una sesión que el usuario vuelve a cargar.
+
+        Args:
+            folder_id (str): ID permanente de la sesión.
+        """
+        self.cancel(folder_id)
+        self.parked.discard(folder_id)
+        self.recent_crashes.pop(folder_id, None)
+
+    def forget(self, folder_id):
+        """Elimina el rastro de una sesión cerrada, incluido su historial de fallos.
+
+        Args:
+            folder_id (str): ID permanente de la sesión.
+        """
+        self.reset(folder_id)
+        self.settings.remove(f"crash_count/{folder_id}")
+        self.settings.remove(f"last_crash/{folder_id}")
@@ -0,0 +1,168 @@
+"""
+Módulo deletion - Borrado de datos de sesión en segundo plano.
+Elimina las carpetas de sesiones cerradas en un hilo de trabajo para no
+congelar la interfaz, y guarda la lista de borrados pendientes en disco
+para retomarlos en el siguiente inicio si la aplicación se cierra antes.
+"""
+import json
+import os
+import queue
+import shutil
+import threading
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from modules.procstats import format_bytes
+
+JOURNAL_FILE = "pending_deletions.json"
+"""Archivo (dentro de ~/.WAms) con las rutas pendientes de borrar"""
+
+class DeletionWorker(QObject):
+    """Cola de borrado de carpetas atendida por un hilo de trabajo.
+
+    Cada ruta se anota en el diario antes de encolarse y se retira de él
+    cuando termina de borrarse, de modo que un cierre inesperado nunca
+    deja datos de una sesión cerrada sin eliminar.
+    """
+    deleted = pyqtSignal(str, 'qint64')
+
+    def __init__(self, app_dir, parent=None):
+        """Inicializa la cola y carga el diario de borrados pendientes.
+
+        Args:
+            app_dir (str): Directorio de datos de la aplicación (~/.WAms).
+            parent: Objeto padre de Qt.
+        """
+        super().__init__(parent)
+        self.journal_path = os.path.join(app_dir, JOURNAL_FILE)
+        self.lock = threading.Lock()
+        self.queue = queue.Queue()
+        self.thread = None
+        self.total_freed = 0
+        self.pending = self._load_journal()
+
+        self.deleted.connect(self._on_deleted)
+
+    def _load_journal(self):
+        """Lee el diario de borrados pendientes.
+
+        Returns:
+            list: Rutas que quedaron sin borrar en ejecuciones anteriores.
+        """
+        try:
+            with open(self.journal_path, 'r', encoding='utf-8') as f:
+                return [p for p in json.load(f) if isinstance(p, str)]
+        except FileNotFoundError:
+            return []
+        except Exception as e:
+            print(f"Could not read deletion journal: {e}")
+            return []
+
+    def _save_journal(self):
+        """Guarda el diario de forma atómica (se llama con el lock tomado)."""
+        tmp_path = self.journal_path + ".tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.pending, f)
+            os.replace(tmp_path, self.journal_path)
+        except Exception as e:
+            print(f"Could not write deletion journal: {e}")
+
+    def resume(self):
+        """Retoma los borrados que quedaron pendientes en ejecuciones anteriores."""
+        with self.lock:
+            leftovers = list(self.pending)
+        for path in leftovers:
+            self.queue.put(path)
+        if leftovers:
+            print(f"Resuming {len(leftovers)} pending session deletion(s) in the background")
+            self._ensure_thread()
+
+    def enqueue(self, path, delay=0):
+        """Anota una ruta en el diario y la programa para su borrado.
+
+        Args:
+            path (str): Carpeta a eliminar.
+            delay (int, opcional): Milisegundos de espera antes de borrarla,
+                para dar tiempo a que WebEngine libere sus archivos.
+        """
+        with self.lock:
+            if path in self.pending:
+                return
+            self.pending.append(path)
+            self._save_journal()
+
+        def start():
+            self.queue.put(path)
+            self._ensure_thread()
+
+        if delay > 0:
+            QTimer.singleShot(delay, start)
+        else:
+            start()
+
+    def _ensure_thread(self):
+        """Arranca el hilo de trabajo si todavía no está en marcha."""
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self._run, name="wams-deletion", daemon=True)
+            self.thread.start()
+
+    def _run(self):
+        """Cuerpo del hilo: borra las rutas de la cola una a una."""
+        while True:
+            path = self.queue.get()
+            freed = remove_tree(path)
+
+            with self.lock:
+                if path in self.pending:
+                    self.pending.remove(path)
+                self._save_journal()
+
+            self.deleted.emit(path, freed)
+
+    def _on_deleted(self, path, freed):
+        """Registra en el hilo de la GUI el espacio liberado por un borrado.
+
+        Args:
+            path (str): Carpeta eliminada.
+            freed (int): Bytes liberados.
+        """
+        self.total_freed += freed
+        print(f"Permanently deleted session data: {path} ({format_bytes(freed)} freed, "
+              f"{format_bytes(self.total_freed)} in total)")
+
+def remove_tree(path):
+    """Elimina una carpeta completa contando los bytes liberados.
+
+    Args:
+        path (str): Carpeta a eliminar.
+
+    Returns:
+        int: Bytes de los archivos eliminados.
+    """
+    freed = 0
+    if not os.path.lexists(path):
+        return 0
+
+    for root, dirs, files in os.walk(path, topdown=False):
+        for name in files:
+            file_path = os.path.join(root, name)
+            try:
+                size = os.lstat(file_path).st_size
+                os.remove(file_path)
+                freed += size
+            except OSError:
+                pass
+        for name in dirs:
+            dir_path = os.path.join(root, name)
+            try:
+                if os.path.islink(dir_path):
+                    os.remove(dir_path)
+                else:
+                    os.rmdir(dir_path)
+            except OSError:
+                pass
+
+    # Lo que no se pudo borrar arriba (por ejemplo, archivos creados durante el recorrido)
+    shutil.rmtree(path, ignore_errors=True)
+    return freed
@@ -0,0 +1,123 @@
+"""
+Módulo downloads_dir - Resolución de la carpeta de descargas XDG.
+Obtiene la carpeta de descargas del usuario y permite repetir la búsqueda
+en segundo plano, para que el arranque nunca espere a ejecutar xdg-user-dir.
+"""
+import os
+import subprocess
+import threading
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+USER_DIRS_FILE = os.path.join(os.path.expanduser("~"), ".config", "user-dirs.dirs")
+"""Archivo de configuración XDG con las carpetas del usuario"""
+
+def user_dirs_stamp():
+    """Devuelve una marca de la versión actual de ~/.config/user-dirs.dirs.
+
+    Returns:
+        str: La fecha de modificación en nanosegundos, o "missing" si el
+        archivo no existe. Se guarda como texto para compararla sin pérdidas.
+    """
+    try:
+        return str(os.stat(USER_DIRS_FILE).st_mtime_ns)
+    except OSError:
+        return "missing"
+
+def resolve_downloads_directory(run_command=True):
+    """Obtiene la carpeta de descargas del usuario usando el estándar XDG.
+
+    Implementa múltiples métodos de fallback para máxima compatibilidad:
+    1. Comando xdg-user-dir (más confiable, solo si run_command es True)
+    2. Archivo de configuración XDG (~/.config/user-dirs.dirs)
+    3. Variable de entorno XDG_DOWNLOAD_DIR
+    4. Fallbacks comunes por idioma (Downloads, Descargas, etc.)
+    5. Último recurso: crear directorio WAms en inglés
+
+    Args:
+        run_command (bool, opcional): Si es False, omite el subproceso
+            xdg-user-dir para no bloquear el hilo que llama.
+
+    Returns:
+        str: Ruta absoluta al directorio de descargas del usuario.
+    """
+    # Método 1: Usar xdg-user-dir (más confiable)
+    if run_command:
+        try:
+            result = subprocess.run(['xdg-user-dir', 'DOWNLOAD'],
+                                capture_output=True, text=True, check=True)
+            downloads_path = result.stdout.strip()
+            if downloads_path and os.path.exists(downloads_path):
+                print(f"Downloads directory found via xdg-user-dir: {downloads_path}")
+                return downloads_path
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            print("xdg-user-dir not available, trying alternative methods...")
+
+    # Método 2: Leer el archivo de configuración XDG directamente
+    home_dir = os.path.expanduser("~")
+
+    if os.path.exists(USER_DIRS_FILE):
+        try:
+            with open(USER_DIRS_FILE, 'r') as f:
+                for line in f:
+                    if line.startswith('XDG_DOWNLOAD_DIR='):
+                        # Extraer la ruta, removiendo comillas y expandiendo variables
+                        path = line.split('=', 1)[1].strip().strip('"\'')
+                        path = path.replace('$HOME', home_dir)
+                        if os.path.exists(path):
+                            print(f"Downloads directory found via XDG config: {path}")
+                            return path
+        except Exception as e:
+            print(f"Error reading XDG config file: {e}")
+
+    # Método 3: Variable de entorno XDG_DOWNLOAD_DIR
+    xdg_download = os.environ.get('XDG_DOWNLOAD_DIR')
+    if xdg_download and os.path.exists(xdg_download):
+        print(f"Downloads directory found via XDG_DOWNLOAD_DIR: {xdg_download}")
+        return xdg_download
+
+    # Método 4: Fallbacks comunes por idioma
+    common_download_names = [
+        'Downloads',    # Inglés
+        'Descargas',    # Español
+        'Téléchargements',  # Francés
+        'Download',     # Alemán
+        'Scaricati',    # Italiano
+        'Baixades',     # Catalán
+        'Preuzimanja',  # Serbio
+        'Λήψεις',       # Griego
+        'Загрузки',     # Ruso
+    ]
+
+    for name in common_download_names:
+        path = os.path.join(home_dir, name)
+        if os.path.exists(path):
+            print(f"Downloads directory found via fallback: {path}")
+            return path
+
+    # Método 5: Último recurso - crear WAms Downloads en inglés
+    fallback_path = os.path.join(home_dir, 'WAms')
+    print(f"Using fallback downloads directory: {fallback_path}")
+    return fallback_path
+
+class DownloadsDirResolver(QObject):
+    """Resuelve la carpeta de descargas en un hilo de fondo.
+
+    Emite la señal resolved con la ruta encontrada y la marca de
+    user-dirs.dirs que estaba vigente al empezar la búsqueda.
+    """
+    resolved = pyqtSignal(str, str)
+
+    def start(self):
+        """Lanza la resolución completa (incluido xdg-user-dir) en segundo plano."""
+        threading.Thread(target=self._run, name="wams-downloads-dir", daemon=True).start()
+
+    def _run(self):
+        """Cuerpo del hilo: resuelve la ruta y la entrega al hilo de la GUI."""
+        stamp = user_dirs_stamp()
+        try:
+            path = resolve_downloads_directory()
+        except Exception as e:
+            print(f"Error resolving downloads directory: {e}")
+            return
+        self.resolved.emit(path, stamp)
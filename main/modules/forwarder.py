@@ -0,0 +1,86 @@
+"""
+Módulo forwarder - Reenvío rápido de enlaces a la instancia en ejecución.
+Al hacer clic en un enlace wa.me o whatsapp:// se lanza un nuevo proceso;
+si ya hay una instancia de WAms, este módulo le entrega la URL por D-Bus
+antes de cargar WebEngine, las notificaciones o las traducciones.
+
+Solo depende de QtCore, QtDBus y procstats para que el proceso sea liviano.
+"""
+import time
+
+from PyQt6.QtDBus import QDBusConnection, QDBusMessage
+
+from modules.procstats import process_start_time
+
+SERVICE_NAME = "org.wams.SingleInstance"
+"""Nombre D-Bus que registra la instancia principal de WAms"""
+
+FORWARDER_CONNECTION = "wams-forwarder"
+"""Nombre de la conexión privada que usa el reenvío rápido"""
+
+def send_url(connection, url, clicked_at=None):
+    """Entrega una URL a la instancia registrada en el bus.
+
+    Usa handle_url_since para que la instancia mida la latencia desde el
+    clic; si la instancia es de una versión anterior sin ese método, recurre
+    a handle_url.
+
+    Args:
+        connection (QDBusConnection): Conexión al bus de sesión.
+        url (str): URL a abrir (puede estar vacía para solo mostrar la ventana).
+        clicked_at (float, opcional): Inicio del proceso lanzado por el clic,
+            como fecha Unix.
+
+    Returns:
+        bool: True si la instancia aceptó la llamada.
+    """
+    if clicked_at:
+        msg = QDBusMessage.createMethodCall(SERVICE_NAME, "/", "", "handle_url_since")
+        msg.setArguments([url, float(clicked_at)])
+        reply = connection.call(msg)
+        if reply.type() != QDBusMessage.MessageType.ErrorMessage:
+            return True
+
+    msg = QDBusMessage.createMethodCall(SERVICE_NAME, "/", "", "handle_url")
+    msg.setArguments([url])
+    reply = connection.call(msg)
+    return reply.type() != QDBusMessage.MessageType.ErrorMessage
+
+def forward_to_running_instance(argv):
+    """Reenvía la URL de la línea de comandos si WAms ya está en ejecución.
+
+    Abre una conexión privada al bus de sesión (sin QCoreApplication),
+    comprueba si el nombre org.wams.SingleInstance tiene dueño y, en ese
+    caso, le entrega la URL.
+
+    Args:
+        argv (list): Argumentos del proceso (normalmente sys.argv).
+
+    Returns:
+        bool: True si la URL se entregó y el proceso puede terminar.
+    """
+    started = time.perf_counter()
+    connection = QDBusConnection.connectToBus(QDBusConnection.BusType.SessionBus, FORWARDER_CONNECTION)
+    try:
+        if not connection.isConnected():
+            return False
+
+        registered = connection.interface().isServiceRegistered(SERVICE_NAME)
+        if not registered.isValid() or not registered.value():
+            return False
+
+        url = argv[1] if len(argv) > 1 else ""
+        clicked_at = process_start_time()
+        if not send_url(connection, url, clicked_at):
+            return False
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if clicked_at:
+            since_click_ms = (time.time() - clicked_at) * 1000
+            print(f"[*] URL forwarded to the running instance in {elapsed_ms:.1f} ms "
+                  f"({since_click_ms:.0f} ms since the process started)")
+        else:
+            print(f"[*] URL forwarded to the running instance in {elapsed_ms:.1f} ms")
+        return True
+    finally:
+        QDBusConnection.disconnectFromBus(FORWARDER_CONNECTION)
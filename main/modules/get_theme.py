@@ -2,14 +2,34 @@
 Módulo de detección de tema del sistema.
 Detecta si el sistema prefiere un tema claro u oscuro usando
 el portal de escritorio de freedesktop.org a través de QtDBus.
+ThemeWatcher lee el esquema una sola vez sin bloquear, lo guarda en
+memoria y sigue sus cambios con la señal SettingChanged del portal.
 """
 from PyQt6 import QtDBus
+from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
+
+PORTAL_NAME = "org.freedesktop.portal.Desktop"
+PORTAL_PATH = "/org/freedesktop/portal/desktop"
+PORTAL_INTERFACE = "org.freedesktop.portal.Settings"
+
+APPEARANCE_NAMESPACE = "org.freedesktop.appearance"
+COLOR_SCHEME_KEY = "color-scheme"
+
+DEFAULT_DARK = True
+"""Tema que se supone mientras no se conoce el del sistema (o si el portal falla)"""
+
+def _unwrap(value):
+    """Extrae el valor de uno o varios QDBusVariant anidados (Read devuelve un variant dentro de otro)."""
+    while isinstance(value, QtDBus.QDBusVariant):
+        value = value.variant()
+    return value
 
 def get_system_theme():
     """Detecta el esquema de color preferido del sistema.
 
     Utiliza el portal de configuración de escritorio de freedesktop.org
-    para determinar si el sistema prefiere un tema claro u oscuro.
+    para determinar si el sistema prefiere un tema claro u oscuro. La
+    llamada es bloqueante; la aplicación usa ThemeWatcher.
 
     Devuelve:
         bool: True si se prefiere el tema oscuro, False para claro.
@@ -20,16 +40,71 @@ def get_system_theme():
         - 2: Preferir apariencia clara
     """
     try:
-        name = "org.freedesktop.portal.Desktop"
-        path = "/org/freedesktop/portal/desktop"
-        interface = "org.freedesktop.portal.Settings"
-
-        smp = QtDBus.QDBusInterface(name, path, interface)
-        msg = smp.call("Read", "org.freedesktop.appearance", "color-scheme")
-        color_scheme = msg.arguments()[0]
+        smp = QtDBus.QDBusInterface(PORTAL_NAME, PORTAL_PATH, PORTAL_INTERFACE)
+        msg = smp.call("Read", APPEARANCE_NAMESPACE, COLOR_SCHEME_KEY)
+        color_scheme = _unwrap(msg.arguments()[0])
         # print(f'Current color: {color_scheme}')
         # Retorna True (oscuro) solo si color_scheme es 1, de lo contrario False (claro)
         return color_scheme == 1
     except Exception:
         # Si falla la detección, asumir tema oscuro por defecto
-        return True
\ No newline at end of file
+        return DEFAULT_DARK
+
+class ThemeWatcher(QObject):
+    """Esquema de color del sistema en memoria, actualizado por el portal.
+
+    start() pide el esquema con una llamada asíncrona y se suscribe a
+    SettingChanged; is_dark se puede consultar en cualquier momento sin
+    tocar D-Bus, y changed se emite solo cuando el tema cambia de verdad.
+    """
+    changed = pyqtSignal(bool)
+
+    def __init__(self, parent=None):
+        """Inicializa el observador con el tema predeterminado.
+
+        Args:
+            parent: Objeto padre de Qt.
+        """
+        super().__init__(parent)
+        self.is_dark = DEFAULT_DARK
+        self.pending = None
+
+    def start(self):
+        """Se suscribe a los cambios del portal y lee el esquema actual sin bloquear."""
+        bus = QtDBus.QDBusConnection.sessionBus()
+        if not bus.isConnected():
+            print("Could not connect to the D-Bus session bus, using the default theme")
+            return
+
+        if not bus.connect(PORTAL_NAME, PORTAL_PATH, PORTAL_INTERFACE, "SettingChanged", self.setting_changed):
+            print("Could not subscribe to desktop portal theme changes")
+
+        message = QtDBus.QDBusMessage.createMethodCall(PORTAL_NAME, PORTAL_PATH, PORTAL_INTERFACE, "Read")
+        message.setArguments([APPEARANCE_NAMESPACE, COLOR_SCHEME_KEY])
+        self.pending = QtDBus.QDBusPendingCallWatcher(bus.asyncCall(message), self)
+        self.pending.finished.connect(self._on_read)
+
+    def _on_read(self, watcher):
+        """Recibe la respuesta de Read por el bucle de eventos de Qt."""
+        watcher.deleteLater()
+        self.pending = None
+        reply = QtDBus.QDBusPendingReply(watcher)
+        if reply.isError():
+            print(f"Could not read the system color scheme: {reply.error().message()}")
+            return
+        self._update(_unwrap(reply.argumentAt(0)))
+
+    @pyqtSlot(QtDBus.QDBusMessage)
+    def setting_changed(self, message):
+        """Recibe la señal SettingChanged (namespace, key, value) del portal."""
+        arguments = message.arguments()
+        if len(arguments) == 3 and arguments[0] == APPEARANCE_NAMESPACE and arguments[1] == COLOR_SCHEME_KEY:
+            self._update(_unwrap(arguments[2]))
+
+    def _update(self, color_scheme):
+        """Guarda el esquema recibido y avisa si el tema cambió."""
+        is_dark = color_scheme == 1
+        if is_dark != self.is_dark:
+            self.is_dark = is_dark
+            print(f"System theme is now {'dark' if is_dark else 'light'}")
+            self.changed.emit(is_dark)
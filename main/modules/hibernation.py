@@ -0,0 +1,215 @@
+"""
+Módulo de hibernación - Congela y descarta sesiones inactivas.
+Usa los estados de ciclo de vida de QWebEnginePage para liberar CPU y
+memoria de las sesiones que no se han visto en un tiempo configurable,
+y las despierta de forma transparente cuando se vuelve a abrir su tab.
+"""
+import time
+
+from PyQt6.QtCore import QObject, QTimer
+from PyQt6.QtWebEngineCore import QWebEnginePage
+
+HIBERNATION_CHECK_INTERVAL = 30000
+"""Intervalo de revisión de sesiones inactivas (30 segundos)"""
+
+DEFAULT_FREEZE_AFTER = 0
+"""Minutos sin ver una sesión antes de congelarla; 0 (por defecto) para no congelar nunca"""
+
+DEFAULT_DISCARD_AFTER = 0
+"""Minutos sin ver una sesión antes de descartarla; 0 (por defecto) para no descartar nunca"""
+
+DEFAULT_MAX_LIVE = 0
+"""Máximo de sesiones vivas (no descartadas) a la vez; 0 para no limitar"""
+
+LifecycleState = QWebEnginePage.LifecycleState
+
+class HibernationManager(QObject):
+    """Gestor de hibernación de las sesiones abiertas en los tabs.
+
+    Lleva la cuenta de cuándo se vio cada sesión por última vez y, de forma
+    periódica, pasa a Frozen las que superan "hibernation/freeze_after" y a
+    Discarded las que superan "hibernation/discard_after". También aplica el
+    límite "hibernation/max_live", descartando primero las sesiones usadas
+    hace más tiempo. Las sesiones marcadas en "keep_live/<folder_id>" nunca
+    se hibernan para que sigan recibiendo notificaciones. Todos los umbrales
+    valen 0 por defecto: una sesión congelada no notifica, así que la
+    hibernación solo se activa si el usuario la configura.
+    """
+
+    def __init__(self, tabs, settings, parent=None):
+        """Inicializa el gestor y arranca la revisión periódica.
+
+        Args:
+            tabs (QTabWidget): Widget de tabs con los contenedores de sesión.
+            settings (Config): Ajustes de la aplicación (config.ini).
+            parent: Objeto padre de Qt.
+        """
+        super().__init__(parent)
+        self.tabs = tabs
+        self.settings = settings
+        self.last_viewed = {}
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.check_sessions)
+        self.timer.start(HIBERNATION_CHECK_INTERVAL)
+
+    def stop(self):
+        """Detiene la revisión periódica."""
+        self.timer.stop()
+
+    def is_exempt(self, session_tab):
+        """Indica si la sesión debe mantenerse viva para recibir notificaciones.
+
+        Args:
+            session_tab (SessionTab): Sesión a consultar.
+
+        Returns:
+            bool: True si la sesión está excluida de la hibernación.
+        """
+        return self.settings.value(f"keep_live/{session_tab.folder_id}", False, bool)
+
+    def set_exempt(self, session_tab, exempt):
+        """Marca o desmarca una sesión como excluida de la hibernación.
+
+        Si se marca, la sesión se despierta de inmediato.
+
+        Args:
+            session_tab (SessionTab): Sesión a modificar.
+            exempt (bool): True para mantenerla siempre viva.
+        """
+        if exempt:
+            self.settings.setValue(f"keep_live/{session_tab.folder_id}", True)
+            self.wake(session_tab)
+        else:
+            self.settings.remove(f"keep_live/{session_tab.folder_id}")
+
+    def forget(self, folder_id):
+        """Elimina el rastro de una sesión cerrada.
+
+        Args:
+            folder_id (str): ID permanente de la sesión.
+        """
+        self.last_viewed.pop(folder_id, None)
+
+    def touch(self, session_tab):
+        """Registra que la sesión se está viendo en este momento.
+
+        Args:
+            session_tab (SessionTab): Sesión vista.
+        """
+        self.last_viewed[session_tab.folder_id] = time.monotonic()
+
+    def on_session_activated(self, session_tab, previous_tab=None):
+        """Despierta la sesión que se acaba de abrir.
+
+        Args:
+            session_tab (SessionTab): Sesión que pasó a ser la actual.
+            previous_tab (SessionTab, opcional): Sesión que dejó de verse.
+        """
+        if previous_tab is not None:
+            self.touch(previous_tab)
+        self.touch(session_tab)
+        self.wake(session_tab)
+
+    def wake(self, session_tab):
+        """Devuelve una sesión congelada o descartada al estado Active.
+
+        Una página descartada se recarga automáticamente al activarse.
+
+        Args:
+            session_tab (SessionTab): Sesión a despertar.
+        """
+        page = session_tab.page()
+        if page and page.lifecycleState() != LifecycleState.Active:
+            print(f"Waking session '{session_tab.session_name}' "
+                  f"from {page.lifecycleState().name}")
+            page.setLifecycleState(LifecycleState.Active)
+
+    def set_state(self, session_tab, state, reason):
+        """Cambia el estado de ciclo de vida de una sesión en segundo plano.
+
+        Args:
+            session_tab (SessionTab): Sesión a modificar.
+            state (QWebEnginePage.LifecycleState): Nuevo estado.
+            reason (str): Motivo del cambio, para el registro.
+
+        Returns:
+            bool: True si el estado se aplicó.
+        """
+        page = session_tab.page()
+        # Qt no permite congelar ni descartar una página visible
+        if not page or page.isVisible() or page.lifecycleState() == state:
+            return False
+        page.setLifecycleState(state)
+        print(f"Session '{session_tab.session_name}' -> {state.name} ({reason})")
+        return True
+
+    def check_sessions(self):
+        """Revisa todas las sesiones y aplica los umbrales de inactividad."""
+        now = time.monotonic()
+        freeze_after = self.settings.value("hibernation/freeze_after", DEFAULT_FREEZE_AFTER, int) * 60
+        discard_after = self.settings.value("hibernation/discard_after", DEFAULT_DISCARD_AFTER, int) * 60
+        max_live = self.settings.value("hibernation/max_live", DEFAULT_MAX_LIVE, int)
+
+        current = self.tabs.currentWidget()
+        if current is not None and self.tabs.isVisible():
+            self.touch(current)
+
+        live = []
+        for i in range(self.tabs.count()):
+            session_tab = self.tabs.widget(i)
+            page = session_tab.page()
+            if not page:
+                continue
+
+            state = page.lifecycleState()
+            if session_tab is current or self.is_exempt(session_tab):
+                if state != LifecycleState.Discarded:
+                    live.append(session_tab)
+                continue
+
+            idle = now - self.last_viewed.setdefault(session_tab.folder_id, now)
+            if discard_after > 0 and idle >= discard_after:
+                self.set_state(session_tab, LifecycleState.Discarded, f"idle {idle / 60:.0f} min")
+            elif freeze_after > 0 and idle >= freeze_after and state == LifecycleState.Active:
+                self.set_state(session_tab, LifecycleState.Frozen, f"idle {idle / 60:.0f} min")
+
+            if page.lifecycleState() != LifecycleState.Discarded:
+                live.append(session_tab)
+
+        if max_live > 0 and len(live) > max_live:
+            self.enforce_live_cap(live, max_live, current)
+
+    def enforce_live_cap(self, live, max_live, current):
+        """Descarta las sesiones usadas hace más tiempo hasta cumplir el límite.
+
+        Args:
+            live (list): Sesiones que no están descartadas.
+            max_live (int): Número máximo de sesiones vivas permitido.
+            current (SessionTab): Sesión actual, que nunca se descarta.
+        """
+        candidates = self.least_recently_viewed([t for t in live if t is not current])
+
+        excess = len(live) - max_live
+        for session_tab in candidates[:excess]:
+            self.set_state(session_tab, LifecycleState.Discarded, f"live session cap {max_live}")
+
+    def least_recently_viewed(self, sessions=None):
+        """Ordena las sesiones en segundo plano de la vista más antigua a la más reciente.
+
+        Excluye la sesión actual, las excluidas de la hibernación y las que
+        no están materializadas.
+
+        Args:
+            sessions (list, opcional): Sesiones a ordenar; por defecto todas las de los tabs.
+
+        Returns:
+            list: Sesiones candidatas a liberar memoria, empezando por la menos usada.
+        """
+        if sessions is None:
+            sessions = [self.tabs.widget(i) for i in range(self.tabs.count())]
+        current = self.tabs.currentWidget()
+        candidates = [t for t in sessions
+                      if t is not current and t.page() and not self.is_exempt(t)]
+        candidates.sort(key=lambda t: self.last_viewed.get(t.folder_id, 0.0))
+        return candidates
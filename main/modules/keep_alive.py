@@ -0,0 +1,167 @@
+"""
+Módulo keep_alive - Planificador único de pings de mantenimiento.
+Sustituye a los dos timers que despertaban cada sesión (uno global y uno
+por página) por un solo planificador que decide, sesión a sesión, si el
+ping hace falta: no se despiertan las sesiones visibles, las congeladas o
+descartadas, las que acaban de dar señales de vida ni ninguna sin red.
+Los pings se reparten con jitter para no despertar todos los renderers a
+la vez, y se cuentan los que se ahorran.
+"""
+import random
+import time
+
+from PyQt6.QtCore import QObject, QTimer
+from PyQt6.QtNetwork import QNetworkInformation
+from PyQt6.QtWebEngineCore import QWebEnginePage
+
+DEFAULT_KEEP_ALIVE_INTERVAL = 45
+"""Segundos entre pings de una misma sesión"""
+
+DEFAULT_KEEP_ALIVE_JITTER = 0.2
+"""Variación relativa aleatoria del intervalo (0.2 = ±20%)"""
+
+PING_SCRIPT = "void(0);"
+"""Script mínimo que basta para despertar el renderer de una página"""
+
+SKIP_REASONS = ("visible", "hibernated", "recent", "offline")
+"""Motivos por los que se omite un ping, en el orden en que se comprueban"""
+
+class KeepAliveScheduler(QObject):
+    """Pings de mantenimiento de todas las sesiones con un único timer.
+
+    Cada sesión tiene su próximo ping programado; el timer se arma para el
+    más cercano. Al vencer, el ping se omite si la sesión está a la vista
+    (su renderer ya está despierto), no está Active (respeta la hibernación),
+    mostró actividad en el último intervalo (por ejemplo, una notificación)
+    o el sistema no tiene red.
+    """
+
+    def __init__(self, tabs, settings, parent=None):
+        """Inicializa el planificador y programa la primera revisión.
+
+        Args:
+            tabs (QTabWidget): Widget de tabs con los contenedores de sesión.
+            settings (Config): Ajustes de la aplicación (config.ini).
+            parent: Objeto padre de Qt.
+        """
+        super().__init__(parent)
+        self.tabs = tabs
+        self.settings = settings
+        self.due = {}
+        self.last_activity = {}
+        self.pings = 0
+        self.skipped = dict.fromkeys(SKIP_REASONS, 0)
+
+        # Sin backend de red disponible se supone que hay conexión
+        self.network = QNetworkInformation.instance()
+        if self.network is None and QNetworkInformation.loadDefaultBackend():
+            self.network = QNetworkInformation.instance()
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.run)
+        self.timer.start(1000)
+
+    def stop(self):
+        """Detiene el planificador."""
+        self.timer.stop()
+
+    def interval(self):
+        """Devuelve el intervalo base entre pings en segundos."""
+        return max(5, self.settings.value("keep_alive/interval", DEFAULT_KEEP_ALIVE_INTERVAL, int))
+
+    def next_delay(self):
+        """Devuelve un intervalo con jitter, en segundos."""
+        jitter = min(0.9, max(0.0, self.settings.value("keep_alive/jitter", DEFAULT_KEEP_ALIVE_JITTER, float)))
+        return self.interval() * random.uniform(1 - jitter, 1 + jitter)
+
+    def note_activity(self, folder_id):
+        """Registra que una sesión acaba de mostrar actividad propia.
+
+        Args:
+            folder_id (str): ID permanente de la sesión.
+        """
+        self.last_activity[folder_id] = time.monotonic()
+
+    def forget(self, folder_id):
+        """Elimina el rastro de una sesión cerrada.
+
+        Args:
+            folder_id (str): ID permanente de la sesión.
+        """
+        self.due.pop(folder_id, None)
+        self.last_activity.pop(folder_id, None)
+
+    def is_online(self):
+        """Indica si el sistema tiene (o podría tener) conexión de red."""
+        if self.network is None:
+            return True
+        return self.network.reachability() != QNetworkInformation.Reachability.Disconnected
+
+    def skip_reason(self, session_tab, page, now):
+        """Decide si una sesión necesita el ping.
+
+        Args:
+            session_tab (SessionTab): Sesión a revisar.
+            page (QWebEnginePage): Página de la sesión.
+            now (float): Instante actual (time.monotonic).
+
+        Returns:
+            str: Uno de SKIP_REASONS, o None si hay que enviar el ping.
+        """
+        window = self.tabs.window()
+        if (session_tab is self.tabs.currentWidget() and window.isVisible()
+                and not window.isMinimized()):
+            return "visible"
+        if page.lifecycleState() != QWebEnginePage.LifecycleState.Active:
+            return "hibernated"
+        if now - self.last_activity.get(session_tab.folder_id, float("-inf")) < self.interval():
+            return "recent"
+        if not self.is_online():
+            return "offline"
+        return None
+
+    def run(self):
+        """Envía o descarta los pings vencidos y rearma el timer para el siguiente."""
+        now = time.monotonic()
+        present = set()
+
+        for i in range(self.tabs.count()):
+            session_tab = self.tabs.widget(i)
+            page = session_tab.page() if session_tab else None
+            if page is None:
+                continue
+            folder_id = session_tab.folder_id
+            present.add(folder_id)
+
+            due = self.due.get(folder_id)
+            if due is None:
+                # Sesión nueva: su primer ping cae en un punto aleatorio del intervalo
+                self.due[folder_id] = now + random.uniform(0, self.interval())
+                continue
+            if due > now:
+                continue
+
+            reason = self.skip_reason(session_tab, page, now)
+            if reason is None:
+                page.runJavaScript(PING_SCRIPT)
+                self.pings += 1
+            else:
+                self.skipped[reason] += 1
+            self.due[folder_id] = now + self.next_delay()
+
+        for folder_id in set(self.due) - present:
+            del self.due[folder_id]
+
+        delay = min(self.due.values()) - now if self.due else self.next_delay()
+        self.timer.start(int(max(1.0, delay) * 1000))
+
+    def stats(self):
+        """Devuelve los contadores del planificador.
+
+        Returns:
+            dict: Pings enviados, omitidos por motivo y total ahorrado ("saved").
+        """
+        stats = {"pings": self.pings, "saved": sum(self.skipped.values())}
+        stats.update(self.skipped)
+        return stats
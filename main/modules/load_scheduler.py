@@ -0,0 +1,135 @@
+"""
+Módulo load_scheduler - Cola de carga de sesiones con prioridad.
+Evita que todas las sesiones carguen WhatsApp Web en el mismo instante:
+limita cuántas cargas hay en curso a la vez y avanza a la siguiente cuando
+la página termina de cargar o se agota un tiempo máximo.
+"""
+from collections import deque
+
+from PyQt6.QtCore import QObject, QTimer
+
+DEFAULT_MAX_CONCURRENT_LOADS = 2
+"""Número predeterminado de cargas de página simultáneas"""
+
+DEFAULT_LOAD_TIMEOUT = 20
+"""Segundos máximos que se espera a una carga antes de iniciar la siguiente"""
+
+class LoadScheduler(QObject):
+    """Planificador de cargas de sesiones con concurrencia limitada.
+
+    Cada elemento de la cola es una sesión identificada por su ID de carpeta,
+    junto con la página cuya señal loadFinished marca el final de la carga y
+    una función que inicia la carga. Las cargas se inician en orden de
+    llegada, salvo las encoladas con prioridad o promovidas, que se adelantan.
+    """
+
+    def __init__(self, max_in_flight=DEFAULT_MAX_CONCURRENT_LOADS,
+                 timeout=DEFAULT_LOAD_TIMEOUT, parent=None):
+        """Inicializa el planificador.
+
+        Args:
+            max_in_flight (int, opcional): Máximo de cargas simultáneas.
+            timeout (int, opcional): Segundos máximos de espera por carga.
+            parent: Objeto padre de Qt.
+        """
+        super().__init__(parent)
+        self.max_in_flight = max(1, max_in_flight)
+        self.timeout_ms = max(1, timeout) * 1000
+        self.queue = deque()
+        self.in_flight = {}
+
+    def enqueue(self, key, page, start, priority=False):
+        """Agrega una sesión a la cola de carga.
+
+        Args:
+            key (str): ID de la sesión.
+            page (QWebEnginePage): Página cuya carga se espera.
+            start (callable): Función sin argumentos que inicia la carga.
+            priority (bool, opcional): Si es True, la sesión se coloca al frente.
+        """
+        item = (key, page, start)
+        if priority:
+            self.queue.appendleft(item)
+        else:
+            self.queue.append(item)
+        self._pump()
+
+    def promote(self, key):
+        """Inicia de inmediato la carga de una sesión encolada.
+
+        Se usa cuando el usuario abre un tab que todavía espera su turno;
+        esta carga no respeta el límite de concurrencia.
+
+        Args:
+            key (str): ID de la sesión a adelantar.
+
+        Returns:
+            bool: True si la sesión estaba en la cola.
+        """
+        for item in self.queue:
+            if item[0] == key:
+                self.queue.remove(item)
+                self._start(item)
+                return True
+        return False
+
+    def cancel(self, key):
+        """Quita una sesión de la cola o libera su carga en curso.
+
+        Args:
+            key (str): ID de la sesión cerrada.
+        """
+        self.queue = deque(item for item in self.queue if item[0] != key)
+        if key in self.in_flight:
+            self._finish(key, "cancelled")
+
+    def is_pending(self, key):
+        """Indica si la sesión sigue esperando su turno de carga."""
+        return any(item[0] == key for item in self.queue)
+
+    def is_idle(self):
+        """Indica si no quedan cargas en curso ni en cola."""
+        return not self.queue and not self.in_flight
+
+    def _pump(self):
+        """Inicia cargas mientras haya espacio libre y elementos en cola."""
+        while self.queue and len(self.in_flight) < self.max_in_flight:
+            self._start(self.queue.popleft())
+
+    def _start(self, item):
+        """Inicia la carga de un elemento y vigila su final o su tiempo máximo."""
+        key, page, start = item
+
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.timeout.connect(lambda: self._finish(key, "timeout"))
+
+        def on_load_finished(ok):
+            self._finish(key, "loaded" if ok else "failed")
+
+        page.loadFinished.connect(on_load_finished)
+        self.in_flight[key] = (page, on_load_finished, timer)
+        timer.start(self.timeout_ms)
+        start()
+
+    def _finish(self, key, reason):
+        """Libera el espacio de una carga y continúa con la cola.
+
+        Args:
+            key (str): ID de la sesión.
+            reason (str): Cómo terminó la espera (loaded, failed, timeout, cancelled).
+        """
+        entry = self.in_flight.pop(key, None)
+        if entry is None:
+            return
+        page, on_load_finished, timer = entry
+        timer.stop()
+        timer.deleteLater()
+        try:
+            page.loadFinished.disconnect(on_load_finished)
+        except (TypeError, RuntimeError):
+            # The page was already destroyed (tab closed)
+            pass
+        if reason == "timeout":
+            print(f"Session '{key}' is taking too long to load, starting the next one")
+        self._pump()
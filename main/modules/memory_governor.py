@@ -0,0 +1,232 @@
+"""
+Módulo memory_governor - Liberación de memoria ante presión del sistema.
+Vigila la presión de memoria de Linux (PSI) y la memoria disponible para,
+antes de que actúe el OOM killer, congelar o descartar las sesiones en
+segundo plano usadas hace más tiempo, y restaurarlas cuando la presión cede.
+"""
+import os
+
+from PyQt6.QtCore import QObject, QTimer
+from PyQt6.QtWebEngineCore import QWebEnginePage
+
+from modules.procstats import format_bytes
+
+DEFAULT_POLL_INTERVAL = 5
+"""Segundos entre lecturas de la presión de memoria"""
+
+DEFAULT_PSI_SOME_AVG10 = 10.0
+"""Porcentaje de tiempo con tareas esperando memoria (some avg10) que se considera presión"""
+
+DEFAULT_MIN_AVAILABLE_MB = 512
+"""Memoria disponible (MB) por debajo de la cual hay que descartar sesiones"""
+
+DEFAULT_SUSTAIN_SAMPLES = 3
+"""Lecturas consecutivas necesarias para actuar o para dar la presión por terminada"""
+
+SYSTEM_PRESSURE_FILE = "/proc/pressure/memory"
+"""Presión de memoria de todo el sistema"""
+
+CGROUP_ROOTS = ("/sys/fs/cgroup", "/sys/fs/cgroup/unified")
+"""Puntos de montaje posibles de la jerarquía cgroup v2"""
+
+LifecycleState = QWebEnginePage.LifecycleState
+
+def find_cgroup_dir():
+    """Busca el directorio cgroup v2 del proceso actual.
+
+    Returns:
+        str: Ruta del directorio del cgroup, o None si no se usa cgroup v2.
+    """
+    try:
+        with open("/proc/self/cgroup", "r") as f:
+            for line in f:
+                if line.startswith("0::"):
+                    relative = line.strip()[3:].lstrip("/")
+                    for root in CGROUP_ROOTS:
+                        path = os.path.join(root, relative)
+                        if os.path.exists(os.path.join(path, "memory.pressure")):
+                            return path
+    except OSError:
+        pass
+    return None
+
+def read_pressure(path):
+    """Lee un archivo de presión PSI.
+
+    Args:
+        path (str): Ruta de memory.pressure o /proc/pressure/memory.
+
+    Returns:
+        dict: Valores avg10 de "some" y "full" en porcentaje, por ejemplo
+        {"some": 12.5, "full": 3.1}, o None si no se puede leer.
+    """
+    try:
+        values = {}
+        with open(path, "r") as f:
+            for line in f:
+                kind, *fields = line.split()
+                for field in fields:
+                    key, _, value = field.partition("=")
+                    if key == "avg10":
+                        values[kind] = float(value)
+        return values or None
+    except (OSError, ValueError):
+        return None
+
+def read_available_bytes(cgroup_dir=None):
+    """Obtiene la memoria disponible, teniendo en cuenta el límite del cgroup.
+
+    Args:
+        cgroup_dir (str, opcional): Directorio cgroup v2 del proceso.
+
+    Returns:
+        int: Bytes disponibles (MemAvailable, o el margen hasta memory.max
+        si es menor), o None si no se puede leer /proc/meminfo.
+    """
+    available = None
+    try:
+        with open("/proc/meminfo", "r") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    available = int(line.split()[1]) * 1024
+                    break
+    except (OSError, ValueError, IndexError):
+        return None
+
+    if cgroup_dir and available is not None:
+        try:
+            with open(os.path.join(cgroup_dir, "memory.max"), "r") as f:
+                limit = f.read().strip()
+            if limit != "max":
+                with open(os.path.join(cgroup_dir, "memory.current"), "r") as f:
+                    current = int(f.read().strip())
+                available = min(available, max(0, int(limit) - current))
+        except (OSError, ValueError):
+            pass
+    return available
+
+class MemoryGovernor(QObject):
+    """Gobernador de memoria basado en PSI y MemAvailable.
+
+    Con presión sostenida ("memory/psi_some_avg10" superado durante
+    "memory/sustain_samples" lecturas) congela una sesión en segundo plano
+    por lectura, empezando por la usada hace más tiempo. Si además la
+    memoria disponible baja de "memory/min_available_mb", la descarta para
+    liberar su memoria. Cuando la presión cede de forma sostenida, reactiva
+    las sesiones que estaban activas de una en una, empezando por la más reciente.
+    """
+
+    def __init__(self, hibernation, settings, parent=None):
+        """Inicializa el gobernador y arranca la vigilancia si está activado.
+
+        Args:
+            hibernation (HibernationManager): Gestor de hibernación de las sesiones.
+            settings (Config): Ajustes de la aplicación (config.ini).
+            parent: Objeto padre de Qt.
+        """
+        super().__init__(parent)
+        self.hibernation = hibernation
+        self.settings = settings
+        self.pressured_samples = 0
+        self.calm_samples = 0
+        self.exhausted = False
+        # folder_id -> sesión que estaba activa y que el gobernador liberó
+        self.reclaimed = {}
+
+        cgroup_dir = find_cgroup_dir()
+        self.cgroup_dir = cgroup_dir
+        self.pressure_file = os.path.join(cgroup_dir, "memory.pressure") if cgroup_dir else SYSTEM_PRESSURE_FILE
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.check_pressure)
+
+        if not self.settings.value("memory/governor", True, bool):
+            print("Memory governor disabled")
+            return
+        if read_pressure(self.pressure_file) is None and read_available_bytes() is None:
+            print("Memory governor unavailable: no PSI or /proc/meminfo")
+            return
+
+        interval = max(1, self.settings.value("memory/poll_interval", DEFAULT_POLL_INTERVAL, int))
+        self.timer.start(interval * 1000)
+        print(f"Memory governor watching {self.pressure_file} every {interval} s")
+
+    def stop(self):
+        """Detiene la vigilancia."""
+        self.timer.stop()
+
+    def forget(self, folder_id):
+        """Elimina el rastro de una sesión cerrada.
+
+        Args:
+            folder_id (str): ID permanente de la sesión.
+        """
+        self.reclaimed.pop(folder_id, None)
+
+    def check_pressure(self):
+        """Lee la presión de memoria y libera o restaura una sesión si procede."""
+        psi_limit = self.settings.value("memory/psi_some_avg10", DEFAULT_PSI_SOME_AVG10, float)
+        min_available = self.settings.value("memory/min_available_mb", DEFAULT_MIN_AVAILABLE_MB, int) * 1024 * 1024
+        sustain = max(1, self.settings.value("memory/sustain_samples", DEFAULT_SUSTAIN_SAMPLES, int))
+
+        pressure = read_pressure(self.pressure_file) or {}
+        some = pressure.get("some", 0.0)
+        available = read_available_bytes(self.cgroup_dir)
+
+        low_memory = available is not None and available < min_available
+        pressured = some >= psi_limit or low_memory
+        # Histéresis: la presión solo se da por terminada con margen sobre los umbrales
+        calm = some < psi_limit / 2 and (available is None or available >= min_available * 2)
+
+        self.pressured_samples = self.pressured_samples + 1 if pressured else 0
+        self.calm_samples = self.calm_samples + 1 if calm else 0
+        if not pressured:
+            self.exhausted = False
+
+        status = f"PSI some avg10 {some:.1f}%, available {format_bytes(available or 0)}"
+        if self.pressured_samples >= sustain:
+            self.reclaim(low_memory, status)
+        elif self.calm_samples >= sustain and self.reclaimed:
+            self.restore(status)
+
+    def reclaim(self, discard, status):
+        """Congela o descarta la sesión en segundo plano usada hace más tiempo.
+
+        Args:
+            discard (bool): True para descartar (memoria escasa); False para congelar.
+            status (str): Lectura actual de presión, para el registro.
+        """
+        target = LifecycleState.Discarded if discard else LifecycleState.Frozen
+        for session_tab in self.hibernation.least_recently_viewed():
+            state = session_tab.page().lifecycleState()
+            if state == LifecycleState.Discarded or (state == LifecycleState.Frozen and not discard):
+                continue
+            if self.hibernation.set_state(session_tab, target, f"memory pressure: {status}"):
+                # Solo se restauran las sesiones que estaban activas; las que ya
+                # hibernaban siguen las reglas de la hibernación
+                if state == LifecycleState.Active:
+                    self.reclaimed[session_tab.folder_id] = session_tab
+                return
+
+        # Se avisa una sola vez por episodio de presión
+        if not self.exhausted:
+            self.exhausted = True
+            print(f"Memory governor: under pressure but no background session left to free ({status})")
+
+    def restore(self, status):
+        """Devuelve al estado Active la sesión liberada usada más recientemente.
+
+        Args:
+            status (str): Lectura actual de presión, para el registro.
+        """
+        sessions = list(self.reclaimed.values())
+        lru = self.hibernation.least_recently_viewed(sessions)
+        # Las sesiones que ya no son candidatas (actual, cerradas o en keep-live) no se tocan
+        for folder_id in [t.folder_id for t in sessions if t not in lru]:
+            self.reclaimed.pop(folder_id, None)
+        if not lru:
+            return
+
+        session_tab = lru[-1]
+        del self.reclaimed[session_tab.folder_id]
+        self.hibernation.set_state(session_tab, LifecycleState.Active, f"memory pressure cleared: {status}")
@@ -1,24 +1,45 @@
 """
 Módulo de notificaciones - Integración con DBus para notificaciones del sistema.
 Proporciona una interfaz para mostrar notificaciones nativas de escritorio
-usando el estándar freedesktop.org notifications.
+usando el estándar freedesktop.org notifications a través de QtDBus: las
+respuestas y las señales del servidor llegan por el bucle de eventos de Qt.
 """
-import dbus
-from collections import OrderedDict
+import time
+from collections import OrderedDict, deque
+from PyQt6.QtCore import QObject, QMetaType, QByteArray, pyqtSlot
+from PyQt6.QtDBus import (QDBusConnection, QDBusMessage, QDBusArgument, QDBusPendingCallWatcher,
+                          QDBusPendingReply)
+from PyQt6.QtGui import QImage
 from modules.i18n import tr
 
-DBusGMainLoop = None
-try:
-    from dbus.mainloop.glib import DBusGMainLoop
-except ImportError:
-    print(
-        "Could not import DBusGMainLoop, is package 'python-dbus.mainloop.glib' installed?"
-    )
+DBUS_NAME = "org.freedesktop.Notifications"
+DBUS_PATH = "/org/freedesktop/Notifications"
+DBUS_INTERFACE = "org.freedesktop.Notifications"
 
 APP_NAME = ""
-DBUS_IFACE = None
+DBUS_BUS = None
+RECEIVER = None
 NOTIFICATIONS = {}
 
+NOTIFY_TIMEOUT = 5
+"""Segundos de espera máxima de la respuesta del servidor de notificaciones"""
+
+MAX_IN_FLIGHT = 4
+"""Llamadas Notify simultáneas sin respuesta como máximo"""
+
+MAX_BACKLOG = 32
+"""Notificaciones en espera como máximo; si se supera se descartan las más antiguas"""
+
+NOTIFICATION_TTL = 600
+"""Segundos tras los que se olvida una notificación cuyo cierre nunca se informó"""
+
+LATENCY_SAMPLES = 200
+"""Mediciones de latencia (encolado -> mostrada) que se conservan"""
+
+BACKLOG = deque()
+LATENCIES = deque(maxlen=LATENCY_SAMPLES)
+STATS = {"in_flight": 0, "sent": 0, "dropped": 0, "failed": 0, "expired": 0}
+
 class Urgency:
     """Niveles de urgencia para notificaciones freedesktop.org"""
     LOW, NORMAL, CRITICAL = range(3)
@@ -27,35 +48,96 @@ class UninitializedError(RuntimeError):
     """Error que se lanza si intentas mostrar una notificación antes de inicializar"""
     pass
 
+class _Receiver(QObject):
+    """Recibe las señales del servidor de notificaciones en el hilo de la GUI.
+
+    También es el padre de los observadores de las llamadas Notify en curso.
+    """
+
+    @pyqtSlot(QDBusMessage)
+    def actionInvoked(self, message):
+        """Reenvía la señal ActionInvoked (u, s)."""
+        _onActionInvoked(*message.arguments())
+
+    @pyqtSlot(QDBusMessage)
+    def notificationClosed(self, message):
+        """Reenvía la señal NotificationClosed (u, u)."""
+        _onNotificationClosed(*message.arguments())
+
 def init(app_name):
     """Inicializa la conexión con DBus para el sistema de notificaciones.
 
-    Configura la interfaz DBus para comunicarse con el servidor de notificaciones
-    del sistema y conecta las señales necesarias para manejar acciones y cierres
-    de notificaciones.
+    Usa la conexión de sesión de QtDBus (sin bucle de GLib) y conecta las
+    señales necesarias para manejar acciones y cierres de notificaciones.
 
     Args:
         app_name (str): Nombre de la aplicación que se mostrará en las notificaciones.
     """
-    global APP_NAME, DBUS_IFACE
+    global APP_NAME, DBUS_BUS, RECEIVER
     APP_NAME = app_name
 
-    name = "org.freedesktop.Notifications"
-    path = "/org/freedesktop/Notifications"
-    interface = "org.freedesktop.Notifications"
+    bus = QDBusConnection.sessionBus()
+    if not bus.isConnected():
+        print(f"Could not connect to the D-Bus session bus: {bus.lastError().message()}")
+        return
 
-    mainloop = None
-    if DBusGMainLoop is not None:
-        mainloop = DBusGMainLoop(set_as_default=True)
+    RECEIVER = _Receiver()
+    for signal, slot in (("ActionInvoked", RECEIVER.actionInvoked),
+                         ("NotificationClosed", RECEIVER.notificationClosed)):
+        if not bus.connect(DBUS_NAME, DBUS_PATH, DBUS_INTERFACE, signal, slot):
+            print(f"Could not subscribe to notification signal {signal}")
+    DBUS_BUS = bus
 
-    bus = dbus.SessionBus(mainloop)
-    proxy = bus.get_object(name, path)
-    DBUS_IFACE = dbus.Interface(proxy, interface)
+def _methodCall(method, *args):
+    """Crea una llamada a un método del servidor de notificaciones.
 
-    if mainloop is not None:
-        # Hay un mainloop disponible, conectar callbacks
-        DBUS_IFACE.connect_to_signal("ActionInvoked", _onActionInvoked)
-        DBUS_IFACE.connect_to_signal("NotificationClosed", _onNotificationClosed)
+    Args:
+        method (str): Nombre del método.
+        *args: Argumentos ya convertidos a tipos de D-Bus.
+
+    Returns:
+        QDBusMessage: Mensaje listo para enviar.
+    """
+    message = QDBusMessage.createMethodCall(DBUS_NAME, DBUS_PATH, DBUS_INTERFACE, method)
+    message.setArguments(list(args))
+    return message
+
+def _pump():
+    """Envía notificaciones de la cola mientras haya hueco para más llamadas."""
+    while BACKLOG and STATS["in_flight"] < MAX_IN_FLIGHT:
+        BACKLOG.popleft()._sendAsync()
+
+def _expireNotifications():
+    """Olvida las notificaciones cuyo cierre no se informó en NOTIFICATION_TTL segundos.
+
+    Cada una recibe su callback de cierre, como si el servidor lo hubiera
+    informado, para que quien la creó (por ejemplo, el agrupador) también la olvide.
+    """
+    now = time.monotonic()
+    expired = [nid for nid, n in NOTIFICATIONS.items() if now - n._shownAt > NOTIFICATION_TTL]
+    for nid in expired:
+        notification = NOTIFICATIONS.pop(nid)
+        try:
+            notification._onNotificationClosed(notification)
+        except Exception as e:
+            print(f"Notification close callback failed: {e}")
+    STATS["expired"] += len(expired)
+
+def latency_stats():
+    """Devuelve las estadísticas de envío de notificaciones.
+
+    Returns:
+        dict: Percentiles p50, p90 y p99 de la latencia entre el encolado y la
+        respuesta del servidor (ms, o None sin mediciones), número de
+        mediciones y contadores de enviadas, descartadas, fallidas y caducadas.
+    """
+    samples = sorted(LATENCIES)
+    stats = {"samples": len(samples)}
+    for name, fraction in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99)):
+        stats[name] = samples[min(len(samples) - 1, int(fraction * len(samples)))] if samples else None
+    for name in ("sent", "dropped", "failed", "expired"):
+        stats[name] = STATS[name]
+    return stats
 
 def _onActionInvoked(nid, action):
     """Se llama cuando se hace clic en una acción de la notificación.
@@ -98,6 +180,10 @@ class Notification(object):
     id = 0
     timeout = -1
     _onNotificationClosed = lambda *args: None
+    _enqueuedAt = 0.0
+    _shownAt = 0.0
+    _sending = False
+    _resend = False
 
     def __init__(self, title, body="", icon="", timeout=-1):
         """Inicializa un nuevo objeto de notificación.
@@ -119,39 +205,123 @@ class Notification(object):
         self.data = {}  # datos arbitrarios del usuario
 
     def show(self):
-        """Muestra la notificación en el sistema.
+        """Encola la notificación para mostrarla en el sistema.
+
+        La llamada Notify es asíncrona: nunca bloquea el hilo de la interfaz
+        aunque el servidor de notificaciones esté lento o reiniciándose. Si la
+        notificación ya se está enviando, se vuelve a enviar con su ID
+        (replaces_id) en cuanto llegue la respuesta.
 
         Raises:
             UninitializedError: Si no se llamó a Notification.init() primero.
 
         Returns:
-            bool: True si la notificación se mostró exitosamente.
+            bool: True si la notificación se encoló o se mostró.
         """
-        if DBUS_IFACE is None:
+        if DBUS_BUS is None:
             raise UninitializedError(
                 "You must call 'Notification.init()' before 'Notification.show()'"
             )
 
-        nid = DBUS_IFACE.Notify(
+        _expireNotifications()
+
+        if self._sending:
+            self._resend = True
+            return True
+        if self in BACKLOG:
+            # Ya espera turno y se enviará con su contenido actual
+            return True
+
+        self._enqueuedAt = time.perf_counter()
+        if len(BACKLOG) >= MAX_BACKLOG:
+            BACKLOG.popleft()
+            STATS["dropped"] += 1
+            print("Notification backlog full, dropping the oldest notification")
+        BACKLOG.append(self)
+        _pump()
+        return True
+
+    def _makeNotifyArgs(self):
+        """Crea los argumentos de la llamada Notify.
+
+        Returns:
+            tuple: Argumentos (susssasa{sv}i) en el orden de la especificación
+            freedesktop.org.
+        """
+        return (
             tr("WhatsApp MultiSession"),
-            self.id,
+            QDBusArgument(self.id, QMetaType.Type.UInt.value),
             self.icon,
             self.title,
             self.body,
-            self._makeActionsList(),
+            QDBusArgument(self._makeActionsList(), QMetaType.Type.QStringList.value),
             self.hints,
-            self.timeout,
+            int(self.timeout),
         )
 
-        self.id = int(nid)
+    def _sendAsync(self):
+        """Envía la llamada Notify sin esperar la respuesta."""
+        STATS["in_flight"] += 1
+        self._sending = True
+        call = DBUS_BUS.asyncCall(_methodCall("Notify", *self._makeNotifyArgs()), NOTIFY_TIMEOUT * 1000)
+        watcher = QDBusPendingCallWatcher(call, RECEIVER)
+        # Una lambda mantiene viva la notificación hasta la respuesta (PyQt solo
+        # guarda referencias débiles a los métodos enlazados)
+        watcher.finished.connect(lambda watcher, notification=self: notification._onNotifyFinished(watcher))
+
+    def _onNotifyFinished(self, watcher):
+        """Recibe la respuesta de Notify por el bucle de eventos de Qt.
+
+        Args:
+            watcher (QDBusPendingCallWatcher): Observador de la llamada terminada.
+        """
+        watcher.deleteLater()
+        reply = QDBusPendingReply(watcher)
+        if reply.isError():
+            self._onNotifyError(reply.error())
+        else:
+            self._onNotifyReply(reply.argumentAt(0))
+
+    def _onNotifyReply(self, nid):
+        """Registra el ID asignado por el servidor y la latencia del envío.
 
+        Args:
+            nid (int): ID de la notificación en el servidor.
+        """
+        if self._sending:
+            self._sending = False
+            STATS["in_flight"] -= 1
+        self.id = int(nid)
+        self._shownAt = time.monotonic()
         NOTIFICATIONS[self.id] = self
-        return True
+        STATS["sent"] += 1
+        LATENCIES.append((time.perf_counter() - self._enqueuedAt) * 1000)
+
+        if self._resend:
+            self._resend = False
+            self.show()
+        _pump()
+
+    def _onNotifyError(self, error):
+        """Registra una llamada Notify fallida o sin respuesta a tiempo.
+
+        Args:
+            error (QDBusError): Error devuelto por D-Bus.
+        """
+        self._sending = False
+        STATS["in_flight"] -= 1
+        STATS["failed"] += 1
+        print(f"Notification could not be shown: {error.name()}: {error.message()}")
+
+        if self._resend:
+            self._resend = False
+            self.show()
+        _pump()
 
     def close(self):
         """Solicita al servidor de notificaciones que cierre la notificación."""
         if self.id != 0:
-            DBUS_IFACE.CloseNotification(self.id)
+            DBUS_BUS.send(_methodCall("CloseNotification", QDBusArgument(self.id, QMetaType.Type.UInt.value)))
 
     def onClosed(self, callback):
         """Establece el callback que se llama cuando la notificación se cierra.
@@ -172,7 +342,7 @@ class Notification(object):
         """
         if value not in range(3):
             raise ValueError("Unknown urgency level '%s' specified" % value)
-        self.hints["urgency"] = dbus.Byte(value)
+        self.hints["urgency"] = QDBusArgument(value, QMetaType.Type.UChar.value)
 
     def setSoundFile(self, sound_file):
         """Establece un archivo de sonido para reproducir cuando se muestra la notificación.
@@ -198,6 +368,31 @@ class Notification(object):
         """
         self.hints["image-path"] = "file://" + icon_path
 
+    def setImageData(self, image):
+        """Envía la imagen de la notificación en memoria con el hint "image-data".
+
+        El servidor recibe los píxeles en crudo (RGBA de 8 bits por canal),
+        sin codificar un PNG ni escribir archivos. Según la especificación,
+        "image-data" tiene prioridad sobre "image-path".
+
+        Args:
+            image (QImage): Imagen a mostrar, ya escalada al tamaño del icono.
+        """
+        rgba = image.convertToFormat(QImage.Format.Format_RGBA8888)
+        bits = rgba.constBits()
+        bits.setsize(rgba.sizeInBytes())
+        data = QDBusArgument()
+        data.beginStructure()
+        for value in (rgba.width(), rgba.height(), rgba.bytesPerLine()):
+            data.add(value, QMetaType.Type.Int.value)
+        data.add(True, QMetaType.Type.Bool.value)
+        data.add(8, QMetaType.Type.Int.value)
+        data.add(4, QMetaType.Type.Int.value)
+        data.add(QByteArray(bytes(bits)), QMetaType.Type.QByteArray.value)
+        data.endStructure()
+        self.hints["image-data"] = data
+        self.hints.pop("image-path", None)
+
     def setQIcon(self, q_icon):
         """Establece un icono Qt para la notificación (no implementado).
 
@@ -0,0 +1,114 @@
+"""
+Módulo page_pool - Reserva de sesiones nuevas precargadas.
+Mantiene listas una o más parejas vista/página para sesiones nuevas, de
+modo que al pulsar "+" la sesión aparece al instante en lugar de esperar
+a crear el perfil, la página y cargar WhatsApp Web desde cero.
+"""
+import os
+from collections import deque, namedtuple
+
+from PyQt6.QtCore import QObject, QTimer
+
+SPARE_MARKER = ".spare"
+"""Archivo que marca la carpeta de una sesión de reserva aún no entregada"""
+
+DEFAULT_SPARE_POOL_SIZE = 1
+"""Número predeterminado de sesiones de reserva (0 para desactivar)"""
+
+SPARE_REFILL_DELAY = 5000
+"""Espera antes de reponer la reserva tras entregar una sesión (5 segundos)"""
+
+Spare = namedtuple("Spare", "folder_id profile_path webview")
+"""Sesión de reserva: ID de carpeta reservado, ruta del perfil y vista web"""
+
+def is_spare_folder(path):
+    """Indica si una carpeta de sesión pertenece a una reserva no entregada.
+
+    Args:
+        path (str): Ruta de la carpeta de sesión.
+
+    Returns:
+        bool: True si la carpeta contiene el marcador de reserva.
+    """
+    return os.path.exists(os.path.join(path, SPARE_MARKER))
+
+class SparePagePool(QObject):
+    """Reserva de sesiones nuevas ya inicializadas.
+
+    La creación de cada reserva la hace una función de fábrica de la
+    ventana principal, para que use exactamente la misma configuración de
+    perfil que una sesión normal. La reposición se hace con retraso y solo
+    cuando la aplicación está ociosa.
+    """
+
+    def __init__(self, factory, size=DEFAULT_SPARE_POOL_SIZE, is_busy=None, parent=None):
+        """Inicializa la reserva y programa su primer llenado.
+
+        Args:
+            factory (callable): Función sin argumentos que crea y devuelve un
+                Spare, o None si falla.
+            size (int, opcional): Número de reservas a mantener; 0 la desactiva.
+            is_busy (callable, opcional): Función que devuelve True mientras la
+                aplicación está ocupada (por ejemplo, cargando sesiones).
+            parent: Objeto padre de Qt.
+        """
+        super().__init__(parent)
+        self.factory = factory
+        self.size = max(0, size)
+        self.is_busy = is_busy or (lambda: False)
+        self.spares = deque()
+
+        self.refill_timer = QTimer(self)
+        self.refill_timer.setSingleShot(True)
+        self.refill_timer.timeout.connect(self.refill)
+        self.schedule_refill()
+
+    def reserved_ids(self):
+        """Devuelve los IDs de carpeta reservados por las sesiones de reserva."""
+        return {spare.folder_id for spare in self.spares}
+
+    def take(self):
+        """Entrega una sesión de reserva y programa la reposición.
+
+        El marcador de reserva se elimina para que la carpeta pase a ser
+        una sesión normal.
+
+        Returns:
+            Spare: La sesión de reserva, o None si la reserva está vacía.
+        """
+        if not self.spares:
+            return None
+        spare = self.spares.popleft()
+        try:
+            os.remove(os.path.join(spare.profile_path, SPARE_MARKER))
+        except OSError:
+            pass
+        self.schedule_refill()
+        return spare
+
+    def schedule_refill(self):
+        """Programa la reposición de la reserva si le faltan sesiones."""
+        if self.size > 0 and len(self.spares) < self.size:
+            self.refill_timer.start(SPARE_REFILL_DELAY)
+
+    def refill(self):
+        """Crea una sesión de reserva si la aplicación está ociosa."""
+        if len(self.spares) >= self.size:
+            return
+        if self.is_busy():
+            self.schedule_refill()
+            return
+
+        spare = self.factory()
+        if spare is None:
+            return
+        self.spares.append(spare)
+        print(f"Spare session ready: {spare.folder_id}")
+        self.schedule_refill()
+
+    def clear(self):
+        """Destruye las sesiones de reserva (sus carpetas se limpian al iniciar)."""
+        self.refill_timer.stop()
+        while self.spares:
+            spare = self.spares.popleft()
+            spare.webview.deleteLater()
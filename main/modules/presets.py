@@ -0,0 +1,118 @@
+"""
+Módulo presets - Preajustes de rendimiento de Chromium.
+Define los preajustes low-memory, balanced y throughput, que combinan
+opciones del proceso de Chromium (límite de procesos, memoria de V8 y
+throttling en segundo plano) con los atributos de QWebEngineSettings de
+cada vista.
+
+Solo depende de la biblioteca estándar: las opciones de Chromium deben
+fijarse en QTWEBENGINE_CHROMIUM_FLAGS antes de inicializar WebEngine.
+"""
+import configparser
+
+BASE_CHROMIUM_FLAGS = "--log-level=3"
+"""Opciones comunes a todos los preajustes (reducen el ruido de logs de Chromium)"""
+
+DEFAULT_PRESET = "balanced"
+"""Preajuste que se usa si config.ini no indica otro o indica uno desconocido"""
+
+PRESETS = {
+    "low-memory": {
+        "flags": [
+            "--renderer-process-limit=4",
+            "--process-per-site",
+            # Qt separa QTWEBENGINE_CHROMIUM_FLAGS por espacios: una sola opción de V8
+            "--js-flags=--max-old-space-size=384",
+        ],
+        "attributes": {
+            "PluginsEnabled": False,
+            "PdfViewerEnabled": False,
+            "WebGLEnabled": False,
+            "Accelerated2dCanvasEnabled": False,
+            "ScreenCaptureEnabled": False,
+        },
+    },
+    "balanced": {
+        # Mismos atributos que antes de existir los preajustes: quien actualiza
+        # no pierde el visor de PDF ni WebGL sin haberlo elegido
+        "flags": [],
+        "attributes": {
+            "PluginsEnabled": True,
+            "PdfViewerEnabled": True,
+            "WebGLEnabled": True,
+            "Accelerated2dCanvasEnabled": True,
+            "ScreenCaptureEnabled": True,
+        },
+    },
+    "throughput": {
+        "flags": [
+            "--disable-background-timer-throttling",
+            "--disable-renderer-backgrounding",
+            "--disable-backgrounding-occluded-windows",
+        ],
+        "attributes": {
+            "PluginsEnabled": True,
+            "PdfViewerEnabled": True,
+            "WebGLEnabled": True,
+            "Accelerated2dCanvasEnabled": True,
+            "ScreenCaptureEnabled": True,
+        },
+    },
+}
+"""Preajustes disponibles: opciones de Chromium del proceso y atributos por vista"""
+
+def normalize_preset(name):
+    """Devuelve el nombre de un preajuste conocido.
+
+    Args:
+        name (str): Nombre leído de la configuración (puede ser None).
+
+    Returns:
+        str: El mismo nombre en minúsculas si existe, o DEFAULT_PRESET.
+    """
+    name = (name or "").strip().lower()
+    return name if name in PRESETS else DEFAULT_PRESET
+
+def read_preset_name(config_path):
+    """Lee el preajuste global de config.ini sin depender de Qt.
+
+    Args:
+        config_path (str): Ruta de config.ini (formato INI de QSettings).
+
+    Returns:
+        str: Nombre del preajuste en "[performance] preset", o DEFAULT_PRESET.
+    """
+    parser = configparser.ConfigParser(interpolation=None, strict=False)
+    try:
+        parser.read(config_path, encoding="utf-8")
+        return normalize_preset(parser.get("performance", "preset", fallback=None))
+    except (configparser.Error, UnicodeDecodeError) as e:
+        print(f"Could not read performance preset: {e}")
+        return DEFAULT_PRESET
+
+def chromium_flags(name, extra_flags=""):
+    """Construye el valor de QTWEBENGINE_CHROMIUM_FLAGS para un preajuste.
+
+    Args:
+        name (str): Nombre del preajuste.
+        extra_flags (str, opcional): Opciones ya presentes en el entorno, que
+            se añaden al final para que el usuario pueda sobrescribirlas.
+
+    Returns:
+        str: Opciones de Chromium separadas por espacios.
+    """
+    flags = [BASE_CHROMIUM_FLAGS] + PRESETS[normalize_preset(name)]["flags"]
+    if extra_flags:
+        flags.append(extra_flags)
+    return " ".join(flags)
+
+def view_attributes(name):
+    """Devuelve los atributos de QWebEngineSettings de un preajuste.
+
+    Args:
+        name (str): Nombre del preajuste.
+
+    Returns:
+        dict: Nombre del atributo de QWebEngineSettings.WebAttribute -> bool.
+    """
+    return PRESETS[normalize_preset(name)]["attributes"]
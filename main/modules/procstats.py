@@ -0,0 +1,148 @@
+"""
+Módulo procstats - Lectura de estadísticas de procesos desde /proc.
+Permite medir el consumo de memoria y CPU de los procesos de renderizado
+de cada sesión sin depender de librerías externas.
+"""
+import os
+import time
+
+def read_rss_bytes(pid):
+    """Obtiene la memoria residente (RSS) de un proceso.
+
+    Args:
+        pid (int): ID del proceso a consultar.
+
+    Returns:
+        int: Memoria residente en bytes, o 0 si el proceso no existe
+        o no se puede leer /proc/<pid>/status.
+    """
+    if not pid:
+        return 0
+    try:
+        with open(os.path.join("/proc", str(pid), "status"), "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0
+
+def format_bytes(size):
+    """Formatea una cantidad de bytes en una cadena legible (KB, MB, GB).
+
+    Args:
+        size (int): Cantidad de bytes.
+
+    Returns:
+        str: Tamaño formateado, por ejemplo "153.2 MB".
+    """
+    size = float(size)
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(size) < 1024 or unit == "GB":
+            return f"{size:.1f} {unit}" if unit != "B" else f"{int(size)} B"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+def process_start_time(pid="self"):
+    """Obtiene el instante de inicio de un proceso como fecha Unix.
+
+    Combina el campo starttime de /proc/<pid>/stat con /proc/uptime, de
+    modo que incluye el tiempo de arranque del intérprete de Python.
+
+    Args:
+        pid (int|str, opcional): ID del proceso; por defecto el actual.
+
+    Returns:
+        float: Segundos desde la época Unix, o None si no se puede leer.
+    """
+    try:
+        with open(os.path.join("/proc", str(pid), "stat"), "r") as f:
+            # El nombre del proceso va entre paréntesis y puede contener espacios
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime", "r") as f:
+            uptime = float(f.read().split()[0])
+        start_ticks = int(fields[19])
+        return time.time() - uptime + start_ticks / clock_ticks()
+    except (OSError, ValueError, IndexError):
+        return None
+
+def clock_ticks():
+    """Devuelve los ticks de reloj por segundo que usa /proc (normalmente 100)."""
+    try:
+        return os.sysconf("SC_CLK_TCK")
+    except (ValueError, OSError):
+        return 100
+
+def read_cpu_times(pid):
+    """Lee el tiempo de CPU acumulado y el inicio de un proceso.
+
+    Args:
+        pid (int): ID del proceso a consultar.
+
+    Returns:
+        tuple: (segundos de CPU en usuario + sistema, ticks de inicio desde
+        el arranque del sistema), o None si no se puede leer /proc/<pid>/stat.
+    """
+    if not pid:
+        return None
+    try:
+        with open(os.path.join("/proc", str(pid), "stat"), "r") as f:
+            # El nombre del proceso va entre paréntesis y puede contener espacios
+            fields = f.read().rsplit(")", 1)[1].split()
+        utime, stime = int(fields[11]), int(fields[12])
+        return (utime + stime) / clock_ticks(), int(fields[19])
+    except (OSError, ValueError, IndexError):
+        return None
+
+def read_memory(pid):
+    """Lee la memoria proporcional (PSS) y residente (RSS) de un proceso.
+
+    Usa /proc/<pid>/smaps_rollup, que el kernel ya resume, en lugar de
+    recorrer smaps completo.
+
+    Args:
+        pid (int): ID del proceso a consultar.
+
+    Returns:
+        tuple: (pss, rss) en bytes; (0, rss de status) si smaps_rollup no
+        está disponible, o (0, 0) si el proceso no existe.
+    """
+    if not pid:
+        return 0, 0
+    pss = rss = 0
+    try:
+        with open(os.path.join("/proc", str(pid), "smaps_rollup"), "r") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    pss = int(line.split()[1]) * 1024
+                elif line.startswith("Rss:"):
+                    rss = int(line.split()[1]) * 1024
+        return pss, rss
+    except (OSError, ValueError, IndexError):
+        return 0, read_rss_bytes(pid)
+
+def system_uptime():
+    """Devuelve los segundos transcurridos desde el arranque del sistema."""
+    try:
+        with open("/proc/uptime", "r") as f:
+            return float(f.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+def format_duration(seconds):
+    """Formatea una duración en una cadena corta (por ejemplo "2h 05m").
+
+    Args:
+        seconds (float): Duración en segundos.
+
+    Returns:
+        str: Duración formateada.
+    """
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours:
+        return f"{hours}h {minutes:02d}m"
+    if minutes:
+        return f"{minutes}m {secs:02d}s"
+    return f"{secs}s"
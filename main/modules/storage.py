@@ -0,0 +1,252 @@
+"""
+Módulo storage - Análisis y compactación del almacenamiento de las sesiones.
+Mide en segundo plano cuánto ocupa cada sesión en ~/.WAms/sessions,
+desglosado por categoría (IndexedDB, Service Worker, Code Cache, GPUCache,
+etc.), y permite compactar las sesiones detenidas eliminando solo las
+cachés que Chromium reconstruye, sin tocar el inicio de sesión.
+"""
+import glob
+import os
+import threading
+import time
+
+from PyQt6.QtCore import Qt, QObject, pyqtSignal
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
+                             QHeaderView, QPushButton, QLabel)
+
+from modules.i18n import tr
+from modules.procstats import format_bytes
+
+CATEGORY_RULES = [
+    (("Service Worker", "CacheStorage"), "Service Worker cache"),
+    (("Service Worker", "ScriptCache"), "Service Worker scripts"),
+    (("Code Cache",), "Code cache"),
+    (("GPUCache",), "GPU cache"),
+    (("GrShaderCache",), "GPU cache"),
+    (("GraphiteDawnCache",), "GPU cache"),
+    (("ShaderCache",), "GPU cache"),
+    (("IndexedDB",), "IndexedDB"),
+    (("Local Storage",), "Local storage"),
+    (("Session Storage",), "Local storage"),
+    (("cache",), "HTTP cache"),
+]
+"""Reglas de clasificación: componentes de ruta consecutivos -> categoría"""
+
+CATEGORIES = ["IndexedDB", "Service Worker cache", "Service Worker scripts", "Code cache",
+              "GPU cache", "HTTP cache", "Local storage", "Other"]
+"""Categorías en el orden en que se muestran"""
+
+REBUILDABLE_DIRS = [("Code Cache",), ("GPUCache",), ("GrShaderCache",), ("GraphiteDawnCache",),
+                    ("ShaderCache",), ("Service Worker", "ScriptCache")]
+"""Carpetas que Chromium reconstruye solo y que la compactación elimina"""
+
+DEFAULT_COMPACT_INTERVAL_DAYS = 7
+"""Días entre compactaciones automáticas de las sesiones detenidas (0 para desactivar)"""
+
+COMPACT_STARTUP_DELAY = 60000
+"""Espera tras el inicio antes de la primera revisión de compactación (1 minuto)"""
+
+COMPACT_CHECK_INTERVAL = 3600000
+"""Intervalo de revisión de la compactación automática (1 hora)"""
+
+def classify(relative_path):
+    """Devuelve la categoría de un archivo dentro de un perfil.
+
+    Args:
+        relative_path (str): Ruta del archivo relativa a la carpeta de la sesión.
+
+    Returns:
+        str: Una de CATEGORIES.
+    """
+    parts = relative_path.split(os.sep)
+    for pattern, category in CATEGORY_RULES:
+        size = len(pattern)
+        for i in range(len(parts) - size):
+            if tuple(parts[i:i + size]) == pattern:
+                return category
+    return "Other"
+
+def scan_session(profile_path):
+    """Mide el tamaño de una sesión por categoría.
+
+    Args:
+        profile_path (str): Carpeta de la sesión.
+
+    Returns:
+        dict: Categoría -> bytes (solo las categorías con datos).
+    """
+    sizes = {}
+    for root, dirs, files in os.walk(profile_path):
+        # Las carpetas apartadas por una compactación ya están en la cola de borrado
+        dirs[:] = [d for d in dirs if ".compact-" not in d]
+        relative_root = os.path.relpath(root, profile_path)
+        for name in files:
+            try:
+                size = os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                continue
+            category = classify(os.path.normpath(os.path.join(relative_root, name)))
+            sizes[category] = sizes.get(category, 0) + size
+    return sizes
+
+def detach_rebuildable(profile_path):
+    """Aparta las cachés reconstruibles de una sesión detenida para borrarlas.
+
+    Cada carpeta se renombra (operación instantánea) para que la sesión
+    pueda volver a abrirse de inmediato mientras el borrado sigue en segundo plano.
+    Solo se tocan las rutas conocidas de REBUILDABLE_DIRS, sin recorrer el
+    perfil, porque se llama desde el hilo de la interfaz.
+
+    Args:
+        profile_path (str): Carpeta de la sesión.
+
+    Returns:
+        list: Rutas renombradas, listas para el hilo de borrado.
+    """
+    stamp = int(time.time())
+    # Restos de una compactación que no llegó a borrarse, junto a cada carpeta conocida
+    parents = {pattern[:-1] for pattern in REBUILDABLE_DIRS}
+    detached = [path for parent in sorted(parents)
+                for path in glob.glob(os.path.join(glob.escape(profile_path), *parent, "*.compact-*"))]
+    for pattern in REBUILDABLE_DIRS:
+        source = os.path.join(profile_path, *pattern)
+        target = f"{source}.compact-{stamp}"
+        try:
+            os.rename(source, target)
+            detached.append(target)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Could not compact {source}: {e}")
+    return detached
+
+class StorageScanner(QObject):
+    """Medición del almacenamiento de las sesiones en un hilo de trabajo."""
+    scanned = pyqtSignal(dict)
+
+    def __init__(self, parent=None):
+        """Inicializa el medidor sin hilo en marcha.
+
+        Args:
+            parent: Objeto padre de Qt.
+        """
+        super().__init__(parent)
+        self.thread = None
+
+    def is_running(self):
+        """Indica si hay una medición en curso."""
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self, sessions):
+        """Mide las sesiones indicadas y emite scanned al terminar.
+
+        Args:
+            sessions (dict): ID de sesión -> carpeta de la sesión.
+        """
+        if self.is_running():
+            return
+
+        def run():
+            started = time.perf_counter()
+            result = {folder_id: scan_session(path) for folder_id, path in sessions.items()}
+            total = sum(sum(sizes.values()) for sizes in result.values())
+            print(f"Storage scan of {len(result)} session(s): {format_bytes(total)} "
+                  f"in {(time.perf_counter() - started) * 1000:.0f} ms")
+            self.scanned.emit(result)
+
+        self.thread = threading.Thread(target=run, name="wams-storage-scan", daemon=True)
+        self.thread.start()
+
+class StorageDialog(QDialog):
+    """Diálogo "Almacenamiento" con el tamaño de cada sesión por categoría."""
+
+    def __init__(self, tabs, compact_session, parent=None):
+        """Inicializa el diálogo y su medidor.
+
+        Args:
+            tabs (QTabWidget): Widget de tabs con los contenedores de sesión.
+            compact_session (callable): Función que compacta una sesión detenida
+                y devuelve True si pudo hacerlo.
+            parent: Widget padre del diálogo.
+        """
+        super().__init__(parent)
+        self.tabs = tabs
+        self.compact_session = compact_session
+        self.scanner = StorageScanner(self)
+        self.scanner.scanned.connect(self.show_results)
+
+        self.setWindowTitle(tr("Storage"))
+        self.setMinimumSize(900, 320)
+
+        layout = QVBoxLayout(self)
+
+        headers = [tr("Session")] + [tr(c) for c in CATEGORIES] + [tr("Total"), tr("Actions")]
+        self.table = QTableWidget(0, len(headers))
+        self.table.setHorizontalHeaderLabels(headers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.setSelectionMode(QTableWidget.SelectionMode.NoSelection)
+        layout.addWidget(self.table)
+
+        bottom = QHBoxLayout()
+        self.summary = QLabel()
+        bottom.addWidget(self.summary, 1)
+        rescan_button = QPushButton(tr("Rescan"))
+        rescan_button.clicked.connect(self.rescan)
+        bottom.addWidget(rescan_button)
+        layout.addLayout(bottom)
+
+    def showEvent(self, event):
+        """Mide el almacenamiento cada vez que se abre el diálogo."""
+        super().showEvent(event)
+        self.rescan()
+
+    def sessions(self):
+        """Devuelve los contenedores de sesión en el orden de los tabs."""
+        return [self.tabs.widget(i) for i in range(self.tabs.count())]
+
+    def rescan(self):
+        """Inicia una medición en segundo plano."""
+        self.summary.setText(tr("Scanning..."))
+        self.scanner.start({t.folder_id: t.profile_path for t in self.sessions()})
+
+    def show_results(self, results):
+        """Rellena la tabla con el resultado de la medición.
+
+        Args:
+            results (dict): ID de sesión -> {categoría: bytes}.
+        """
+        sessions = [t for t in self.sessions() if t.folder_id in results]
+        self.table.setRowCount(len(sessions))
+        grand_total = 0
+
+        for row, session_tab in enumerate(sessions):
+            sizes = results[session_tab.folder_id]
+            total = sum(sizes.values())
+            grand_total += total
+
+            values = [session_tab.session_name] + [format_bytes(sizes.get(c, 0)) for c in CATEGORIES]
+            values.append(format_bytes(total))
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column > 0:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.table.setItem(row, column, item)
+
+            compact_button = QPushButton(tr("Compact"))
+            stopped = not session_tab.is_materialized()
+            compact_button.setEnabled(stopped)
+            compact_button.setToolTip(tr("Remove caches that are rebuilt automatically (code, GPU and "
+                                         "Service Worker script caches). Login data is kept.")
+                                      if stopped else tr("Unload the session first"))
+            compact_button.clicked.connect(lambda checked, t=session_tab: self.compact(t))
+            self.table.setCellWidget(row, len(values), compact_button)
+
+        self.table.resizeColumnsToContents()
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.summary.setText(tr("{} session(s), {} in total").format(len(sessions), format_bytes(grand_total)))
+
+    def compact(self, session_tab):
+        """Compacta una sesión y vuelve a medir."""
+        if self.compact_session(session_tab):
+            self.rescan()
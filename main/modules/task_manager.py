@@ -0,0 +1,209 @@
+"""
+Módulo task_manager - Administrador de tareas de las sesiones.
+Muestra, para cada tab, el proceso de renderizado de su página con su uso
+de CPU, memoria (PSS/RSS) y tiempo de vida, y permite recargar o descargar
+cada sesión. El muestreo solo se hace mientras el diálogo está visible.
+"""
+import time
+
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
+                             QHeaderView, QPushButton, QWidget, QLabel)
+from PyQt6.QtWebEngineCore import QWebEnginePage
+
+from modules.i18n import tr
+from modules.notification import latency_stats
+from modules.procstats import (read_cpu_times, read_memory, system_uptime, clock_ticks,
+                               format_bytes, format_duration)
+
+SAMPLE_INTERVAL = 2000
+"""Intervalo de muestreo de los procesos mientras el diálogo está abierto (2 segundos)"""
+
+COLUMNS = ["Session", "State", "PID", "CPU %", "PSS", "RSS", "Uptime", "Crashes", "HTTP cache", "Actions"]
+"""Columnas de la tabla (se traducen al mostrarse)"""
+
+class TaskManagerDialog(QDialog):
+    """Diálogo "Sesiones" con el consumo de recursos de cada tab.
+
+    Asocia la página de cada sesión con su proceso de renderizado mediante
+    renderProcessPid() y lee /proc/<pid>/stat y /proc/<pid>/smaps_rollup
+    en cada muestra. El uso de CPU se calcula como la diferencia de tiempo
+    de CPU entre dos muestras consecutivas.
+    """
+
+    def __init__(self, tabs, reload_session, unload_session, crash_recovery, cache_budget, parent=None):
+        """Inicializa el diálogo sin empezar a muestrear.
+
+        Args:
+            tabs (QTabWidget): Widget de tabs con los contenedores de sesión.
+            reload_session (callable): Función que recarga una sesión.
+            unload_session (callable): Función que descarga una sesión.
+            crash_recovery (CrashRecovery): Registro de fallos de las sesiones.
+            cache_budget (CacheBudget): Presupuesto y estadísticas de caché HTTP.
+            parent: Widget padre del diálogo.
+        """
+        super().__init__(parent)
+        self.tabs = tabs
+        self.reload_session = reload_session
+        self.unload_session = unload_session
+        self.crash_recovery = crash_recovery
+        self.cache_budget = cache_budget
+        self.cpu_samples = {}
+        self.row_ids = []
+
+        self.setWindowTitle(tr("Sessions"))
+        self.setMinimumSize(720, 320)
+
+        layout = QVBoxLayout(self)
+
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels([tr(c) for c in COLUMNS])
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.setSelectionMode(QTableWidget.SelectionMode.NoSelection)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.table)
+
+        self.summary = QLabel()
+        layout.addWidget(self.summary)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.sample)
+
+    def showEvent(self, event):
+        """Empieza a muestrear al mostrarse el diálogo."""
+        super().showEvent(event)
+        self.cpu_samples.clear()
+        self.cache_budget.measure()
+        self.sample()
+        self.timer.start(SAMPLE_INTERVAL)
+
+    def hideEvent(self, event):
+        """Deja de muestrear al ocultarse o cerrarse el diálogo."""
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def sessions(self):
+        """Devuelve los contenedores de sesión en el orden de los tabs."""
+        return [self.tabs.widget(i) for i in range(self.tabs.count())]
+
+    def rebuild_rows(self, sessions):
+        """Recrea las filas cuando cambian los tabs (abiertos, cerrados o movidos).
+
+        Args:
+            sessions (list): Contenedores de sesión actuales.
+        """
+        self.row_ids = [s.folder_id for s in sessions]
+        self.table.setRowCount(len(sessions))
+
+        for row, session_tab in enumerate(sessions):
+            for column in range(len(COLUMNS) - 1):
+                item = QTableWidgetItem()
+                if column > 1:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.table.setItem(row, column, item)
+
+            actions = QWidget()
+            actions_layout = QHBoxLayout(actions)
+            actions_layout.setContentsMargins(2, 0, 2, 0)
+
+            reload_button = QPushButton(tr("Reload"))
+            reload_button.clicked.connect(lambda checked, t=session_tab: self.run_action(self.reload_session, t))
+            actions_layout.addWidget(reload_button)
+
+            unload_button = QPushButton(tr("Unload"))
+            unload_button.clicked.connect(lambda checked, t=session_tab: self.run_action(self.unload_session, t))
+            actions_layout.addWidget(unload_button)
+
+            self.table.setCellWidget(row, len(COLUMNS) - 1, actions)
+
+        self.table.resizeColumnsToContents()
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+
+    def run_action(self, action, session_tab):
+        """Ejecuta una acción de fila y actualiza la tabla de inmediato."""
+        action(session_tab)
+        self.sample()
+
+    def sample(self):
+        """Toma una muestra de todos los procesos y actualiza la tabla."""
+        sessions = self.sessions()
+        if [s.folder_id for s in sessions] != self.row_ids:
+            self.rebuild_rows(sessions)
+
+        now = time.monotonic()
+        uptime = system_uptime()
+        ticks = clock_ticks()
+        total_pss = 0
+        seen_pids = set()
+
+        for row, session_tab in enumerate(sessions):
+            page = session_tab.page()
+            pid = page.renderProcessPid() if page else 0
+            state = self.state_label(session_tab, page)
+
+            cpu_text = pss_text = rss_text = uptime_text = pid_text = "—"
+            times = read_cpu_times(pid) if pid > 0 else None
+            if times:
+                cpu_seconds, start_ticks = times
+                previous = self.cpu_samples.get(pid)
+                if previous:
+                    elapsed = now - previous[1]
+                    if elapsed > 0:
+                        cpu_text = f"{100 * (cpu_seconds - previous[0]) / elapsed:.1f}"
+                self.cpu_samples[pid] = (cpu_seconds, now)
+
+                pss, rss = read_memory(pid)
+                pss_text = format_bytes(pss) if pss else "—"
+                rss_text = format_bytes(rss)
+                uptime_text = format_duration(uptime - start_ticks / ticks)
+                pid_text = str(pid)
+
+                # Several sessions may share a renderer; count it once
+                if pid not in seen_pids:
+                    total_pss += pss or rss
+                    seen_pids.add(pid)
+
+            crashes = str(self.crash_recovery.crash_count(session_tab.folder_id))
+            cache = self.cache_budget.describe(session_tab.folder_id)
+            values = [session_tab.session_name, state, pid_text, cpu_text, pss_text, rss_text, uptime_text,
+                      crashes, cache]
+            for column, value in enumerate(values):
+                self.table.item(row, column).setText(value)
+
+        # Forget processes that no longer exist (reloads, unloads, crashes)
+        for pid in list(self.cpu_samples):
+            if pid not in seen_pids:
+                del self.cpu_samples[pid]
+
+        summary = tr("{} renderer process(es), {} in total").format(len(seen_pids), format_bytes(total_pss))
+        notifications = latency_stats()
+        if notifications["samples"]:
+            summary += " · " + tr("Notification latency: p50 {:.0f} ms, p90 {:.0f} ms, p99 {:.0f} ms "
+                                  "({} sent, {} dropped, {} failed)").format(
+                notifications["p50"], notifications["p90"], notifications["p99"],
+                notifications["sent"], notifications["dropped"], notifications["failed"])
+        self.summary.setText(summary)
+
+    def state_label(self, session_tab, page):
+        """Devuelve el estado legible de una sesión.
+
+        Args:
+            session_tab (SessionTab): Sesión a describir.
+            page (QWebEnginePage): Página de la sesión o None.
+
+        Returns:
+            str: Estado traducido (no cargada, aparcada, caída, activa, congelada o descartada).
+        """
+        if self.crash_recovery.is_parked(session_tab.folder_id):
+            return tr("Parked after crashes")
+        if page is None:
+            return tr("Not loaded")
+        if self.crash_recovery.is_pending(session_tab.folder_id):
+            return tr("Crashed, reloading")
+        state = page.lifecycleState()
+        if state == QWebEnginePage.LifecycleState.Frozen:
+            return tr("Frozen")
+        if state == QWebEnginePage.LifecycleState.Discarded:
+            return tr("Discarded")
+        return tr("Active")
@@ -0,0 +1,155 @@
+"""
+Módulo tracer - Trazas de arranque en formato Chrome trace-event.
+Registra la duración de cada fase del arranque y de cada sesión cuando la
+aplicación se inicia con --trace-startup, y las guarda en un archivo JSON
+que se puede abrir en Perfetto (https://ui.perfetto.dev) o chrome://tracing.
+
+Solo usa la biblioteca estándar para poder importarse antes que Qt.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+TRACE_FLAG = "--trace-startup"
+"""Argumento de línea de comandos que activa el trazado del arranque"""
+
+TRACE_DIR = os.path.join(os.path.expanduser("~"), ".WAms", "traces")
+"""Directorio predeterminado de los archivos de traza"""
+
+ENABLED = False
+_output_path = None
+_events = []
+_open_async = set()
+_origin = time.perf_counter()
+
+def configure_from_argv(argv):
+    """Activa el trazado si la línea de comandos contiene --trace-startup.
+
+    Acepta "--trace-startup" o "--trace-startup=RUTA" y elimina el argumento
+    de argv para que no se interprete como una URL a abrir.
+
+    Args:
+        argv (list): Lista de argumentos (normalmente sys.argv), se modifica.
+
+    Returns:
+        bool: True si el trazado quedó activado.
+    """
+    global ENABLED, _output_path
+    for arg in list(argv[1:]):
+        if arg == TRACE_FLAG or arg.startswith(TRACE_FLAG + "="):
+            argv.remove(arg)
+            ENABLED = True
+            if "=" in arg:
+                _output_path = os.path.abspath(os.path.expanduser(arg.split("=", 1)[1]))
+    return ENABLED
+
+def _now_us():
+    """Devuelve los microsegundos transcurridos desde que se importó el módulo."""
+    return (time.perf_counter() - _origin) * 1_000_000
+
+def _event(ph, name, category, args, **extra):
+    """Agrega un evento crudo a la traza."""
+    event = {
+        "name": name,
+        "cat": category,
+        "ph": ph,
+        "ts": extra.pop("ts", _now_us()),
+        "pid": os.getpid(),
+        "tid": threading.get_native_id(),
+    }
+    if args:
+        event["args"] = args
+    event.update(extra)
+    _events.append(event)
+
+@contextmanager
+def span(name, category="startup", **args):
+    """Mide un bloque de código como un evento completo ("X").
+
+    Args:
+        name (str): Nombre de la fase.
+        category (str, opcional): Categoría del evento en el visor.
+        **args: Datos adicionales que se muestran con el evento.
+    """
+    if not ENABLED:
+        yield
+        return
+    start = _now_us()
+    try:
+        yield
+    finally:
+        _event("X", name, category, args, ts=start, dur=_now_us() - start)
+
+def begin(name, category="startup", **args):
+    """Abre una fase síncrona ("B") que se cierra con end().
+
+    Útil para código a nivel de módulo que no se puede envolver en un bloque with.
+    """
+    if ENABLED:
+        _event("B", name, category, args)
+
+def end(name, category="startup", **args):
+    """Cierra la fase síncrona abierta con begin()."""
+    if ENABLED:
+        _event("E", name, category, args)
+
+def begin_async(name, key, category="session", **args):
+    """Abre una fase asíncrona ("b"), por ejemplo la carga de una página.
+
+    Args:
+        name (str): Nombre de la fase.
+        key (str): Identificador único que enlaza el inicio con su fin.
+        category (str, opcional): Categoría del evento en el visor.
+        **args: Datos adicionales que se muestran con el evento.
+    """
+    if ENABLED:
+        _open_async.add((category, name, key))
+        _event("b", name, category, args, id=key)
+
+def end_async(name, key, category="session", **args):
+    """Cierra la fase asíncrona abierta con begin_async()."""
+    if ENABLED and (category, name, key) in _open_async:
+        _open_async.discard((category, name, key))
+        _event("e", name, category, args, id=key)
+
+def instant(name, category="startup", **args):
+    """Registra un evento instantáneo ("i"), como un hito del arranque."""
+    if ENABLED:
+        _event("i", name, category, args, s="p")
+
+def pending_async():
+    """Devuelve cuántas fases asíncronas siguen abiertas."""
+    return len(_open_async)
+
+def write():
+    """Guarda la traza en disco y desactiva el trazado.
+
+    Returns:
+        str: Ruta del archivo escrito, o None si el trazado no estaba activo
+        o no se pudo escribir.
+    """
+    global ENABLED
+    if not ENABLED:
+        return None
+    ENABLED = False
+
+    path = _output_path
+    if not path:
+        path = os.path.join(TRACE_DIR, time.strftime("startup-%Y%m%d-%H%M%S.json"))
+
+    metadata = [
+        {"name": "process_name", "ph": "M", "pid": os.getpid(), "args": {"name": "WAms"}},
+        {"name": "thread_name", "ph": "M", "pid": os.getpid(),
+         "tid": threading.main_thread().native_id, "args": {"name": "GUI thread"}},
+    ]
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": metadata + _events, "displayTimeUnit": "ms"}, f)
+        print(f"Startup trace written: {path} (open it in https://ui.perfetto.dev)")
+        return path
+    except Exception as e:
+        print(f"Error writing startup trace: {e}")
+        return None
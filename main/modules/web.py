@@ -4,90 +4,198 @@ Maneja la página web de WhatsApp Web dentro de cada tab de la aplicación.
 """
 import os
 
-# Intervalo del timer keep-alive para mantener la conexión WebSocket activa (45 segundos)
-WEB_KEEP_ALIVE_INTERVAL = 45000
+# Tiempo máximo (ms) que un gancho del DOM espera a su elemento antes de rendirse
+DOM_HOOK_TIMEOUT = 60000
 
-from PyQt6.QtWidgets import QApplication
-from PyQt6.QtCore import QLocale, QTimer, QSettings
-from PyQt6.QtWebEngineCore import QWebEnginePage
+from PyQt6.QtCore import QLocale
+from PyQt6.QtWebEngineCore import QWebEnginePage, QWebEngineScript
 
 import modules.get_theme as get_theme
 
+# Nombre de los scripts de WAms en la colección de scripts de cada perfil
+OVERRIDES_SCRIPT_NAME = "wams-overrides"
+DOM_HOOKS_SCRIPT_NAME = "wams-dom-hooks"
+
+# Ajustes del entorno que WhatsApp Web debe ver desde su arranque (mundo principal,
+# al crear el documento). El idioma de las peticiones lo fija el perfil con
+# setHttpAcceptLanguage, sin envolver XMLHttpRequest.
+OVERRIDES_SCRIPT = """
+(function() {{
+    // Configure browser language
+    Object.defineProperty(navigator, 'language', {{
+        value: '{language}',
+        writable: false
+    }});
+
+    Object.defineProperty(navigator, 'languages', {{
+        value: ['{language}', 'en'],
+        writable: false
+    }});
+
+    // Strictly Linux native - no spoofing Win/Mac
+    Object.defineProperty(navigator, 'platform', {{
+        value: 'Linux x86_64',
+        writable: false
+    }});
+
+    Object.defineProperty(navigator, 'vendor', {{
+        value: 'Google Inc.',
+        writable: false
+    }});
+
+    // Disable userAgentData to avoid platform-specific detection
+    if (navigator.userAgentData) {{
+        Object.defineProperty(navigator, 'userAgentData', {{
+            get: () => undefined
+        }});
+    }}
+
+    // Force browser calls flags and language in localStorage
+    try {{
+        localStorage.setItem('wa-browser-calls', 'true');
+        localStorage.setItem('wa-browser-calls-v2', 'true');
+        localStorage.setItem('whatsapp-lang', '{language}');
+        localStorage.setItem('lang', '{language}');
+    }} catch(e) {{
+        console.log('Could not configure localStorage:', e);
+    }}
+
+    // Spoof window.chrome for better compatibility
+    if (!window.chrome) {{
+        window.chrome = {{
+            runtime: {{}},
+            loadTimes: function() {{}},
+            csi: function() {{}},
+            app: {{}}
+        }};
+    }}
+}})();
+"""
+
+# Ganchos del DOM dirigidos por eventos: un MutationObserver por gancho que se
+# desconecta al encontrar el elemento o al agotar el tiempo, y un registro por
+# documento para no duplicarlos. Se ejecutan aislados de los scripts de la página.
+DOM_HOOKS_SCRIPT = """
+(function() {{
+    const wamsHooks = window.__wamsDomHooks = window.__wamsDomHooks || {{}};
+    const whenElement = (name, find, apply) => {{
+        if (wamsHooks[name]) return;
+        wamsHooks[name] = 'waiting';
+        let observer = null;
+        let timer = null;
+        const check = () => {{
+            const element = find();
+            if (element == null) return false;
+            if (observer) observer.disconnect();
+            clearTimeout(timer);
+            wamsHooks[name] = 'done';
+            apply(element);
+            return true;
+        }};
+        if (check()) return;
+        observer = new MutationObserver(check);
+        observer.observe(document.documentElement, {{ childList: true, subtree: true }});
+        timer = setTimeout(() => {{
+            observer.disconnect();
+            wamsHooks[name] = 'timeout';
+            console.warn('WAms DOM hook timed out: ' + name);
+        }}, {timeout});
+    }};
+
+    // Original code to adjust layout
+    whenElement('layout', () => document.getElementsByClassName("_1XkO3")[0], (classElement) => {{
+        classElement.style = 'max-width: initial; width: 100%; height: 100%; position: unset;margin: 0'
+    }});
+
+    // Original code for notifications (la XPath solo se evalúa cuando ya existe #side)
+    whenElement('notify', () => document.getElementById('side') && document.evaluate('//*[@id="side"]/span/div/div/div[2]/div[2]/span/span[1]', document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue, (classElement) => {{
+        classElement.click()
+    }});
+}})();
+"""
+
+def install_scripts(profile, language):
+    """Registra los scripts de WAms en un perfil si aún no lo están.
+
+    Los scripts del perfil se inyectan en cada carga antes que el código de
+    WhatsApp Web, en lugar de enviarse con runJavaScript tras loadFinished.
+
+    Args:
+        profile (QWebEngineProfile): Perfil de la sesión.
+        language (str): Idioma de WhatsApp Web (por ejemplo "es").
+    """
+    scripts = profile.scripts()
+    if scripts.find(OVERRIDES_SCRIPT_NAME):
+        return
+
+    overrides = QWebEngineScript()
+    overrides.setName(OVERRIDES_SCRIPT_NAME)
+    overrides.setSourceCode(OVERRIDES_SCRIPT.format(language=language))
+    overrides.setInjectionPoint(QWebEngineScript.InjectionPoint.DocumentCreation)
+    overrides.setWorldId(QWebEngineScript.ScriptWorldId.MainWorld)
+    overrides.setRunsOnSubFrames(False)
+
+    hooks = QWebEngineScript()
+    hooks.setName(DOM_HOOKS_SCRIPT_NAME)
+    hooks.setSourceCode(DOM_HOOKS_SCRIPT.format(timeout=DOM_HOOK_TIMEOUT))
+    hooks.setInjectionPoint(QWebEngineScript.InjectionPoint.DocumentReady)
+    hooks.setWorldId(QWebEngineScript.ScriptWorldId.ApplicationWorld)
+    hooks.setRunsOnSubFrames(False)
+
+    scripts.insert([overrides, hooks])
+
 class WhatsApp(QWebEnginePage):
     """Clase que representa una página de WhatsApp Web en una tab.
     
     Hereda de QWebEnginePage y proporciona funcionalidades como:
-    - Configuración del idioma del sistema.
+    - Configuración del idioma del sistema y registro de los scripts del perfil.
     - Gestión de permisos (micrófono, cámara, notificaciones).
-    - Mantenimiento de conexión activa mediante un timer.
     - Detección de temas (claro/oscuro) al cargar la página.
 
-    No devuelve nada. Instala filtros de eventos y conecta señales necesarias.
+    No devuelve nada. Conecta las señales necesarias.
     """
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, settings=None, theme_watcher=None, **kwargs):
         """Inicializa una nueva instancia de WhatsApp Web.
 
         Args:
             *args: Argumentos posicionales para QWebEnginePage
+            settings (Config, opcional): Ajustes compartidos de la aplicación.
+            theme_watcher (ThemeWatcher, opcional): Esquema de color del sistema en memoria.
             **kwargs: Argumentos nombrados para QWebEnginePage
         """
         QWebEnginePage.__init__(self, *args, **kwargs)
-        
-        # Instalar filtro de eventos global para capturar eventos de la aplicación
-        QApplication.instance().installEventFilter(self)
-        
-        # Conectar señales para manejar permisos, hover de links, carga y limpieza
+
+        # Conectar señales para manejar permisos, hover de links y carga. La página
+        # no instala filtros de eventos globales: cada filtro se consultaría en
+        # todos los eventos de la aplicación, una vez por sesión abierta.
         self.featurePermissionRequested.connect(self.permission)
         self.linkHovered.connect(self.link_hovered)
         self.loadFinished.connect(self.load_finished)
-        self.destroyed.connect(self.cleanup)
 
         # Variable de instancia para almacenar la URL del último link hoverizado
         # (antes era variable de clase, causando race conditions entre sesiones)
         self.link_url = ""
 
-        # Configurar el directorio de la aplicación para ajustes
-        self.setup_app_directory()
+        # Ajustes y tema del sistema compartidos con MainWindow (lecturas en memoria)
+        self.settings = settings
+        self.theme_watcher = theme_watcher
+        # El tema del sistema cambió mientras la página estaba congelada
+        self.theme_stale = False
+        self.lifecycleStateChanged.connect(self.lifecycle_state_changed)
 
         # Configurar idioma del sistema
         self.system_language = 'en'  # Fallback predeterminado
         self.setup_system_language()
 
-        # Mantener página activa con timer keep-alive
-        self.keep_alive_timer = QTimer(self)
-        self.keep_alive_timer.timeout.connect(self.keep_connection_alive)
-        self.keep_alive_timer.start(WEB_KEEP_ALIVE_INTERVAL)  # 45 segundos
+        # Scripts inyectados por el propio perfil (una sola vez por perfil)
+        install_scripts(self.profile(), self.system_language)
 
     def javaScriptConsoleMessage(self, level, message, lineNumber, sourceID):
         """Sobrescribe la salida de consola JS para ocultar ruido de telemetría y web."""
         # Se suprimen todos los mensajes de error irrelevantes de WhatsApp Web
         pass
 
-    def cleanup(self):
-        """Asegura que los filtros de eventos globales se eliminen.
-        
-        Se ejecuta cuando la página se destruye para evitar
-        fugas de memoria y referencias colgantes.
-        """
-        try:
-            QApplication.instance().removeEventFilter(self)
-        except Exception:
-            pass
-
-    def setup_app_directory(self):
-        """Configura el directorio de datos de la aplicación (~/.WAms).
-        
-        Crea el directorio si no existe, para almacenar configuración
-        y datos de sesión de la aplicación.
-        """
-        home_dir = os.path.expanduser("~")
-        self.app_dir = os.path.join(home_dir, ".WAms")
-
-        # Crear directorio si no existe
-        if not os.path.exists(self.app_dir):
-            os.makedirs(self.app_dir)
-
     def setup_system_language(self):
         """Configura el idioma del sistema para WhatsApp Web.
         
@@ -201,130 +309,38 @@ class WhatsApp(QWebEnginePage):
             self.system_language = 'en'  # Fallback to English
 
     def load_finished(self, flag):
-        """Configura la página web después de que se carga completamente.
-        
-        Inyecta JavaScript para:
-        - Configurar el idioma del navegador
-        - Establecer platform y vendor para evitar detección
-        - Forzar encabezados Accept-Language
-        - Ajustar el layout de WhatsApp Web
-        - Activar notificaciones
-        - Spoofear window.chrome para compatibilidad
-        
+        """Aplica el tema después de que la página se carga.
+
+        El resto de la configuración (idioma, navigator, ganchos del DOM) ya
+        está registrada en el perfil con install_scripts y se inyecta sola
+        en cada carga.
+
         Args:
             flag (bool): True si la carga fue exitosa, False si falló
         """
-        # La configuración se ejecuta independientemente del resultado de la carga
-        # JavaScript para configurar idioma y otras funciones
-        self.runJavaScript(
-            f"""
-            // Configure browser language
-            Object.defineProperty(navigator, 'language', {{
-                value: '{self.system_language}',
-                writable: false
-            }});
-
-            Object.defineProperty(navigator, 'languages', {{
-                value: ['{self.system_language}', 'en'],
-                writable: false
-            }});
-
-            // Strictly Linux native - no spoofing Win/Mac
-            Object.defineProperty(navigator, 'platform', {{
-                value: 'Linux x86_64',
-                writable: false
-            }});
-
-            Object.defineProperty(navigator, 'vendor', {{
-                value: 'Google Inc.',
-                writable: false
-            }});
-
-            // Disable userAgentData to avoid platform-specific detection
-            if (navigator.userAgentData) {{
-                Object.defineProperty(navigator, 'userAgentData', {{
-                    get: () => undefined
-                }});
-            }}
-
-            // Force browser calls flags in localStorage
-            try {{
-                localStorage.setItem('wa-browser-calls', 'true');
-                localStorage.setItem('wa-browser-calls-v2', 'true');
-            }} catch(e) {{
-                console.log('Error setting wa-browser-calls:', e);
-            }}
-
-            // Configure Accept-Language header
-            if (window.XMLHttpRequest) {{
-                const originalOpen = XMLHttpRequest.prototype.open;
-                XMLHttpRequest.prototype.open = function(method, url, async, user, password) {{
-                    this.addEventListener('readystatechange', function() {{
-                        if (this.readyState === 1) {{
-                            this.setRequestHeader('Accept-Language', '{self.system_language},en;q=0.9');
-                        }}
-                    }});
-                    return originalOpen.apply(this, arguments);
-                }};
-            }}
-
-            // Configure language in localStorage if available
-            try {{
-                localStorage.setItem('whatsapp-lang', '{self.system_language}');
-                localStorage.setItem('lang', '{self.system_language}');
-            }} catch(e) {{
-                console.log('Could not configure language in localStorage:', e);
-            }}
-
-            // Original code to adjust layout
-            const checkExist = setInterval(() => {{
-                const classElement = document.getElementsByClassName("_1XkO3")[0];
-                if (classElement != null) {{
-                    classElement.style = 'max-width: initial; width: 100%; height: 100%; position: unset;margin: 0'
-                    clearInterval(checkExist);
-                }}
-            }}, 100);
-
-            // Original code for notifications
-            const checkNotify = setInterval(() => {{
-                const classElement = document.evaluate('//*[@id="side"]/span/div/div/div[2]/div[2]/span/span[1]', document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
-                if (classElement != null) {{
-                    classElement.click()
-                    clearInterval(checkNotify);
-                    }}
-            }}, 100);
-
-            // Spoof window.chrome for better compatibility
-            if (!window.chrome) {{
-                window.chrome = {{
-                    runtime: {{}},
-                    loadTimes: function() {{}},
-                    csi: function() {{}},
-                    app: {{}}
-                }};
-            }}
-
-            // Ensure mediaDevices exists (should be native now)
-            if (navigator.mediaDevices === undefined) {{
-                console.warn('navigator.mediaDevices is still undefined');
-            }}
-
-            // Force language update after page loads completely
-            setTimeout(() => {{
-                // Try to change language through WhatsApp Web settings
-                const settingsButton = document.querySelector('[data-testid="menu"]');
-                if (settingsButton) {{
-                    console.log('Configuring system language...');
-                }}
-            }}, 2000);
+        self.theme_stale = False
+        self.apply_theme()
+
+    def lifecycle_state_changed(self, state):
+        """Aplica el tema pendiente cuando una página congelada vuelve a estar activa.
+
+        Args:
+            state (QWebEnginePage.LifecycleState): Nuevo estado de ciclo de vida.
         """
-        )
+        if state == QWebEnginePage.LifecycleState.Active and self.theme_stale:
+            self.theme_stale = False
+            self.apply_theme()
 
-        # Configurar el tema (claro/oscuro) desde los ajustes
-        settings = QSettings(os.path.join(self.app_dir, "config.ini"), QSettings.Format.IniFormat)
-        theme_mode = settings.value("system/theme", "auto", str)
+    def apply_theme(self):
+        """Aplica el tema (claro/oscuro) configurado en los ajustes.
+
+        En modo "auto" se usa el esquema del sistema guardado en memoria por
+        ThemeWatcher: cargar una página nunca hace llamadas D-Bus síncronas.
+        """
+        theme_mode = self.settings.value("system/theme", "auto", str) if self.settings is not None else "auto"
         if theme_mode == "auto":
-            self.setTheme(get_theme.get_system_theme())
+            is_dark = self.theme_watcher.is_dark if self.theme_watcher is not None else get_theme.DEFAULT_DARK
+            self.setTheme(is_dark)
         elif theme_mode == "light":
             self.setTheme(False)
         else:
@@ -381,15 +397,3 @@ class WhatsApp(QWebEnginePage):
             self.setFeaturePermission(
                 frame, feature, QWebEnginePage.PermissionPolicy.PermissionGrantedByUser
             )
-
-    def keep_connection_alive(self):
-        """Mantiene la conexión WebSocket de WhatsApp activa.
-        
-        Envía un ping periódico para evitar que la conexión se cierre
-        por inactividad, asegurando que los mensajes se reciban en tiempo real.
-        """
-        self.runJavaScript("""
-            if (window.Store && window.Store.State) {
-                console.log('Keep-alive ping');
-            }
-        """)
\ No newline at end of file